@@ -2,247 +2,13 @@
 """
 Generate comprehensive navigation data map v2 for AdvisorHub
 This script creates a complete field-level documentation file
-"""
-
-# Header content
-header = """# 🧭 AdvisorHub Navigation + Data Map (v2 – With Metadata)
-
-> **Purpose**: A unified, AI-readable map connecting front-end screens, UI sections, and Supabase backend schema, designed for system navigation, auto-form generation, and validation logic.
-
-## 📂 What's Included
-
-| Category | Description |
-|----------|-------------|
-| **Navigation structure** | Every major screen (/login, /customers, /new-business, /profile-settings, etc.) with "Navigate From" and "Navigate To" paths. |
-| **UI composition** | Adds Screen Section and Section Field columns (e.g., Personal Information → Full Name / Email / Advisor ID). |
-| **Backend linkage** | Maps each field to its Supabase table and column name (e.g., users.full_name, user_preferences.language). |
-| **Metadata** | New columns: Data Type, Editable, and Validation Rules/Notes for each field. |
-| **Validation logic** | Includes regex, enum values, required flags, and read-only vs editable distinctions. |
-| **Coverage** | Full navigation hierarchy + expanded detail for ALL pages (Login, Register, Home, Customers, NewBusiness, Analytics, ToDo, Broadcast, Policies). |
-| **Format** | Clean Markdown table — ready for Claude or LangGraph ingestion, schema generation, or AI routing logic. |
 
----
-
-## 🗺️ Complete Navigation + Data Map
-
-**NOTE**: This table contains 217 rows documenting every field across all 14 pages.
-
-| Current Screen / Module | Navigate From | Navigate To | Screen Section | Section Field | Description / Key Interactions | Supabase Table | Supabase Column Name | Data Type | Editable | Validation Rule / Notes |
-|--------------------------|----------------|--------------|----------------|----------------|--------------------------------|----------------|----------------------|------------|-----------|--------------------------|
+Equivalent to `python -m navmap md`; see navmap/cli.py for the options.
 """
 
-# All rows data
-rows = [
-    # LOGIN & AUTH
-    ["**LOGIN & AUTH**", "", "", "", "", "", "", "", "", "", ""],
-    ["/login", "None, Logout, Unauthenticated access", "/register, / (home)", "Login Form", "—", "User authentication screen with email/password and forgot password flow.", "—", "—", "—", "—", "Entry point for all users"],
-    ["/login", "(entry)", "/ (home), /register", "Login Form", "Email Address", "User email for authentication", "auth.users", "email", "string", "Y", "Required, valid email format"],
-    ["/login", "(entry)", "/ (home), /register", "Login Form", "Password", "User password for authentication", "auth.users", "encrypted_password", "string", "Y", "Required, min 8 chars"],
-    ["/login", "(entry)", "/ (home)", "Login Form", "Forgot Password Link", "Triggers password reset email", "auth", "—", "action", "Y", "Opens reset flow via Supabase Auth"],
-    ["/login", "(recovery link)", "/ (home)", "Password Recovery", "New Password", "Set new password after reset", "auth.users", "encrypted_password", "string", "Y", "Min 8 chars, must match confirmation"],
-    ["/login", "(recovery link)", "/ (home)", "Password Recovery", "Confirm New Password", "Password confirmation field", "—", "—", "string", "Y", "Must match New Password"],
-    ["/register", "/login", "/login", "Registration Form", "—", "New advisor registration form, redirects to login on success.", "users", "—", "—", "—", "Admin may disable self-registration"],
-    ["/register", "/login", "/login", "Registration Form", "Full Name", "Advisor's full name", "users", "full_name", "string", "Y", "Required, max 100 chars"],
-    ["/register", "/login", "/login", "Registration Form", "Email Address", "Unique email for account", "users", "email", "string", "Y", "Required, valid email, must be unique"],
-    ["/register", "/login", "/login", "Registration Form", "Mobile Number", "Contact phone number", "users", "phone", "string", "Y", "Required, regex: `^[0-9]{8,15}$`"],
-    ["/register", "/login", "/login", "Registration Form", "Password", "Account password", "auth.users", "encrypted_password", "string", "Y", "Min 8 chars, must contain uppercase + number"],
-    ["/register", "/login", "/login", "Registration Form", "Confirm Password", "Password confirmation", "—", "—", "string", "Y", "Must match Password"],
-
-    # HOME DASHBOARD
-    ["**HOME DASHBOARD**", "", "", "", "", "", "", "", "", "", ""],
-    ["/", "/login, /profile-settings, Sidebar", "/customers, /quick-quote, /todo, /analytics, /broadcast, /customers/detail?id={hotLeadId}", "Dashboard", "—", "Main advisor dashboard with widgets and quick actions", "—", "—", "—", "—", "Personalized content based on logged-in advisor"],
-    ["/", "Sidebar", "(various)", "Header", "Greeting", "Personalized welcome message with advisor name", "users", "full_name", "string", "N", '"Good Morning, {name}" format'],
-    ["/", "Sidebar", "/customers", "Metrics", "Total Leads", "Count of all leads assigned to advisor", "leads", "COUNT(*)", "number", "N", "Calculated field"],
-    ["/", "Sidebar", "/customers?filter=is_client", "Metrics", "Total Clients", "Count of leads where is_client=true", "leads", "COUNT(*) WHERE is_client=true", "number", "N", "Calculated field"],
-    ["/", "Sidebar", "/todo?filter=pending", "Metrics", "Pending Tasks", "Count of incomplete tasks", "tasks", "COUNT(*) WHERE completed=false", "number", "N", "Calculated field"],
-    ["/", "Sidebar", "/customers?filter=hot", "Hot Leads Widget", "Hot Lead Card", "Shows leads with high temperature score", "leads", "name, contact_number, last_contacted", "mixed", "N", "Click navigates to /customers/detail?id={id}"],
-    ["/", "Sidebar", "/todo", "Reminders Widget", "Upcoming Task", "Shows next 3 tasks/appointments by date", "tasks", "title, date, time, type", "mixed", "N", "Click navigates to /todo"],
-    ["/", "Sidebar", "/analytics", "Performance Widget", "RP/SP Progress", "Current month RP/SP vs targets", "analytics", "rp_incepted, rp_target, sp_incepted, sp_target", "number", "N", "Progress bars with percentages"],
-    ["/", "Sidebar", "/broadcast", "Broadcast Feed Widget", "Latest Announcement", "Shows most recent broadcast with unread indicator", "broadcasts", "title, category, published_date", "mixed", "N", "Click navigates to /broadcast/detail?id={id}"],
-    ["/", "Sidebar", "/quick-quote", "Quick Actions", "Quick Quote Button", "Opens quick quote calculator", "—", "—", "action", "—", "Fast path to quotation tool"],
-    ["/", "Sidebar", "/customers/detail?id=new", "Quick Actions", "New Lead Button", "Opens new lead capture form", "—", "—", "action", "—", "Fast path to lead creation"],
-]
-
-# Footer content
-footer = """
----
-
-## 🔄 Cross-Module Workflows
-
-### 1. Lead to Policy Journey
-```
-/customers → /customers/detail?id=new (create lead)
-→ /new-business → /proposals/detail?id=new (create proposal)
-→ /proposals/detail (fact finding → FNA → recommendation → quotation → application)
-→ /new-business (proposal list shows "Pending for UW")
-→ [External: Underwriting Approval]
-→ /customers/detail?id={leadId} (now is_client=true)
-→ Portfolio Tab shows new policy
-→ /policies/detail?id={policyId}
-```
-
-### 2. Quick Quote to Proposal
-```
-/ (home) → /quick-quote
-→ fill inputs → calculate premium
-→ /quote-summary
-→ "Convert to Proposal" button
-→ Client selection modal
-→ /proposals/detail?id=new (pre-filled with quote data, starts at Quotation stage)
-```
-
-### 3. Hot Lead Follow-up
-```
-/ (home) → Hot Leads widget shows "John Doe (not contacted 45 days)"
-→ Click card → /customers/detail?id={leadId}
-→ "Schedule Appointment" button
-→ /todo/new?leadId={leadId}&type=appointment
-→ Fill date, time, duration
-→ Save → returns to /todo
-→ Calendar view shows appointment
-```
-
-### 4. Gap Analysis to Proposal
-```
-/customers/detail?id={leadId} → Gap & Opportunity Tab
-→ View gap analysis (e.g., Death coverage shortfall $200,000)
-→ "Propose Solution" button
-→ /proposals/detail?id=new&leadId={leadId}
-→ FNA pre-filled with existing coverage
-→ Recommendation stage suggests products to close gap
-```
-
-### 5. Broadcast to Action
-```
-/ (home) → Broadcast Feed widget shows unread announcement
-→ Click → /broadcast/detail?id={broadcastId}
-→ Read content: "New product launch training on March 15"
-→ Auto-marked as read
-→ Back to / → Sidebar → /todo
-→ Create appointment for training date
-```
-
----
-
-## 🔑 Query Parameters Reference
-
-| Route | Parameter | Type | Required | Description |
-|-------|-----------|------|----------|-------------|
-| /customers/detail | `id` | string | Y | Lead ID; `id=new` for new lead creation |
-| /proposals/detail | `id` | string | Y | Proposal ID; `id=new` for new proposal |
-| /proposals/detail | `leadId` | string | N | Pre-select client for new proposal |
-| /proposals/detail | `stage` | enum | N | Jump to specific stage (factfind, fna, recommendation, quotation, application) |
-| /quick-quote | (none) | — | — | No query params |
-| /quote-summary | `product` | string | Y | Product ID |
-| /quote-summary | `age` | number | Y | Life assured age |
-| /quote-summary | `gender` | enum | Y | Male / Female |
-| /quote-summary | `smoker` | boolean | Y | true / false |
-| /quote-summary | `sumAssured` | number | Y | Coverage amount |
-| /quote-summary | `premiumTerm` | number | Y | Payment duration |
-| /quote-summary | `coverageTerm` | number | Y | Coverage duration |
-| /quote-summary | `paymentFrequency` | enum | Y | Monthly / Quarterly / Annual |
-| /quote-summary | `premium` | number | Y | Calculated premium amount |
-| /policies/detail | `id` | string | Y | Policy ID |
-| /broadcast/detail | `id` | string | Y | Broadcast ID |
-| /todo/new | `leadId` | string | N | Pre-link task to specific lead |
-| /todo/new | `type` | enum | N | Pre-select Task or Appointment |
-| /todo/new | `date` | date | N | Pre-fill date (ISO format) |
-| /customers | `filter` | enum | N | Status filter (hot, contacted, proposal, is_client) |
-| /customers | `search` | string | N | Search query string |
-| /customers | `source` | enum | N | Lead source filter |
-| /todo | `view` | enum | N | list / calendar view |
-| /todo | `filter` | enum | N | pending / completed filter |
-| /new-business | `stage` | enum | N | Stage filter |
-| /new-business | `status` | enum | N | Status filter |
-
----
-
-## 💾 Local Storage & Session Storage
-
-| Key | Storage Type | Data Type | Description |
-|-----|--------------|-----------|-------------|
-| `advisorhub:sidebar-collapsed` | localStorage | boolean | Sidebar collapse state |
-| `analyticsPrefs` | localStorage | object | Analytics dashboard preferences (period, chart types) |
-| `advisorhub:broadcast-read:{id}` | sessionStorage | string | Broadcast read status (per session) |
-| `advisorhub:customer-filters` | sessionStorage | object | Customer list filter state |
-| `advisorhub:customer-view` | sessionStorage | enum | Customer list/grid view preference |
-| `advisorhub:proposal-filters` | sessionStorage | object | Proposal list filter state |
-| `advisorhub:todo-view` | sessionStorage | enum | Todo list/calendar view |
-| `advisorhub:todo-filters` | sessionStorage | object | Todo filter state |
-| `advisorhub:tab-{leadId}` | sessionStorage | string | Last active tab in CustomerDetail |
-| `advisorhub:analytics-period` | sessionStorage | string | Analytics period selection |
-| `supabase.auth.token` | localStorage | object | Supabase auth token (managed by SDK) |
-
----
-
-## 🔐 Authentication & Route Guards
-
-### Public Routes (No Auth Required)
-- `/login`
-- `/register`
-
-### Protected Routes (Auth Required)
-All other routes require authentication. Auth check logic in `AdminLayout.jsx`:
-
-```javascript
-// If not authenticated and not on public page → redirect to /login
-// If authenticated and on public page → redirect to / (home)
-```
-
-### Role-Based Access (Future Enhancement)
-Currently no role differentiation. All authenticated users have access to all protected routes.
-Future roles may include:
-- **Advisor**: Full access to sales modules
-- **Manager**: Analytics + team management
-- **Admin**: Full system access + user management
-
----
-
-## 🧱 Why This Format Works
-
-- Each **row = 1 atomic navigable unit** (screen, section, or field)
-- Claude or your orchestrator can parse column headers and build:
-  - Route trees
-  - API bindings
-  - Validation logic directly
-- You can extend this easily for any new pages without schema drift
-- **217+ fields documented** across 14 pages
-- **25+ API endpoints** identified
-- **Complete validation rules** for every editable field
-- **Calculated fields** clearly marked with formulas
-- **Query parameters** for deep linking and state management
-
----
-
-## 📊 Summary
-
-- **Total Pages**: 14
-- **Total Fields Documented**: 217+
-- **Editable Fields**: 113
-- **Read-Only Fields**: 104
-- **Calculated Fields**: 30
-- **Supabase Tables**: 15+
-- **Query Parameters**: 24
-- **Storage Keys**: 11
-- **User Workflows**: 5 complete journeys
-
----
-
-**Last Updated**: 2025-11-05
-**Version**: 2.0 (Full Field-Level Documentation)
-**Maintainer**: AdvisorHub Development Team
-
-**Note**: Due to the size of this document (217 rows), the complete table data should be programmatically generated or maintained. This file provides the structure and first 24 rows as examples. For the complete dataset covering all pages (Customer Management, New Business, Quick Quote, Analytics, To-Do, Broadcast, Policies, Profile Settings), please refer to the page component analysis or use the generation script.
-"""
+import sys
 
-# Write the file
-with open('advisorhub-navigation-data-map-v2-COMPLETE.md', 'w', encoding='utf-8') as f:
-    f.write(header)
-    for row in rows:
-        f.write('| ' + ' | '.join(row) + ' |\n')
-    f.write(footer)
+from navmap.cli import main
 
-print("✅ Navigation data map v2 COMPLETE generated successfully!")
-print(f"📄 Created: advisorhub-navigation-data-map-v2-COMPLETE.md")
-print(f"📊 Rows in preview: {len(rows)}")
-print("💡 NOTE: This is a condensed version. Full 217-row dataset available via component analysis.")
+if __name__ == '__main__':
+    sys.exit(main(['md'] + sys.argv[1:], prog='generate_nav_map.py'))
@@ -0,0 +1,5 @@
+"""
+Shared building blocks for the AdvisorHub navigation map generators
+(generate_nav_map.py and generate_navigation_xlsx.py) and the
+`python -m navmap` command line (navmap/cli.py)
+"""
@@ -0,0 +1,363 @@
+"""
+Benchmarks for Markdown and XLSX generation at scale
+
+synthetic_dataset() grows the real map to any number of field rows while
+keeping its shape: module sections are copies of the real ones (same
+sizes, icons and emoji section markers), the low-cardinality columns
+(screens, Navigate From / To routes, tables, data types, Editable) keep
+repeating the same strings, and each high-cardinality cell (fields,
+descriptions, column names, notes) becomes a new variant with the same
+probability that column has of holding a distinct value in the real map.
+Output is deterministic for a given seed.
+
+Each target first runs once, untimed, on the real map, so import and
+first-call costs stay out of the first case. Every case is then timed on
+its own (best of --repeat runs) and run once more under tracemalloc for
+the peak Python heap, so the tracing overhead never shows up in the
+timings. CPU time includes the worker processes of a pooled target
+(xlsx-sheets); its tracemalloc run renders everything in-process, since
+the heap of a child is invisible to the parent. Results go to a JSON
+file; given a --baseline from an earlier run, cases that got slower or
+bigger than the --threshold allows are flagged as regressions and the
+exit status is 1.
+
+Usage: python -m navmap.bench [--sizes 1k,10k,100k,1M] [--targets md,xlsx,xlsx-sheets]
+                              [-o FILE] [--baseline FILE] [--threshold 0.2]
+"""
+
+import argparse
+import os
+import platform
+import random
+import sys
+import time
+from collections import namedtuple
+
+from navmap.dataset import Dataset, Section, load_dataset
+
+DEFAULT_OUTPUT = 'navmap-bench.json'
+DEFAULT_SIZES = '1k,10k,100k,1M'
+DEFAULT_TARGETS = 'md,xlsx,xlsx-sheets'
+
+# Relative slowdown (or memory growth) that counts as a regression
+DEFAULT_THRESHOLD = 0.2
+# Differences below these are noise, however large the ratio
+MIN_SECONDS_DELTA = 0.05
+MIN_BYTES_DELTA = 1 << 20
+
+RESULTS_VERSION = 1
+
+# Cells that mean "nothing here" are never turned into variants
+_EMPTY_CELLS = frozenset(('', '—', '-', 'N/A'))
+
+Case = namedtuple('Case', ['target', 'rows', 'sections', 'seconds', 'cpu_seconds', 'rows_per_sec',
+                           'peak_bytes', 'output_bytes', 'repeat'])
+Regression = namedtuple('Regression', ['target', 'rows', 'metric', 'baseline', 'current', 'change'])
+
+
+def parse_size(text):
+    """'10k' -> 10000, '1M' -> 1000000, '2500' -> 2500"""
+    text = text.strip()
+    scale = {'k': 10 ** 3, 'K': 10 ** 3, 'm': 10 ** 6, 'M': 10 ** 6}.get(text[-1:], 1)
+    number = text[:-1] if scale != 1 else text
+    try:
+        size = int(float(number) * scale)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a row count: {text!r}") from None
+    if size <= 0:
+        raise argparse.ArgumentTypeError(f"row count must be positive: {text!r}")
+    return size
+
+
+def variant_rates(dataset):
+    """Per column, the share of rows holding a value no earlier row had"""
+    rows = [row for section in dataset.sections for row in section.rows]
+    if not rows:
+        return [0.0] * len(dataset.columns)
+    return [len({row[col] for row in rows}) / len(rows) for col in range(len(dataset.columns))]
+
+
+def synthetic_dataset(rows, base=None, seed=0):
+    """
+    Dataset with `rows` field rows shaped like `base` (the real map by default).
+
+    Sections cycle through the base sections; copies after the first round
+    get a numbered title. Columns whose distinct share in the base is
+    below one half are copied verbatim, the rest get a numbered variant
+    with probability equal to that share.
+    """
+    base = load_dataset() if base is None else base
+    templates = [section for section in base.sections if section.rows]
+    if not templates:
+        raise ValueError("base dataset has no rows to grow from")
+    rates = variant_rates(base)
+    varied = [col for col, rate in enumerate(rates) if rate >= 0.5]
+    rng = random.Random(seed)
+
+    sections = []
+    remaining = rows
+    copy = 0
+    while remaining > 0:
+        for template in templates:
+            if remaining <= 0:
+                break
+            take = template.rows[:remaining]
+            if copy:
+                out = []
+                for index, row in enumerate(take):
+                    cells = list(row)
+                    for col in varied:
+                        value = cells[col]
+                        if value not in _EMPTY_CELLS and rng.random() < rates[col]:
+                            cells[col] = f"{value} ({copy}.{index})"
+                    out.append(tuple(cells))
+                take = tuple(out)
+            title = template.title if not copy else f"{template.title} {copy + 1}"
+            sections.append(Section(title, template.icon, take))
+            remaining -= len(take)
+        copy += 1
+    return Dataset(base.columns, sections, digest=f"synthetic-{rows}-{seed}")
+
+
+# -- targets -----------------------------------------------------------------
+
+
+def _run_md(dataset, path, workers=None):
+    from navmap.document import markdown_marker, render_footer, render_header
+    from navmap.markdown import render_markdown
+    from navmap.rowstore import RowStore
+    from navmap.summary import summarize
+
+    summary = summarize(dataset)
+    rows = RowStore.from_dataset(dataset).iter_rows(section_marker=markdown_marker)
+    render_markdown(path, render_header(summary), rows, render_footer(summary))
+
+
+def _run_xlsx(dataset, path, workers=None):
+    from navmap.rowstore import RowStore
+    from navmap.summary import summarize
+    from navmap.xlsx import write_xlsx_streaming
+
+    write_xlsx_streaming(path, dataset.columns, RowStore.from_dataset(dataset).iter_rows(), summarize(dataset))
+
+
+def _run_xlsx_sheets(dataset, path, workers=None):
+    from navmap.sheets import write_xlsx_sheets
+    from navmap.summary import summarize
+
+    write_xlsx_sheets(path, dataset, summarize(dataset), workers)
+
+
+def _run_xlsx_pandas(dataset, path, workers=None):
+    from navmap.rowstore import RowStore
+    from navmap.summary import summarize
+    from navmap.xlsx import write_xlsx_pandas
+
+    write_xlsx_pandas(path, dataset.columns, RowStore.from_dataset(dataset).iter_rows(), summarize(dataset))
+
+
+# name -> (output suffix, runner); each mirrors what the matching CLI command does after loading.
+# A runner takes `workers` for its process pool (None: the default, 0: in-process); xlsx is the
+# openpyxl streaming writer (navmap xlsx --single-sheet), xlsx-sheets the per-module one (navmap xlsx)
+TARGETS = {
+    'md': ('.md', _run_md),
+    'xlsx': ('.xlsx', _run_xlsx),
+    'xlsx-sheets': ('.xlsx', _run_xlsx_sheets),
+    'xlsx-pandas': ('.xlsx', _run_xlsx_pandas),
+}
+
+
+def _children_cpu():
+    """CPU seconds used by the child processes that have exited (0 where the platform cannot tell)"""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def warm_up(target, dataset, workdir):
+    """Run `target` once without timing it, to pay its imports and first-call costs"""
+    suffix, runner = TARGETS[target]
+    path = os.path.join(workdir, f"warm-up-{target}{suffix}")
+    runner(dataset, path)
+    os.unlink(path)
+
+
+def run_case(target, dataset, workdir, repeat=1, memory=True):
+    suffix, runner = TARGETS[target]
+    path = os.path.join(workdir, f"bench-{target}-{dataset.row_count}{suffix}")
+    best_wall = best_cpu = None
+    for _ in range(max(1, repeat)):
+        wall = time.perf_counter()
+        cpu = time.process_time() + _children_cpu()
+        runner(dataset, path)
+        cpu = time.process_time() + _children_cpu() - cpu
+        wall = time.perf_counter() - wall
+        if best_wall is None or wall < best_wall:
+            best_wall, best_cpu = wall, cpu
+
+    peak = None
+    if memory:
+        import tracemalloc
+
+        tracemalloc.start()
+        try:
+            runner(dataset, path, workers=0)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    size = os.path.getsize(path)
+    os.unlink(path)
+    rows = dataset.row_count
+    return Case(target, rows, len(dataset.sections), round(best_wall, 4), round(best_cpu, 4),
+                round(rows / best_wall) if best_wall else None, peak, size, max(1, repeat))
+
+
+# -- results -----------------------------------------------------------------
+
+
+def _package_versions():
+    versions = {}
+    for name in ('openpyxl', 'pandas', 'numpy'):
+        try:
+            module = __import__(name)
+        except ImportError:
+            continue
+        versions[name] = getattr(module, '__version__', None)
+    return versions
+
+
+def results_document(cases, seed, regressions=()):
+    return {
+        'version': RESULTS_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'packages': _package_versions(),
+        'seed': seed,
+        'cases': [case._asdict() for case in cases],
+        'regressions': [regression._asdict() for regression in regressions],
+    }
+
+
+def load_results(path):
+    import json
+
+    with open(path, encoding='utf-8') as f:
+        doc = json.load(f)
+    if doc.get('version') != RESULTS_VERSION:
+        raise ValueError(f"unsupported results version {doc.get('version')!r}")
+    return [Case(**case) for case in doc['cases']]
+
+
+def compare(cases, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regressions of `cases` against `baseline`, matched on (target, rows)"""
+    previous = {(case.target, case.rows): case for case in baseline}
+    regressions = []
+    for case in cases:
+        old = previous.get((case.target, case.rows))
+        if old is None:
+            continue
+        for metric, floor in (('seconds', MIN_SECONDS_DELTA), ('peak_bytes', MIN_BYTES_DELTA)):
+            before, after = getattr(old, metric), getattr(case, metric)
+            if not before or after is None:
+                continue
+            if after > before * (1 + threshold) and after - before > floor:
+                regressions.append(Regression(case.target, case.rows, metric, before, after,
+                                              round(after / before - 1, 3)))
+    return regressions
+
+
+def write_results(path, doc):
+    import json
+
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(doc, f, indent=2)
+        f.write('\n')
+    os.replace(tmp, path)
+
+
+def _format_bytes(size):
+    if size is None:
+        return '-'
+    for unit in ('B', 'KiB', 'MiB'):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def format_case(case):
+    return (f"{case.target:<12} {case.rows:>9,} rows  {case.seconds:>8.3f} s  "
+            f"{case.rows_per_sec or 0:>10,} rows/s  peak {_format_bytes(case.peak_bytes):>10}  "
+            f"out {_format_bytes(case.output_bytes):>10}")
+
+
+def add_arguments(parser):
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated field row counts (default: {DEFAULT_SIZES})")
+    parser.add_argument("--targets", default=DEFAULT_TARGETS,
+                        help=f"comma-separated targets out of {', '.join(TARGETS)} (default: {DEFAULT_TARGETS})")
+    parser.add_argument("--repeat", type=int, default=1, metavar="N", help="timed runs per case; the best is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc run")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic data seed")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"results file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--baseline", metavar="FILE", help="earlier results file to flag regressions against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"relative change that counts as a regression (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--workdir", default=None, help="where outputs are written while timing (default: a temp dir)")
+
+
+def run(args):
+    import tempfile
+
+    try:
+        sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+    except argparse.ArgumentTypeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    targets = [target.strip() for target in args.targets.split(',') if target.strip()]
+    unknown = [target for target in targets if target not in TARGETS]
+    if unknown:
+        print(f"error: unknown target(s) {', '.join(unknown)}; choose from {', '.join(TARGETS)}", file=sys.stderr)
+        return 2
+    try:
+        baseline = load_results(args.baseline) if args.baseline else None
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        print(f"error: cannot read baseline {args.baseline}: {exc}", file=sys.stderr)
+        return 2
+
+    base = load_dataset()
+    cases = []
+    with tempfile.TemporaryDirectory(prefix='navmap-bench-', dir=args.workdir) as workdir:
+        for target in targets:
+            warm_up(target, base, workdir)
+        for size in sizes:
+            dataset = synthetic_dataset(size, base, seed=args.seed)
+            for target in targets:
+                case = run_case(target, dataset, workdir, repeat=args.repeat, memory=not args.no_memory)
+                cases.append(case)
+                print(format_case(case), flush=True)
+            del dataset
+
+    regressions = compare(cases, baseline, args.threshold) if baseline else []
+    write_results(args.output, results_document(cases, args.seed, regressions))
+    print(f"📄 Results: {args.output}")
+    for regression in regressions:
+        print(f"⚠️  Regression: {regression.target} at {regression.rows:,} rows, {regression.metric} "
+              f"{regression.baseline} -> {regression.current} (+{regression.change:.0%})")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time and memory-profile nav map generation on synthetic data")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,545 @@
+"""
+Command line front end: python -m navmap <command>
+
+    md     Markdown map (advisorhub-navigation-data-map-v2-COMPLETE.md)
+    xlsx   Excel map, one sheet per module (advisorhub-navigation-map-complete.xlsx)
+    csv    flat CSV, one row per field with its module
+    json   the dataset as JSON (same shape as navmap/data/navigation-map.json)
+    stats  row, screen, table and field counts
+    export write several formats (csv, jsonl, md, xlsx, parquet) in one pass (navmap/export.py)
+    import merge edits made in the XLSX back into the dataset (navmap/importer.py)
+    shards one Markdown (and JSON) file per module plus a manifest (navmap/shards.py)
+    search top-k BM25 search over the map rows (navmap/search.py)
+    diff   added/removed/modified rows between two versions of the map (navmap/diff.py)
+    drift  stale / undocumented routes, tables and columns against the code (navmap/drift.py)
+    locale Markdown and XLSX maps in every app locale at once (navmap/locales.py)
+    watch  regenerate the outputs whenever the dataset, sources or migrations change (navmap/watch.py)
+    bench  time and memory-profile generation on synthetic data (navmap/bench.py)
+
+Only argparse and the dataset loader are imported up front; every command
+imports what it needs when it runs, so `python -m navmap md` never loads
+openpyxl or pandas, and only the chosen command's options are built.
+generate_nav_map.py and generate_navigation_xlsx.py are thin wrappers
+around the md and xlsx commands.
+
+The writing commands take --profile [FILE] (or NAVMAP_PROFILE=FILE) to
+report per-stage wall/CPU time, peak memory and rows/sec as JSON, and
+--cprofile FILE (or NAVMAP_CPROFILE=FILE) to dump cProfile stats of the
+slowest stage; see navmap/instrument.py.
+"""
+
+import argparse
+import os
+import sys
+
+from navmap.dataset import load_dataset
+from navmap.instrument import stage
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def check_schema(dataset, mode, catalog=None):
+    """Apply the --schema mode to `dataset` and print the issues; `catalog` defaults to supabase/migrations"""
+    if mode == 'off':
+        return dataset
+    from navmap.schema import apply_schema, build_catalog, format_issues
+
+    with stage('schema', rows=dataset.row_count):
+        dataset, issues = apply_schema(dataset, build_catalog() if catalog is None else catalog, mode)
+    print(f"🗄️  Schema check: {len(issues)} issue(s) against supabase/migrations")
+    if issues:
+        print(format_issues(issues, limit=20))
+    return dataset
+
+
+def _renderer_fingerprint(*names):
+    from navmap.incremental import file_fingerprint
+
+    return file_fingerprint(*(os.path.join(_HERE, name) for name in names))
+
+
+def _load(schema_mode):
+    with stage('load'):
+        dataset = load_dataset()
+    return check_schema(dataset, schema_mode)
+
+
+def _summarize(dataset):
+    from navmap.summary import summarize
+
+    with stage('summary', rows=dataset.row_count):
+        return summarize(dataset)
+
+
+def cmd_md(args):
+    return write_md(args, _load(args.schema))
+
+
+def write_md(args, dataset):
+    """The md command on an already loaded (and schema-checked) dataset"""
+    from navmap.document import PREVIEW_NOTE, markdown_marker, render_footer, render_header
+
+    total_rows = dataset.row_count + len(dataset.sections)
+    output_file = args.output
+    summary = _summarize(dataset)
+    header = render_header(summary)
+    footer = render_footer(summary)
+    is_preview = args.max_rows is not None and args.max_rows < total_rows
+    if is_preview:
+        footer += PREVIEW_NOTE.format(shown=args.max_rows, total=total_rows)
+    if args.changelog:
+        from navmap.diff import DiffError, diff_datasets, format_changelog, load_version
+
+        try:
+            with stage('changelog'):
+                changes = diff_datasets(load_version(args.changelog, dataset.columns), dataset)
+        except DiffError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        footer += format_changelog(changes, f"Changes since {args.changelog}")
+
+    if args.incremental:
+        from navmap.incremental import Manifest, write_markdown_incremental
+
+        manifest = Manifest(os.path.dirname(output_file) or '.')
+        options = ('markdown', _renderer_fingerprint('markdown.py', 'document.py'))
+        with stage('render', rows=dataset.row_count):
+            result = write_markdown_incremental(output_file, header, dataset, footer, markdown_marker, manifest, options)
+        manifest.save()
+
+        if result.status == 'unchanged':
+            print(f"✅ {output_file} is up to date, nothing written")
+        else:
+            print("✅ Navigation data map v2 COMPLETE generated successfully!")
+            print(f"📄 Updated: {output_file} ({result.status} rewrite)")
+            print(f"🔁 Re-rendered: {', '.join(result.rendered)}")
+    else:
+        from navmap.markdown import render_markdown
+        from navmap.rowstore import RowStore
+
+        with stage('rowstore', rows=dataset.row_count):
+            store = RowStore.from_dataset(dataset)
+        with stage('render') as st:
+            rows = store.iter_rows(section_marker=markdown_marker)
+            rows_written = st.rows = render_markdown(output_file, header, rows, footer, max_rows=args.max_rows)
+
+        print("✅ Navigation data map v2 COMPLETE generated successfully!")
+        print(f"📄 Created: {output_file}")
+        if is_preview:
+            print(f"📊 Rows in preview: {rows_written} of {total_rows}")
+            print("💡 NOTE: This is a condensed version. Run without --max-rows for the complete table.")
+        else:
+            print(f"📊 Rows written: {rows_written}")
+
+    if args.prefetch_manifest:
+        from navmap.prefetch import RouteResolver, build_manifest, write_manifest
+
+        with stage('prefetch'):
+            prefetch, _ = build_manifest(dataset, RouteResolver())
+            changed = write_manifest(args.prefetch_manifest, prefetch)
+        if changed:
+            print(f"⚡ Prefetch manifest: {args.prefetch_manifest} ({len(prefetch['routes'])} routes)")
+    return 0
+
+
+def cmd_xlsx(args):
+    return write_xlsx(args, _load(args.schema))
+
+
+def write_xlsx(args, dataset):
+    """The xlsx command on an already loaded (and schema-checked) dataset"""
+    columns = list(dataset.columns)
+    section_count = len(dataset.sections)
+    output_file = args.output
+    summary = _summarize(dataset)
+
+    def write_output(path):
+        from navmap.rowstore import RowStore
+
+        if not (args.pandas or args.single_sheet):
+            from navmap.sheets import write_xlsx_sheets
+
+            write_xlsx_sheets(path, dataset, summary, args.workers)
+            return
+        with stage('rowstore', rows=dataset.row_count):
+            rows = RowStore.from_dataset(dataset).iter_rows()
+        if args.pandas:
+            from navmap.xlsx import write_xlsx_pandas
+
+            write_xlsx_pandas(path, columns, rows, summary)
+        else:
+            from navmap.xlsx import write_xlsx_streaming
+
+            write_xlsx_streaming(path, columns, rows, summary)
+
+    if args.incremental:
+        # An XLSX cannot be patched in place, so any changed section means a full rewrite
+        from navmap.incremental import Manifest, write_incremental
+
+        manifest = Manifest(os.path.dirname(output_file) or '.')
+        layout = 'pandas' if args.pandas else 'stream' if args.single_sheet else 'sheets'
+        options = ('xlsx', layout, _renderer_fingerprint('xlsx.py', 'sheets.py', 'layout.py'))
+        result = write_incremental(output_file, dataset, tuple(columns), '', manifest, write_output, options)
+        manifest.save()
+        if result.status == 'unchanged':
+            print(f"✅ {output_file} is up to date, nothing written")
+            return 0
+        print(f"🔁 Changed: {', '.join(result.rendered)}")
+    else:
+        write_output(output_file)
+
+    print(f"✅ Excel file generated successfully!")
+    print(f"📄 File: {output_file}")
+    if args.pandas or args.single_sheet:
+        print(f"📊 Total rows: {dataset.row_count + section_count} (including {section_count} section headers)")
+    else:
+        print(f"📊 Total rows: {dataset.row_count} on {len(summary.modules)} module sheets, linked from the Index sheet")
+    print(f"📋 Columns: {len(columns)}")
+    print(f"🧮 Summary: {summary.total.editable} editable, {summary.total.read_only} read-only, "
+          f"{summary.total.calculated} calculated fields across {len(summary.total.tables)} tables")
+    print(f"💡 Features: Formatted headers, section highlights, frozen panes, auto-filter, optimized column widths")
+    return 0
+
+
+def _open_output(path, **kwargs):
+    if path == '-':
+        return open(sys.stdout.fileno(), 'w', closefd=False, **kwargs)
+    return open(path, 'w', **kwargs)
+
+
+def cmd_csv(args):
+    import csv
+
+    dataset = _load(args.schema)
+    with stage('write', rows=dataset.row_count), _open_output(args.output, encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('Module',) + tuple(dataset.columns))
+        for section in dataset.sections:
+            module = (section.title,)
+            writer.writerows(module + row for row in section.rows)
+    if args.output != '-':
+        print(f"✅ {args.output}: {dataset.row_count} rows")
+    return 0
+
+
+def cmd_json(args):
+    import json
+
+    dataset = _load(args.schema)
+    if args.records:
+        doc = [
+            dict(zip(('Module',) + tuple(dataset.columns), (section.title,) + row))
+            for section in dataset.sections for row in section.rows
+        ]
+    else:
+        doc = {
+            'columns': list(dataset.columns),
+            'sections': [{'title': s.title, 'icon': s.icon, 'rows': [list(r) for r in s.rows]}
+                         for s in dataset.sections],
+        }
+    with stage('write', rows=dataset.row_count), _open_output(args.output, encoding='utf-8') as f:
+        json.dump(doc, f, ensure_ascii=False, indent=args.indent)
+        f.write('\n')
+    if args.output != '-':
+        print(f"✅ {args.output}: {dataset.row_count} rows")
+    return 0
+
+
+def cmd_stats(args):
+    from navmap.summary import format_summary, summarize
+
+    print(format_summary(summarize(load_dataset())))
+    return 0
+
+
+def cmd_export(args):
+    from navmap.export import run
+
+    return run(args, _load(args.schema))
+
+
+def cmd_import(args):
+    from navmap.importer import run
+
+    return run(args)
+
+
+def cmd_shards(args):
+    from navmap.shards import run
+
+    return run(args, _load(args.schema))
+
+
+def cmd_search(args):
+    from navmap.search import run
+
+    return run(args)
+
+
+def cmd_diff(args):
+    from navmap.diff import run
+
+    return run(args)
+
+
+def cmd_drift(args):
+    from navmap.drift import run
+
+    return run(args, load_dataset())
+
+
+def cmd_locale(args):
+    from navmap.locales import run
+
+    return run(args, _load(args.schema))
+
+
+def cmd_watch(args):
+    from navmap.watch import run
+
+    return run(args)
+
+
+def cmd_bench(args):
+    from navmap.bench import run
+
+    return run(args)
+
+
+def _add_schema_option(parser):
+    parser.add_argument(
+        "--schema",
+        choices=("off", "verify", "fill"),
+        default="off",
+        help="check table/column/type cells against supabase/migrations, or also fill blank ones",
+    )
+
+
+def _add_profile_options(parser):
+    from navmap.instrument import DEFAULT_REPORT
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=DEFAULT_REPORT,
+        metavar="FILE",
+        help=f"write per-stage timings, peak memory and rows/sec as JSON (default file: {DEFAULT_REPORT})",
+    )
+    parser.add_argument(
+        "--cprofile",
+        metavar="FILE",
+        help="also dump cProfile stats of the slowest stage to FILE (timings then include cProfile overhead)",
+    )
+
+
+def _md_arguments(md):
+    from navmap.document import MARKDOWN_OUTPUT
+
+    md.add_argument("-o", "--output", default=MARKDOWN_OUTPUT, help=f"output file (default: {MARKDOWN_OUTPUT})")
+    md.add_argument(
+        "--max-rows",
+        type=int,
+        default=None,
+        metavar="N",
+        help="preview mode: only write the first N table rows",
+    )
+    md.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-render sections whose content changed; skip the write if nothing did",
+    )
+    _add_schema_option(md)
+    _add_profile_options(md)
+    md.add_argument(
+        "--prefetch-manifest",
+        metavar="FILE",
+        help="also write the SPA route prefetch manifest (likely next routes per page) to FILE",
+    )
+    md.add_argument(
+        "--changelog",
+        metavar="REV",
+        help="append the rows changed since REV (a git revision or an older map file) to the footer",
+    )
+
+
+def _xlsx_arguments(xlsx):
+    from navmap.document import XLSX_OUTPUT
+
+    xlsx.add_argument("-o", "--output", default=XLSX_OUTPUT, help=f"output file (default: {XLSX_OUTPUT})")
+    xlsx.add_argument(
+        "--pandas",
+        action="store_true",
+        help="build one sheet through a pandas DataFrame (the original export)",
+    )
+    xlsx.add_argument(
+        "--single-sheet",
+        action="store_true",
+        help="stream every module into one 'Navigation Map' sheet instead of one sheet per module",
+    )
+    xlsx.add_argument("--workers", type=int, default=None, metavar="N",
+                      help="processes rendering the module sheets (default: one per CPU; 0 = in-process)")
+    # Still accepted so existing invocations keep working
+    xlsx.add_argument("--stream", action="store_true", help=argparse.SUPPRESS)
+    xlsx.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip the write entirely when no section changed since the last run",
+    )
+    _add_schema_option(xlsx)
+    _add_profile_options(xlsx)
+
+
+def _csv_arguments(csv_cmd):
+    csv_cmd.add_argument("-o", "--output", default="advisorhub-navigation-map.csv", help="output file, or - for stdout")
+    _add_schema_option(csv_cmd)
+    _add_profile_options(csv_cmd)
+
+
+def _json_arguments(json_cmd):
+    json_cmd.add_argument("-o", "--output", default="advisorhub-navigation-map.json", help="output file, or - for stdout")
+    json_cmd.add_argument("--records", action="store_true", help="one object per field row instead of sections")
+    json_cmd.add_argument("--indent", type=int, default=None, help="pretty-print with this indent")
+    _add_schema_option(json_cmd)
+    _add_profile_options(json_cmd)
+
+
+def _export_arguments(export):
+    from navmap.export import add_arguments
+
+    add_arguments(export)
+    _add_schema_option(export)
+    _add_profile_options(export)
+
+
+def _import_arguments(import_cmd):
+    from navmap.importer import add_arguments
+
+    add_arguments(import_cmd)
+
+
+def _shards_arguments(shards):
+    from navmap.shards import add_arguments
+
+    add_arguments(shards)
+    _add_schema_option(shards)
+    _add_profile_options(shards)
+
+
+def _search_arguments(search):
+    from navmap.search import add_arguments
+
+    add_arguments(search)
+
+
+def _diff_arguments(diff):
+    from navmap.diff import add_arguments
+
+    add_arguments(diff)
+
+
+def _drift_arguments(drift):
+    from navmap.drift import add_arguments
+
+    add_arguments(drift)
+
+
+def _locale_arguments(locale):
+    from navmap.locales import add_arguments
+
+    add_arguments(locale)
+    _add_schema_option(locale)
+    _add_profile_options(locale)
+
+
+def _watch_arguments(watch):
+    from navmap.watch import add_arguments
+
+    add_arguments(watch)
+
+
+def _bench_arguments(bench):
+    from navmap.bench import add_arguments
+
+    add_arguments(bench)
+
+
+# name -> (help, argument setup, handler)
+COMMANDS = {
+    'md': ("write the Markdown map", _md_arguments, cmd_md),
+    'xlsx': ("write the Excel map", _xlsx_arguments, cmd_xlsx),
+    'csv': ("write a flat CSV of every field row", _csv_arguments, cmd_csv),
+    'json': ("write the dataset as JSON", _json_arguments, cmd_json),
+    'stats': ("print counts for the map", None, cmd_stats),
+    'export': ("write several formats in one pass", _export_arguments, cmd_export),
+    'import': ("merge edits from the XLSX map back into the dataset", _import_arguments, cmd_import),
+    'shards': ("write one file per module plus a manifest", _shards_arguments, cmd_shards),
+    'search': ("find the rows most relevant to a query", _search_arguments, cmd_search),
+    'diff': ("compare two versions of the map row by row", _diff_arguments, cmd_diff),
+    'drift': ("check the map against the App.jsx routes and the migrations", _drift_arguments, cmd_drift),
+    'locale': ("write the map in several locales in one run", _locale_arguments, cmd_locale),
+    'watch': ("keep the outputs current as their inputs change", _watch_arguments, cmd_watch),
+    'bench': ("benchmark generation at 1k-1M synthetic rows", _bench_arguments, cmd_bench),
+}
+
+
+def build_parser(prog=None, command=None):
+    """
+    Argument parser for the CLI.
+
+    Every command is listed, but when `command` is given only that one gets
+    its options: argparse validates each add_argument() eagerly, and
+    skipping the unused ones is a noticeable share of a cold start.
+    """
+    parser = argparse.ArgumentParser(prog=prog, description="Generate the AdvisorHub navigation map documents")
+    commands = parser.add_subparsers(dest="command", metavar="command", required=True)
+    for name, (help_text, setup, handler) in COMMANDS.items():
+        sub = commands.add_parser(name, help=help_text)
+        if setup is not None and command in (None, name):
+            setup(sub)
+        sub.set_defaults(func=handler)
+    return parser
+
+
+def main(argv=None, prog=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser(prog, argv[0] if argv and argv[0] in COMMANDS else None)
+    args = parser.parse_args(argv)
+    if getattr(args, 'incremental', False) and getattr(args, 'max_rows', None) is not None:
+        parser.error("--incremental cannot be combined with --max-rows")
+
+    report, dump = _profile_settings(args)
+    if report is None and dump is None:
+        return args.func(args)
+    return _run_profiled(args, report, dump)
+
+
+def _profile_settings(args):
+    from navmap.instrument import DEFAULT_REPORT, environment_settings
+
+    if not hasattr(args, 'profile'):
+        return None, None
+    env_report, env_dump = environment_settings()
+    report = args.profile or env_report
+    dump = args.cprofile or env_dump
+    if dump is not None and report is None:
+        report = DEFAULT_REPORT
+    return report, dump
+
+
+def _run_profiled(args, report, dump):
+    from navmap import instrument
+
+    profiler = instrument.enable(cprofile=dump is not None)
+    try:
+        with stage(args.command):
+            status = args.func(args)
+    finally:
+        instrument.disable()
+    profiler.write_report(report, command=args.command)
+    print(profiler.format())
+    print(f"⏱️  Profile: {report}")
+    if dump is not None:
+        hottest = profiler.dump_hottest(dump)
+        if hottest is not None:
+            print(f"🔥 cProfile of the slowest stage ({hottest.name}): {dump}")
+    return status
@@ -0,0 +1,193 @@
+"""
+Canonical navigation map dataset
+
+navmap/data/navigation-map.json is the single source of truth for the map
+rows; both generators load it through load_dataset(). The parsed form is
+cached as a marshal file keyed by the content hash of the JSON, so repeat
+runs skip JSON parsing and validation entirely. dump_dataset() writes it
+back in the same layout (one row per line), so tools that edit the map
+produce reviewable diffs.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+from collections import namedtuple
+
+# os.path rather than pathlib: pathlib alone costs more to import than a cached load
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(_HERE, 'data', 'navigation-map.json')
+CACHE_DIR = os.path.join(_HERE, '.cache')
+
+# Bump when the cached layout changes so stale caches are ignored
+CACHE_FORMAT = 1
+
+# Compiled caches kept around, so switching between revisions stays fast
+CACHE_KEEP = 8
+
+Section = namedtuple('Section', ['title', 'icon', 'rows'])
+
+
+class DatasetError(ValueError):
+    """Raised when the dataset file is malformed"""
+
+
+class Dataset:
+    """Parsed navigation map: column names plus rows grouped by module section"""
+
+    __slots__ = ('columns', 'sections', 'digest')
+
+    def __init__(self, columns, sections, digest=None):
+        self.columns = columns
+        self.sections = sections
+        self.digest = digest
+
+    @property
+    def row_count(self):
+        """Number of field rows, excluding section headers"""
+        return sum(len(section.rows) for section in self.sections)
+
+    def iter_rows(self, section_marker=None):
+        """
+        Yield every table row in order, with a header row before each section.
+
+        The section header row carries the label in the first column and
+        empty strings elsewhere. `section_marker` formats the label from a
+        Section; by default it is '<icon> <TITLE>', which is what the XLSX
+        writer detects as a section row.
+        """
+        blanks = ('',) * (len(self.columns) - 1)
+        for section in self.sections:
+            label = section_marker(section) if section_marker else section_label(section)
+            yield (label,) + blanks
+            yield from section.rows
+
+
+def section_label(section):
+    return f"{section.icon} {section.title}"
+
+
+def _digest(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def _cache_path(digest):
+    # marshal's format is tied to the interpreter version
+    tag = f"py{sys.version_info[0]}{sys.version_info[1]}-m{marshal.version}-v{CACHE_FORMAT}"
+    return os.path.join(CACHE_DIR, f"navigation-map-{digest}-{tag}.marshal")
+
+
+def _parse(raw, path):
+    # Only needed on a cache miss, so keep it off the fast path
+    import json
+
+    try:
+        doc = json.loads(raw)
+    except ValueError as exc:
+        raise DatasetError(f"{path}: invalid JSON ({exc})") from exc
+
+    try:
+        columns = tuple(doc['columns'])
+        width = len(columns)
+        sections = []
+        for section in doc['sections']:
+            rows = []
+            for row in section['rows']:
+                if len(row) != width:
+                    raise DatasetError(
+                        f"{path}: row in section {section['title']!r} has {len(row)} cells, expected {width}: {row!r}"
+                    )
+                rows.append(tuple(row))
+            sections.append((section['title'], section['icon'], tuple(rows)))
+    except (KeyError, TypeError) as exc:
+        raise DatasetError(f"{path}: unexpected structure ({exc!r})") from exc
+    return columns, tuple(sections)
+
+
+def _write_cache(cache_file, payload):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{cache_file}.tmp{os.getpid()}"
+        with open(tmp, 'wb') as f:
+            marshal.dump(payload, f)
+        os.replace(tmp, cache_file)
+        cached = [
+            os.path.join(CACHE_DIR, name) for name in os.listdir(CACHE_DIR)
+            if name.startswith('navigation-map-') and name.endswith('.marshal')
+        ]
+        cached.sort(key=os.path.getmtime, reverse=True)
+        for stale in cached[CACHE_KEEP:]:
+            os.unlink(stale)
+    except OSError:
+        # The cache is an optimisation only; a read-only checkout still works
+        pass
+
+
+def load_dataset(path=DATA_FILE, use_cache=True):
+    """Load the dataset, going through the compiled cache when possible"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    digest = _digest(raw)
+    cache_file = _cache_path(digest)
+
+    payload = None
+    if use_cache:
+        try:
+            with open(cache_file, 'rb') as f:
+                payload = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            payload = None
+
+    if payload is None:
+        payload = _parse(raw, path)
+        if use_cache:
+            _write_cache(cache_file, payload)
+
+    columns, sections = payload
+    return Dataset(columns, [Section(*section) for section in sections], digest)
+
+
+def parse_dataset(raw, name):
+    """Dataset from the bytes of a dataset file (an old revision, say); `name` is used in errors"""
+    columns, sections = _parse(raw, name)
+    return Dataset(columns, [Section(*section) for section in sections], _digest(raw))
+
+
+def format_dataset(columns, sections):
+    """The dataset file's text: indented structure with one row per line"""
+    import json
+
+    def dumps(value):
+        return json.dumps(value, ensure_ascii=False)
+
+    out = ['{\n', f'  "columns": {dumps(list(columns))},\n', '  "sections": [\n']
+    for index, section in enumerate(sections):
+        out.append('    {\n')
+        out.append(f'      "title": {dumps(section.title)},\n')
+        out.append(f'      "icon": {dumps(section.icon)},\n')
+        if section.rows:
+            out.append('      "rows": [\n')
+            out.append(',\n'.join('        ' + dumps(list(row)) for row in section.rows))
+            out.append('\n      ]\n')
+        else:
+            out.append('      "rows": []\n')
+        out.append('    },\n' if index < len(sections) - 1 else '    }\n')
+    out.append('  ]\n}\n')
+    return ''.join(out)
+
+
+def dump_dataset(dataset, path=DATA_FILE):
+    """Write `dataset` to the JSON file atomically; returns False if it already had this content"""
+    text = format_dataset(dataset.columns, dataset.sections).encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(text)
+    os.replace(tmp, path)
+    return True
@@ -0,0 +1,364 @@
+"""
+Structural diff between two versions of the navigation map
+
+Rows are keyed by (screen, screen section, section field), with the
+occurrence number added for keys that repeat, and the rest of each row
+(its module and the other columns) is reduced to one hash. Both versions
+are indexed in a single pass each, so the diff is linear in the number
+of rows, and only rows whose hashes differ are compared column by column.
+Changes come out as added, removed and modified rows, with the changed
+columns and their old and new values.
+
+Either side can be
+
+    (nothing)            the current dataset (navmap/data/navigation-map.json)
+    FILE.json            a dataset file
+    FILE.md              a generated Markdown map (its table is parsed back)
+    FILE.xlsx            a generated or edited XLSX map (read with navmap.importer)
+    REV                  the dataset file at a git revision (HEAD~3, main, a tag, ...)
+    REV:PATH             any of the files above at a git revision
+
+format_changelog() renders the changes as a short Markdown section that
+`python -m navmap md --changelog REV` appends to the footer.
+
+Usage: python -m navmap.diff OLD [NEW] [--json] [--changelog] [--limit N] [--exit-code]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import namedtuple
+
+from navmap.dataset import DATA_FILE, Dataset, DatasetError, Section
+
+# Map columns that identify a row: Current Screen, Screen Section, Section Field
+KEY_COLUMNS = (0, 3, 4)
+
+Change = namedtuple('Change', ['kind', 'key', 'module', 'old', 'new', 'columns'])
+
+KINDS = ('added', 'removed', 'modified')
+
+
+class DiffError(ValueError):
+    """Raised when a version cannot be loaded"""
+
+
+# -- indexing and comparison -------------------------------------------------
+
+
+def index_rows(dataset):
+    """{key: (hash of module and row, module, row)} in dataset order"""
+    index = {}
+    counts = {}
+    k0, k1, k2 = KEY_COLUMNS
+    for section in dataset.sections:
+        module = section.title
+        for row in section.rows:
+            base = (row[k0], row[k1], row[k2])
+            occurrence = counts.get(base)
+            if occurrence is None:
+                counts[base] = 1
+                key = base + (0,)
+            else:
+                counts[base] = occurrence + 1
+                key = base + (occurrence,)
+            index[key] = (hash((module, row)), module, row)
+    return index
+
+
+def _project(dataset, columns):
+    """`dataset` with only `columns`, in that order"""
+    if tuple(dataset.columns) == tuple(columns):
+        return dataset
+    positions = [dataset.columns.index(name) for name in columns]
+    sections = [Section(s.title, s.icon, tuple(tuple(row[p] for p in positions) for row in s.rows))
+                for s in dataset.sections]
+    return Dataset(tuple(columns), sections, dataset.digest)
+
+
+def diff_datasets(old, new):
+    """
+    Changes from `old` to `new`: removed rows first (in `old` order), then
+    modified and added rows in `new` order.
+
+    Only columns both versions have are compared; compare the columns
+    themselves with column_changes().
+    """
+    if tuple(old.columns) != tuple(new.columns):
+        shared = [name for name in old.columns if name in new.columns]
+        missing = [name for name in (old.columns[i] for i in KEY_COLUMNS) if name not in shared]
+        if missing:
+            raise DiffError(f"cannot key rows without column(s): {', '.join(missing)}")
+        old, new = _project(old, shared), _project(new, shared)
+    columns = old.columns
+    before = index_rows(old)
+    after = index_rows(new)
+
+    changes = [Change('removed', key, module, row, None, ())
+               for key, (_, module, row) in before.items() if key not in after]
+    for key, (digest, module, row) in after.items():
+        previous = before.get(key)
+        if previous is None:
+            changes.append(Change('added', key, module, None, row, ()))
+        elif previous[0] != digest:
+            _, old_module, old_row = previous
+            if old_module == module and old_row == row:
+                continue
+            changed = tuple(columns[col] for col, (a, b) in enumerate(zip(old_row, row)) if a != b)
+            if old_module != module:
+                changed = ('Module',) + changed
+            changes.append(Change('modified', key, module, old_row, row, changed))
+    return changes
+
+
+def column_changes(old, new):
+    """(added, removed) column names"""
+    return ([name for name in new.columns if name not in old.columns],
+            [name for name in old.columns if name not in new.columns])
+
+
+def counts(changes):
+    totals = dict.fromkeys(KINDS, 0)
+    for change in changes:
+        totals[change.kind] += 1
+    return totals
+
+
+# -- loading versions --------------------------------------------------------
+
+
+def parse_markdown(text, columns=None):
+    """
+    Dataset from a generated Markdown map.
+
+    The map table starts at the row holding the column names (the first
+    table row starting with 'Current Screen' when `columns` is None); a
+    row with a bold first cell and nothing else is a section header.
+    """
+    import re
+
+    split = re.compile(r'(?<!\\)\|').split
+    header = None
+    sections = []
+    current = None
+    for number, line in enumerate(text.splitlines(), 1):
+        if not line.startswith('|'):
+            if header is not None and sections:
+                break
+            continue
+        cells = [cell.strip().replace('\\|', '|').replace('<br>', '\n') for cell in split(line.strip())[1:-1]]
+        if header is None:
+            if (columns is not None and tuple(cells) == tuple(columns)) or \
+                    (columns is None and cells and cells[0].startswith('Current Screen')):
+                header = tuple(cells)
+            continue
+        if set(''.join(cells)) <= set('-: '):
+            continue
+        if len(cells) != len(header):
+            raise DiffError(f"line {number}: expected {len(header)} cells, found {len(cells)}")
+        first = cells[0]
+        if first.startswith('**') and first.endswith('**') and not any(cells[1:]):
+            icon, _, title = first[2:-2].partition(' ')
+            current = (title, icon, [])
+            sections.append(current)
+        elif current is None:
+            raise DiffError(f"line {number}: row before the first section header")
+        else:
+            current[2].append(tuple(cells))
+    if header is None:
+        raise DiffError("no navigation map table found")
+    return Dataset(header, [Section(title, icon, tuple(rows)) for title, icon, rows in sections])
+
+
+def _git_show(revision, path):
+    directory = os.path.dirname(os.path.abspath(path))
+    spec = f"{revision}:./{os.path.basename(path)}"
+    try:
+        result = subprocess.run(['git', 'show', spec], cwd=directory, capture_output=True, check=False)
+    except OSError as exc:
+        raise DiffError(f"cannot run git: {exc}") from exc
+    if result.returncode != 0:
+        message = result.stderr.decode('utf-8', 'replace').strip()
+        raise DiffError(f"git show {spec}: {message}")
+    return result.stdout
+
+
+def _read_xlsx(path, columns):
+    import zipfile
+    from xml.etree.ElementTree import ParseError
+
+    from navmap.importer import WorkbookError, read_workbook
+
+    try:
+        return read_workbook(path, columns)
+    except (WorkbookError, KeyError, zipfile.BadZipFile, ParseError) as exc:
+        raise DiffError(str(exc)) from exc
+
+
+def _from_bytes(raw, name, columns):
+    from navmap.dataset import parse_dataset
+
+    ext = os.path.splitext(name)[1].lower()
+    if ext == '.md':
+        return parse_markdown(raw.decode('utf-8'), columns)
+    if ext == '.xlsx':
+        import tempfile
+
+        fd, tmp = tempfile.mkstemp(suffix='.xlsx')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(raw)
+            return _read_xlsx(tmp, columns)
+        finally:
+            os.unlink(tmp)
+    try:
+        return parse_dataset(raw, name)
+    except DatasetError as exc:
+        raise DiffError(str(exc)) from exc
+
+
+def load_version(spec=None, columns=None):
+    """
+    Dataset for a version spec (see the module docstring).
+
+    `columns` tells the Markdown and XLSX readers which header to expect;
+    by default it is the current dataset's.
+    """
+    from navmap.dataset import load_dataset
+
+    if spec is None:
+        return load_dataset()
+    if columns is None:
+        columns = load_dataset().columns
+    if os.path.exists(spec):
+        if spec.lower().endswith('.xlsx'):
+            return _read_xlsx(spec, columns)
+        with open(spec, 'rb') as f:
+            return _from_bytes(f.read(), spec, columns)
+    revision, _, path = spec.partition(':')
+    path = path or DATA_FILE
+    return _from_bytes(_git_show(revision, path), path, columns)
+
+
+# -- reports -----------------------------------------------------------------
+
+
+def _where(key):
+    screen, section, field, occurrence = key
+    return f"{screen} › {section} › {field}" + (f" #{occurrence + 1}" if occurrence else '')
+
+
+def _clip(value, width=60):
+    value = value.replace('\n', ' ')
+    return value if len(value) <= width else value[:width - 1] + '…'
+
+
+def format_changes(changes, limit=20, columns=None, verbose=False):
+    """Plain-text report; with `verbose` (and `columns`) each changed cell is shown"""
+    totals = counts(changes)
+    lines = [f"{totals['added']} added, {totals['removed']} removed, {totals['modified']} modified"]
+    for change in changes[:limit]:
+        detail = f" ({', '.join(change.columns)})" if change.columns else ''
+        lines.append(f"  {change.kind:<8} {change.module}: {_where(change.key)}{detail}")
+        if verbose and columns and change.kind == 'modified':
+            for col, name in enumerate(columns):
+                if change.old[col] != change.new[col]:
+                    lines.append(f"             {name}: {_clip(change.old[col])!r} → {_clip(change.new[col])!r}")
+    if len(changes) > limit:
+        lines.append(f"  ... {len(changes) - limit} more")
+    return '\n'.join(lines)
+
+
+def format_changelog(changes, title="Changes", limit=30):
+    """Markdown section listing the changes, for the end of the map document"""
+    totals = counts(changes)
+    lines = [
+        "",
+        f"## 📝 {title}",
+        "",
+        f"**{totals['added']}** added, **{totals['removed']}** removed, **{totals['modified']}** modified rows",
+        "",
+    ]
+    labels = {'added': 'Added', 'removed': 'Removed', 'modified': 'Changed'}
+    for change in changes[:limit]:
+        screen, section, field, occurrence = change.key
+        name = f"`{screen}` › {section} › {field}" + (f" #{occurrence + 1}" if occurrence else '')
+        detail = f" ({', '.join(change.columns)})" if change.columns else ''
+        lines.append(f"- {labels[change.kind]}: {name}{detail}")
+    if len(changes) > limit:
+        lines.append(f"- … and {len(changes) - limit} more")
+    if not changes:
+        lines.append("- No row changes")
+    lines.append("")
+    return '\n'.join(lines) + '\n'
+
+
+def changes_as_json(changes, columns):
+    keys = ('screen', 'section', 'field', 'occurrence')
+    records = []
+    for change in changes:
+        record = {'kind': change.kind, **dict(zip(keys, change.key)), 'module': change.module}
+        if change.kind == 'modified':
+            record['columns'] = {
+                name: [change.old[col], change.new[col]]
+                for col, name in enumerate(columns) if change.old[col] != change.new[col]
+            }
+            if 'Module' in change.columns:
+                record['columns'] = {'Module': None, **record['columns']}
+        else:
+            record['row'] = list(change.new if change.kind == 'added' else change.old)
+        records.append(record)
+    return records
+
+
+def add_arguments(parser):
+    parser.add_argument("old", help="old version: FILE.json|.md|.xlsx, REV or REV:PATH")
+    parser.add_argument("new", nargs="?", default=None, help="new version (default: the current dataset)")
+    parser.add_argument("--json", action="store_true", help="print the changes as JSON")
+    parser.add_argument("--changelog", action="store_true", help="print the Markdown changelog section")
+    parser.add_argument("-v", "--verbose", action="store_true", help="show old and new values of changed cells")
+    parser.add_argument("--limit", type=int, default=50, metavar="N", help="changes to list (default: 50)")
+    parser.add_argument("--exit-code", action="store_true", help="exit with 1 when the versions differ")
+
+
+def run(args):
+    import time
+
+    try:
+        new = load_version(args.new)
+        old = load_version(args.old, new.columns)
+        started = time.perf_counter()
+        changes = diff_datasets(old, new)
+    except DiffError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+    columns = [name for name in old.columns if name in new.columns]
+
+    if args.json:
+        import json
+
+        added, removed = column_changes(old, new)
+        doc = {'counts': counts(changes), 'columns_added': added, 'columns_removed': removed,
+               'changes': changes_as_json(changes, columns)}
+        print(json.dumps(doc, ensure_ascii=False, indent=2))
+    elif args.changelog:
+        print(format_changelog(changes, f"Changes since {args.old}", args.limit), end='')
+    else:
+        added, removed = column_changes(old, new)
+        if added or removed:
+            print(f"Columns: +{', '.join(added) or '-'} / -{', '.join(removed) or '-'}")
+        print(format_changes(changes, args.limit, columns, args.verbose))
+        print(f"({old.row_count} → {new.row_count} rows, compared in {elapsed * 1000:.1f} ms)", file=sys.stderr)
+    return 1 if args.exit_code and changes else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two versions of the navigation map row by row")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
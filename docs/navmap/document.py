@@ -0,0 +1,298 @@
+"""
+Fixed prose of the navigation map documents
+
+The Markdown map is this header, the table rendered from the dataset and
+this footer; the generators and `python -m navmap md` share them from here.
+The figures in them (row, page, table and field counts, the per-module and
+per-table breakdowns) are filled in by render_header() / render_footer()
+from a navmap.summary.Summary of the rows being written.
+"""
+
+import re
+
+from navmap.dataset import section_label
+
+# Default output files, relative to the working directory
+MARKDOWN_OUTPUT = 'advisorhub-navigation-data-map-v2-COMPLETE.md'
+XLSX_OUTPUT = 'advisorhub-navigation-map-complete.xlsx'
+
+# Header content; {rows} and {pages} are filled in by render_header()
+HEADER = """# 🧭 AdvisorHub Navigation + Data Map (v2 – With Metadata)
+
+> **Purpose**: A unified, AI-readable map connecting front-end screens, UI sections, and Supabase backend schema, designed for system navigation, auto-form generation, and validation logic.
+
+## 📂 What's Included
+
+| Category | Description |
+|----------|-------------|
+| **Navigation structure** | Every major screen (/login, /customers, /new-business, /profile-settings, etc.) with "Navigate From" and "Navigate To" paths. |
+| **UI composition** | Adds Screen Section and Section Field columns (e.g., Personal Information → Full Name / Email / Advisor ID). |
+| **Backend linkage** | Maps each field to its Supabase table and column name (e.g., users.full_name, user_preferences.language). |
+| **Metadata** | New columns: Data Type, Editable, and Validation Rules/Notes for each field. |
+| **Validation logic** | Includes regex, enum values, required flags, and read-only vs editable distinctions. |
+| **Coverage** | Full navigation hierarchy + expanded detail for ALL pages (Login, Register, Home, Customers, NewBusiness, Analytics, ToDo, Broadcast, Policies). |
+| **Format** | Clean Markdown table — ready for Claude or LangGraph ingestion, schema generation, or AI routing logic. |
+
+---
+
+## 🗺️ Complete Navigation + Data Map
+
+**NOTE**: This table contains {rows} rows documenting every field across all {pages} pages.
+
+| Current Screen / Module | Navigate From | Navigate To | Screen Section | Section Field | Description / Key Interactions | Supabase Table | Supabase Column Name | Data Type | Editable | Validation Rule / Notes |
+|--------------------------|----------------|--------------|----------------|----------------|--------------------------------|----------------|----------------------|------------|-----------|--------------------------|
+"""
+
+
+def markdown_marker(section):
+    """Section header cell of the Markdown table"""
+    return f"**{section_label(section)}**"
+
+
+# Footer content, followed by FOOTER_SUMMARY and FOOTER_SIGNATURE in render_footer()
+FOOTER = """
+---
+
+## 🔄 Cross-Module Workflows
+
+### 1. Lead to Policy Journey
+```
+/customers → /customers/detail?id=new (create lead)
+→ /new-business → /proposals/detail?id=new (create proposal)
+→ /proposals/detail (fact finding → FNA → recommendation → quotation → application)
+→ /new-business (proposal list shows "Pending for UW")
+→ [External: Underwriting Approval]
+→ /customers/detail?id={leadId} (now is_client=true)
+→ Portfolio Tab shows new policy
+→ /policies/detail?id={policyId}
+```
+
+### 2. Quick Quote to Proposal
+```
+/ (home) → /quick-quote
+→ fill inputs → calculate premium
+→ /quote-summary
+→ "Convert to Proposal" button
+→ Client selection modal
+→ /proposals/detail?id=new (pre-filled with quote data, starts at Quotation stage)
+```
+
+### 3. Hot Lead Follow-up
+```
+/ (home) → Hot Leads widget shows "John Doe (not contacted 45 days)"
+→ Click card → /customers/detail?id={leadId}
+→ "Schedule Appointment" button
+→ /todo/new?leadId={leadId}&type=appointment
+→ Fill date, time, duration
+→ Save → returns to /todo
+→ Calendar view shows appointment
+```
+
+### 4. Gap Analysis to Proposal
+```
+/customers/detail?id={leadId} → Gap & Opportunity Tab
+→ View gap analysis (e.g., Death coverage shortfall $200,000)
+→ "Propose Solution" button
+→ /proposals/detail?id=new&leadId={leadId}
+→ FNA pre-filled with existing coverage
+→ Recommendation stage suggests products to close gap
+```
+
+### 5. Broadcast to Action
+```
+/ (home) → Broadcast Feed widget shows unread announcement
+→ Click → /broadcast/detail?id={broadcastId}
+→ Read content: "New product launch training on March 15"
+→ Auto-marked as read
+→ Back to / → Sidebar → /todo
+→ Create appointment for training date
+```
+
+---
+
+## 🔑 Query Parameters Reference
+
+| Route | Parameter | Type | Required | Description |
+|-------|-----------|------|----------|-------------|
+| /customers/detail | `id` | string | Y | Lead ID; `id=new` for new lead creation |
+| /proposals/detail | `id` | string | Y | Proposal ID; `id=new` for new proposal |
+| /proposals/detail | `leadId` | string | N | Pre-select client for new proposal |
+| /proposals/detail | `stage` | enum | N | Jump to specific stage (factfind, fna, recommendation, quotation, application) |
+| /quick-quote | (none) | — | — | No query params |
+| /quote-summary | `product` | string | Y | Product ID |
+| /quote-summary | `age` | number | Y | Life assured age |
+| /quote-summary | `gender` | enum | Y | Male / Female |
+| /quote-summary | `smoker` | boolean | Y | true / false |
+| /quote-summary | `sumAssured` | number | Y | Coverage amount |
+| /quote-summary | `premiumTerm` | number | Y | Payment duration |
+| /quote-summary | `coverageTerm` | number | Y | Coverage duration |
+| /quote-summary | `paymentFrequency` | enum | Y | Monthly / Quarterly / Annual |
+| /quote-summary | `premium` | number | Y | Calculated premium amount |
+| /policies/detail | `id` | string | Y | Policy ID |
+| /broadcast/detail | `id` | string | Y | Broadcast ID |
+| /todo/new | `leadId` | string | N | Pre-link task to specific lead |
+| /todo/new | `type` | enum | N | Pre-select Task or Appointment |
+| /todo/new | `date` | date | N | Pre-fill date (ISO format) |
+| /customers | `filter` | enum | N | Status filter (hot, contacted, proposal, is_client) |
+| /customers | `search` | string | N | Search query string |
+| /customers | `source` | enum | N | Lead source filter |
+| /todo | `view` | enum | N | list / calendar view |
+| /todo | `filter` | enum | N | pending / completed filter |
+| /new-business | `stage` | enum | N | Stage filter |
+| /new-business | `status` | enum | N | Status filter |
+
+---
+
+## 💾 Local Storage & Session Storage
+
+| Key | Storage Type | Data Type | Description |
+|-----|--------------|-----------|-------------|
+| `advisorhub:sidebar-collapsed` | localStorage | boolean | Sidebar collapse state |
+| `analyticsPrefs` | localStorage | object | Analytics dashboard preferences (period, chart types) |
+| `advisorhub:broadcast-read:{id}` | sessionStorage | string | Broadcast read status (per session) |
+| `advisorhub:customer-filters` | sessionStorage | object | Customer list filter state |
+| `advisorhub:customer-view` | sessionStorage | enum | Customer list/grid view preference |
+| `advisorhub:proposal-filters` | sessionStorage | object | Proposal list filter state |
+| `advisorhub:todo-view` | sessionStorage | enum | Todo list/calendar view |
+| `advisorhub:todo-filters` | sessionStorage | object | Todo filter state |
+| `advisorhub:tab-{leadId}` | sessionStorage | string | Last active tab in CustomerDetail |
+| `advisorhub:analytics-period` | sessionStorage | string | Analytics period selection |
+| `supabase.auth.token` | localStorage | object | Supabase auth token (managed by SDK) |
+
+---
+
+## 🔐 Authentication & Route Guards
+
+### Public Routes (No Auth Required)
+- `/login`
+- `/register`
+
+### Protected Routes (Auth Required)
+All other routes require authentication. Auth check logic in `AdminLayout.jsx`:
+
+```javascript
+// If not authenticated and not on public page → redirect to /login
+// If authenticated and on public page → redirect to / (home)
+```
+
+### Role-Based Access (Future Enhancement)
+Currently no role differentiation. All authenticated users have access to all protected routes.
+Future roles may include:
+- **Advisor**: Full access to sales modules
+- **Manager**: Analytics + team management
+- **Admin**: Full system access + user management
+
+"""
+
+# {fields} and the rest are filled in by render_footer()
+FOOTER_SUMMARY = """---
+
+## 🧱 Why This Format Works
+
+- Each **row = 1 atomic navigable unit** (screen, section, or field)
+- Claude or your orchestrator can parse column headers and build:
+  - Route trees
+  - API bindings
+  - Validation logic directly
+- You can extend this easily for any new pages without schema drift
+- **{fields} fields documented** across {pages} pages
+- **25+ API endpoints** identified
+- **Complete validation rules** for every editable field
+- **Calculated fields** clearly marked with formulas
+- **Query parameters** for deep linking and state management
+
+---
+
+## 📊 Summary
+
+- **Total Pages**: {pages}
+- **Total Fields Documented**: {fields}
+- **Editable Fields**: {editable} ({editable_ratio} of fields with an Editable flag)
+- **Read-Only Fields**: {read_only}
+- **Calculated Fields**: {calculated}
+- **Supabase Tables**: {tables} ({columns} distinct columns)
+- **Query Parameters**: {query_params} in the reference ({linked_params} linked from map rows)
+- **Storage Keys**: {storage_keys}
+- **User Workflows**: {workflows} complete journeys
+
+### By Module
+
+| Module | Fields | Editable | Read-Only | Editable % | Calculated | Tables | Columns | Query Params |
+|--------|--------|----------|-----------|------------|------------|--------|---------|--------------|
+{module_rows}
+
+### By Supabase Table
+
+| Table | Fields | Editable | Read-Only | Calculated | Columns | Modules |
+|-------|--------|----------|-----------|------------|---------|---------|
+{table_rows}
+"""
+
+FOOTER_SIGNATURE = """
+---
+
+**Last Updated**: 2025-11-05
+**Version**: 2.0 (Full Field-Level Documentation)
+**Maintainer**: AdvisorHub Development Team
+"""
+
+# Appended to the footer when only part of the table is written (--max-rows)
+PREVIEW_NOTE = """
+**Note**: This is a condensed preview showing the first {shown} of {total} rows. Run `python generate_nav_map.py` without `--max-rows` to generate the complete table.
+"""
+
+# Appended to the footer of a translated map (navmap/locales.py)
+LOCALE_NOTE = """
+**Locale**: `{locale}` — {translated} of {total} distinct section, field and description strings translated from the app's i18n catalog; the rest, and the prose above, are in English.
+"""
+
+
+def _footer_part(heading):
+    """Text of the footer section under `heading`, up to the next '---' rule"""
+    start = FOOTER.index(heading)
+    end = FOOTER.find('\n---', start)
+    return FOOTER[start:end if end != -1 else len(FOOTER)]
+
+
+def prose_counts():
+    """(query parameters, storage keys, workflows) documented in the footer prose"""
+    params = re.findall(r'^\| /\S* \| `', _footer_part('## 🔑 Query Parameters Reference'), re.MULTILINE)
+    keys = re.findall(r'^\| `', _footer_part('## 💾 Local Storage'), re.MULTILINE)
+    workflows = re.findall(r'^### \d+\.', _footer_part('## 🔄 Cross-Module Workflows'), re.MULTILINE)
+    return len(params), len(keys), len(workflows)
+
+
+def render_header(summary):
+    return HEADER.format(rows=summary.total.rows, pages=summary.pages)
+
+
+def render_footer(summary):
+    from navmap.summary import percent
+
+    total = summary.total
+    query_params, storage_keys, workflows = prose_counts()
+    module_rows = '\n'.join(
+        f"| {title} | {c.rows} | {c.editable} | {c.read_only} | {percent(c.editable_ratio)} | {c.calculated} "
+        f"| {len(c.tables)} | {len(c.columns)} | {len(c.params)} |"
+        for title, c in summary.modules.items()
+    )
+    table_rows = '\n'.join(
+        f"| `{name}` | {c.rows} | {c.editable} | {c.read_only} | {c.calculated} | {len(c.columns)} | {len(c.modules)} |"
+        for name, c in sorted(summary.tables.items(), key=lambda item: (-item[1].rows, item[0]))
+    )
+    return FOOTER + FOOTER_SUMMARY.format(
+        fields=total.rows,
+        pages=summary.pages,
+        editable=total.editable,
+        editable_ratio=percent(total.editable_ratio),
+        read_only=total.read_only,
+        calculated=total.calculated,
+        tables=len(total.tables),
+        columns=len(total.columns),
+        query_params=query_params,
+        linked_params=len(total.params),
+        storage_keys=storage_keys,
+        workflows=workflows,
+        module_rows=module_rows,
+        table_rows=table_rows,
+    ) + FOOTER_SIGNATURE
@@ -0,0 +1,261 @@
+"""
+Drift between the navigation map and the code it documents
+
+Builds two hash indexes, the routes declared in src/App.jsx (through
+navmap.prefetch's RouteResolver) and the tables and columns created across
+supabase/migrations (navmap.schema's Catalog), then joins every map row
+against them in a single pass. Each distinct screen / navigation cell and
+column cell is parsed and looked up once, so the check is linear in the
+number of rows and cheap enough to run on every commit. It reports:
+
+    stale_route          a map route App.jsx no longer declares
+    unknown_table        a Supabase Table the migrations never create
+    unknown_column       a column missing from a table the migrations create
+    undocumented_route   an App.jsx page no map row reaches
+    undocumented_column  a column of a documented table no map row names
+
+Route parameters are folded before the join, so '/workflows/:id' in
+App.jsx matches '/workflows/{id}' in the map. Layout routes (the ones
+whose index route redirects to a child) and the id / created_at /
+updated_at bookkeeping columns are never counted as undocumented.
+
+The exit status is 1 when anything drifted and 0 otherwise. A --baseline
+file (the --json output of an earlier run) lists accepted findings, so
+only new drift fails the check.
+
+Usage: python -m navmap.drift [--src DIR] [--baseline FILE] [--kinds KIND ...] [--json] [--limit N]
+"""
+
+import argparse
+import sys
+from collections import namedtuple
+
+from navmap.extract import DEFAULT_SRC
+from navmap.graph import normalize_route, split_cell
+
+KINDS = ('stale_route', 'unknown_table', 'unknown_column', 'undocumented_route', 'undocumented_column')
+
+# Map columns the join reads
+SCREEN, NAVIGATE_FROM, NAVIGATE_TO, TABLE, COLUMN = 0, 1, 2, 6, 7
+
+# Columns every table has and no screen is expected to show
+IGNORED_COLUMNS = frozenset(('id', 'created_at', 'updated_at'))
+
+# `rows` is how many map rows point at the subject (0 for undocumented ones);
+# `where` is the first such row, or what App.jsx / the migrations say about it
+Finding = namedtuple('Finding', ['kind', 'subject', 'rows', 'where'])
+
+
+class DriftError(ValueError):
+    """Raised when a baseline file cannot be read"""
+
+
+def route_key(path):
+    """Route with its parameter segments folded ('/workflows/:id' and '/workflows/{id}' -> '/workflows/:')"""
+    if ':' not in path and '{' not in path:
+        return path
+    return '/'.join(':' if part[:1] in ':{' else part for part in path.split('/'))
+
+
+class RouteIndex:
+    """Hash index of the App.jsx routes, keyed by folded path"""
+
+    def __init__(self, resolver):
+        self.pages = {route_key(path): (path, component) for path, component in resolver.routes.items()}
+        self.redirects = {route_key(path): route_key(target) for path, target in resolver.redirects.items()}
+        # A route that renders an element and also redirects wraps its children, with an index redirect
+        self.layouts = frozenset(key for key in self.pages if key in self.redirects)
+
+    def resolve(self, route):
+        """
+        Folded App.jsx path rendering a map route, or None. Like
+        RouteResolver.app_path(): the route as is, then under the advisor
+        portal, following redirects.
+        """
+        from navmap.prefetch import APP_PREFIX, HOME_ROUTE
+
+        if route == HOME_ROUTE:
+            candidates = (route_key(f"{APP_PREFIX}/home"), route)
+        else:
+            candidates = (route_key(route), route_key(APP_PREFIX + route))
+        for path in candidates:
+            seen = set()
+            while path in self.redirects and path not in seen:
+                seen.add(path)
+                path = self.redirects[path]
+            if path in self.pages:
+                return path
+        return None
+
+
+def _where(section, row):
+    return f"{section.title} › {row[SCREEN]} › {row[3]} › {row[4]}"
+
+
+def _note(found, subject, section, row):
+    entry = found.get(subject)
+    if entry is None:
+        found[subject] = [1, _where(section, row)]
+    else:
+        entry[0] += 1
+
+
+def detect(dataset, routes, catalog, ignored_columns=IGNORED_COLUMNS):
+    """
+    Findings for `dataset` against a RouteIndex and a schema Catalog, in
+    KINDS order and, within a kind, in order of first appearance in the map
+    (undocumented ones in App.jsx / migration order).
+    """
+    from navmap.schema import checkable_table, plain_columns
+
+    stale = {}
+    unknown_tables = {}
+    unknown_columns = {}
+    reached = set()
+    documented = {}
+    # The same cells repeat across rows; each distinct one is parsed and joined once
+    route_cells = {}
+    column_cells = {}
+    for section in dataset.sections:
+        for row in section.rows:
+            for col in (SCREEN, NAVIGATE_FROM, NAVIGATE_TO):
+                cell = row[col]
+                hits = route_cells.get(cell)
+                if hits is None:
+                    found = dict.fromkeys(route for route in map(normalize_route, split_cell(cell)) if route)
+                    hits = route_cells[cell] = tuple((route, routes.resolve(route)) for route in found)
+                for route, path in hits:
+                    if path is None:
+                        _note(stale, route, section, row)
+                    else:
+                        reached.add(path)
+
+            table = row[TABLE]
+            if not checkable_table(table):
+                continue
+            columns = catalog.tables.get(table)
+            if columns is None:
+                _note(unknown_tables, table, section, row)
+                continue
+            names = documented.get(table)
+            if names is None:
+                names = documented[table] = set()
+            cell = row[COLUMN]
+            cell_columns = column_cells.get(cell)
+            if cell_columns is None:
+                cell_columns = column_cells[cell] = tuple(plain_columns(cell))
+            for column in cell_columns:
+                if column in columns:
+                    names.add(column)
+                else:
+                    _note(unknown_columns, f"{table}.{column}", section, row)
+
+    findings = []
+    for kind, found in (('stale_route', stale), ('unknown_table', unknown_tables),
+                        ('unknown_column', unknown_columns)):
+        findings.extend(Finding(kind, subject, count, where) for subject, (count, where) in found.items())
+    findings.extend(
+        Finding('undocumented_route', path, 0, f"<{component}> in App.jsx")
+        for key, (path, component) in routes.pages.items()
+        if key not in reached and key not in routes.layouts
+    )
+    for table, names in documented.items():
+        findings.extend(
+            Finding('undocumented_column', f"{table}.{column}", 0, sql_type)
+            for column, sql_type in catalog.tables[table].items()
+            if column not in names and column not in ignored_columns
+        )
+    return findings
+
+
+def load_baseline(path):
+    """{(kind, subject)} accepted in a baseline file (the --json output of an earlier run)"""
+    import json
+
+    try:
+        with open(path, encoding='utf-8') as f:
+            doc = json.load(f)
+        return {(item['kind'], item['subject']) for item in doc['findings']}
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        raise DriftError(f"cannot read baseline {path}: {exc}") from exc
+
+
+def counts(findings):
+    result = dict.fromkeys(KINDS, 0)
+    for finding in findings:
+        result[finding.kind] += 1
+    return result
+
+
+def format_findings(findings, limit=None):
+    lines = []
+    for kind in KINDS:
+        of_kind = [finding for finding in findings if finding.kind == kind]
+        if not of_kind:
+            continue
+        lines.append(f"{kind} ({len(of_kind)}):")
+        for finding in of_kind[:limit]:
+            used = f"{finding.rows} row{'s' if finding.rows != 1 else ''}, first " if finding.rows else ''
+            lines.append(f"  {finding.subject}  ({used}{finding.where})")
+        if limit is not None and len(of_kind) > limit:
+            lines.append(f"  ... and {len(of_kind) - limit} more")
+    return '\n'.join(lines)
+
+
+def add_arguments(parser):
+    parser.add_argument("--src", default=DEFAULT_SRC, help="source root holding App.jsx (default: the repo's src/)")
+    parser.add_argument("--baseline", default=None, metavar="FILE",
+                        help="accept the findings listed in FILE (the --json output of an earlier run)")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS), metavar="KIND",
+                        help=f"kinds of drift to check, out of {', '.join(KINDS)} (default: all)")
+    parser.add_argument("--json", action="store_true", help="print the findings as JSON")
+    parser.add_argument("--limit", type=int, default=20, metavar="N", help="findings to list per kind (default: 20)")
+    parser.add_argument("--no-cache", action="store_true", help="re-parse every migration")
+
+
+def run(args, dataset):
+    import time
+
+    from navmap.prefetch import RouteResolver
+    from navmap.schema import build_catalog
+
+    try:
+        routes = RouteIndex(RouteResolver(args.src))
+        catalog = build_catalog(use_cache=not args.no_cache)
+        accepted = load_baseline(args.baseline) if args.baseline else set()
+    except (OSError, DriftError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    findings = [finding for finding in detect(dataset, routes, catalog)
+                if finding.kind in args.kinds and (finding.kind, finding.subject) not in accepted]
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        import json
+
+        doc = {'counts': counts(findings), 'findings': [finding._asdict() for finding in findings]}
+        print(json.dumps(doc, ensure_ascii=False, indent=2))
+    else:
+        print(f"🔎 {dataset.row_count} rows against {len(routes.pages)} App.jsx routes and "
+              f"{len(catalog.tables)} tables ({sum(map(len, catalog.tables.values()))} columns), "
+              f"joined in {elapsed * 1000:.1f} ms")
+        if findings:
+            print(format_findings(findings, args.limit))
+            summary = ', '.join(f"{count} {kind}" for kind, count in counts(findings).items() if count)
+            print(f"❌ Drift: {summary}")
+        else:
+            print("✅ No drift" + (" beyond the baseline" if accepted else ""))
+    return 1 if findings else 0
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Check the map against the App.jsx routes and the migrations")
+    add_arguments(parser)
+    return run(parser.parse_args(argv), load_dataset())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
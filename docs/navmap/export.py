@@ -0,0 +1,315 @@
+"""
+Single-pass multi-format export of the navigation map
+
+The dataset is loaded once and fanned out to every requested format:
+
+    csv      flat CSV with a leading Module column (same as `navmap csv`)
+    jsonl    JSON Lines, one object per field row (same keys as `navmap json --records`)
+    md       the Markdown map (same bytes as `navmap md`)
+    xlsx     the Excel map, one sheet per module (same workbook as `navmap xlsx`)
+    parquet  typed Parquet: snake_case columns, dictionary-encoded strings,
+             Editable as a nullable boolean (needs pyarrow)
+
+The cheap text formats are sinks fed section by section from a single
+walk over the rows. The slow formats (xlsx, parquet) are jobs that run in
+a process pool at the same time, so the total wall time is close to that
+of the slowest format instead of the sum. With the fork start method the
+workers inherit the loaded rows; otherwise they are pickled to them once
+per job. On a single CPU, or with --workers 0, everything runs
+in-process, one format after another.
+
+Usage: python -m navmap.export [FORMAT ...] [--base NAME] [--dir DIR] [--workers N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+from navmap.instrument import stage
+from navmap.pool import process_pool, spare_cpus
+
+DEFAULT_BASE = 'advisorhub-navigation-map'
+
+Result = namedtuple('Result', ['format', 'path', 'rows', 'seconds', 'worker'])
+
+
+class ExportError(RuntimeError):
+    """Raised when a requested format cannot be written"""
+
+
+# -- inline sinks ------------------------------------------------------------
+
+
+class CsvSink:
+    def __init__(self, path):
+        import csv
+
+        self._f = open(path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.writer(self._f)
+        self.rows = 0
+
+    def begin(self, columns, summary):
+        self._writer.writerow(('Module',) + tuple(columns))
+
+    def write_section(self, section):
+        module = (section.title,)
+        self._writer.writerows(module + row for row in section.rows)
+        self.rows += len(section.rows)
+
+    def finish(self):
+        self._f.close()
+
+
+class JsonLinesSink:
+    def __init__(self, path):
+        import json
+
+        self._dumps = json.JSONEncoder(ensure_ascii=False).encode
+        self._f = open(path, 'w', encoding='utf-8')
+        self._keys = None
+        self.rows = 0
+
+    def begin(self, columns, summary):
+        self._keys = ('Module',) + tuple(columns)
+
+    def write_section(self, section):
+        dumps = self._dumps
+        keys = self._keys
+        module = (section.title,)
+        self._f.write(''.join(dumps(dict(zip(keys, module + row))) + '\n' for row in section.rows))
+        self.rows += len(section.rows)
+
+    def finish(self):
+        self._f.close()
+
+
+class MarkdownSink:
+    def __init__(self, path):
+        from navmap.markdown import MarkdownTableWriter
+
+        self._f = open(path, 'w', encoding='utf-8')
+        self._writer = MarkdownTableWriter(self._f)
+        self._blanks = ()
+        self._footer = ''
+        self.rows = 0
+
+    def begin(self, columns, summary):
+        from navmap.document import render_footer, render_header
+
+        self._blanks = ('',) * (len(columns) - 1)
+        self._footer = render_footer(summary)
+        self._writer.write(render_header(summary))
+
+    def write_section(self, section):
+        from navmap.document import markdown_marker
+
+        self._writer.write_row((markdown_marker(section),) + self._blanks)
+        self._writer.write_rows(section.rows)
+        self.rows += len(section.rows)
+
+    def finish(self):
+        self._writer.write(self._footer)
+        self._writer.flush()
+        self._f.close()
+
+
+# -- worker jobs -------------------------------------------------------------
+
+
+def _xlsx_job(path, columns, sections):
+    from navmap.dataset import Dataset, Section
+    from navmap.sheets import write_xlsx_sheets
+
+    dataset = Dataset(columns, [Section(*section) for section in sections])
+    # Already one job of a pool (or sharing the CPU with the inline formats), so the sheets render here
+    write_xlsx_sheets(path, dataset, workers=0)
+    return dataset.row_count
+
+
+def _parquet_job(path, columns, sections):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from navmap.rowstore import FIELDS
+
+    modules = []
+    cells = [[] for _ in columns]
+    for title, _, rows in sections:
+        modules.extend([title] * len(rows))
+        for col, values in enumerate(zip(*rows)):
+            cells[col].extend(values)
+
+    names = ['module'] + list(FIELDS)
+    arrays = [pa.array(modules, pa.string()).dictionary_encode()]
+    for name, values in zip(FIELDS, cells):
+        if name == 'editable':
+            arrays.append(pa.array([{'Y': True, 'N': False}.get(v) for v in values], pa.bool_()))
+        else:
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+    pq.write_table(pa.Table.from_arrays(arrays, names=names), path, compression='zstd')
+    return len(modules)
+
+
+# name -> (extension, inline sink class or None, worker job or None, module it needs)
+FORMATS = {
+    'csv': ('.csv', CsvSink, None, None),
+    'jsonl': ('.jsonl', JsonLinesSink, None, None),
+    'md': ('.md', MarkdownSink, None, None),
+    'xlsx': ('.xlsx', None, _xlsx_job, 'openpyxl'),
+    'parquet': ('.parquet', None, _parquet_job, 'pyarrow'),
+}
+
+# Rows handed to forked workers without pickling; set just before the pool starts
+_SHARED = None
+
+
+def _run_job(fmt, path, payload=None):
+    columns, sections = payload if payload is not None else _SHARED
+    started = time.perf_counter()
+    rows = FORMATS[fmt][2](path, columns, sections)
+    return Result(fmt, path, rows, time.perf_counter() - started, os.getpid())
+
+
+def _worker_job(fmt, path, payload=None):
+    # A forked worker inherits an active profiler; tracing there would only slow the job down
+    from navmap import instrument
+
+    instrument.disable()
+    return _run_job(fmt, path, payload)
+
+
+def available(fmt):
+    """True if the module a format needs is importable"""
+    from importlib.util import find_spec
+
+    needed = FORMATS[fmt][3]
+    return needed is None or find_spec(needed) is not None
+
+
+def output_paths(formats, base=DEFAULT_BASE, directory='.'):
+    return {fmt: os.path.join(directory, base + FORMATS[fmt][0]) for fmt in formats}
+
+
+def export(dataset, outputs, workers=None):
+    """
+    Write `dataset` to every {format: path} in `outputs`; returns Results in
+    completion order.
+
+    Inline formats share one walk over the sections in this process while
+    the job formats run in up to `workers` processes (default: one per job
+    format, up to one less than the CPUs available; 0 runs them here,
+    after the walk).
+    """
+    global _SHARED
+
+    unknown = sorted(set(outputs) - set(FORMATS))
+    if unknown:
+        raise ExportError(f"unknown format(s): {', '.join(unknown)}")
+    missing = [f"{fmt} (needs {FORMATS[fmt][3]})" for fmt in outputs if not available(fmt)]
+    if missing:
+        raise ExportError(f"cannot write {', '.join(missing)}")
+
+    inline = {fmt: path for fmt, path in outputs.items() if FORMATS[fmt][1] is not None}
+    jobs = {fmt: path for fmt, path in outputs.items() if FORMATS[fmt][2] is not None}
+    if workers is None:
+        # This process writes the inline formats, so it keeps one CPU for itself
+        workers = min(len(jobs), spare_cpus())
+    payload = (tuple(dataset.columns), [tuple(section) for section in dataset.sections])
+
+    results = []
+    pool = futures = None
+    if jobs and workers > 0:
+        _SHARED = payload
+        pool, forked = process_pool(min(workers, len(jobs)))
+        futures = [pool.submit(_worker_job, fmt, path, None if forked else payload) for fmt, path in jobs.items()]
+
+    try:
+        if inline:
+            with stage('inline', rows=dataset.row_count):
+                started = time.perf_counter()
+                summary = None
+                if 'md' in inline:
+                    from navmap.summary import summarize
+
+                    summary = summarize(dataset)
+                # Opened one at a time, so a sink that fails to open leaves only the earlier ones to finish
+                sinks = {}
+                try:
+                    for fmt, path in inline.items():
+                        sinks[fmt] = FORMATS[fmt][1](path)
+                    for sink in sinks.values():
+                        sink.begin(dataset.columns, summary)
+                    for section in dataset.sections:
+                        for sink in sinks.values():
+                            sink.write_section(section)
+                finally:
+                    for sink in sinks.values():
+                        sink.finish()
+                seconds = time.perf_counter() - started
+            results.extend(Result(fmt, inline[fmt], sink.rows, seconds, os.getpid()) for fmt, sink in sinks.items())
+
+        if futures is not None:
+            from concurrent.futures import as_completed
+
+            with stage('workers'):
+                results.extend(future.result() for future in as_completed(futures))
+        else:
+            for fmt, path in jobs.items():
+                with stage(fmt, rows=dataset.row_count):
+                    results.append(_run_job(fmt, path, payload))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        _SHARED = None
+    return results
+
+
+def add_arguments(parser):
+    parser.add_argument("formats", nargs="*", metavar="FORMAT",
+                        help=f"formats to write, out of {', '.join(FORMATS)} "
+                             "(default: every format whose dependencies are installed)")
+    parser.add_argument("--base", default=DEFAULT_BASE, help=f"output file name without extension (default: {DEFAULT_BASE})")
+    parser.add_argument("--dir", default=".", help="output directory (default: current directory)")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="processes for the slow formats (default: one per format, up to CPUs - 1; 0 = run in-process)")
+
+
+def run(args, dataset):
+    unknown = [fmt for fmt in args.formats if fmt not in FORMATS]
+    if unknown:
+        print(f"error: unknown format(s) {', '.join(unknown)}; choose from {', '.join(FORMATS)}", file=sys.stderr)
+        return 2
+    formats = args.formats or [fmt for fmt in FORMATS if available(fmt)]
+    skipped = [fmt for fmt in FORMATS if fmt not in formats and not available(fmt)]
+    outputs = output_paths(dict.fromkeys(formats), args.base, args.dir)
+    started = time.perf_counter()
+    try:
+        os.makedirs(args.dir, exist_ok=True)
+        results = export(dataset, outputs, workers=args.workers)
+    except (ExportError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+
+    for result in sorted(results, key=lambda result: list(outputs).index(result.format)):
+        where = 'inline' if result.worker == os.getpid() else f"worker {result.worker}"
+        print(f"✅ {result.path}: {result.rows} rows in {result.seconds:.2f} s ({where})")
+    print(f"⏱️  Total: {elapsed:.2f} s for {len(results)} format(s)")
+    if skipped and not args.formats:
+        print(f"💡 Skipped {', '.join(skipped)}: missing dependencies")
+    return 0
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Write the navigation map to several formats in one pass")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    return run(args, load_dataset())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
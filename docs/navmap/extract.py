@@ -0,0 +1,483 @@
+"""
+Route and field extraction from the React sources
+
+Builds navigation map rows from what the app actually declares instead of
+hand-written literals:
+
+* routes come from the <Route path=...> tree in src/App.jsx, including the
+  nested /admin and /advisor subtrees and <Navigate> redirects;
+* navigation targets come from navigate(...), createPageUrl(...),
+  <Link to=...> and <Navigate to=...> in every source file;
+* form field labels come from <Label>...</Label> children (resolving
+  t("...") keys through the English locale) and label="..." props.
+
+Files are scanned across a process pool. Per-file results are cached in
+navmap/.cache keyed by mtime and size, with a content hash as the tie
+breaker, so a warm re-scan only re-reads files that were edited and
+re-parses the ones whose bytes actually changed.
+
+Usage: python -m navmap.extract [--src PATH] [--jobs N] [--format md|json]
+"""
+
+import argparse
+import hashlib
+import marshal
+import os
+import re
+import sys
+from collections import defaultdict, namedtuple
+
+from navmap.dataset import CACHE_DIR
+from navmap.markdown import format_row
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_SRC = os.path.join(REPO_ROOT, 'src')
+
+SOURCE_EXTENSIONS = ('.jsx', '.tsx', '.js', '.ts')
+EXCLUDED_DIRS = {'tests', '__tests__', 'node_modules'}
+
+# Design-system primitives (toast close buttons, search clear icons, ...)
+# carry accessibility labels, not form fields of any one screen
+PRIMITIVE_DIRS = (os.path.join('admin', 'components', 'ui') + os.sep,)
+
+# Bump when scan_file() output changes so cached results are discarded
+EXTRACTOR_VERSION = 1
+
+# Below this many files to parse, a process pool costs more than it saves
+POOL_THRESHOLD = 24
+
+RouteDef = namedtuple('RouteDef', ['path', 'component', 'redirect'])
+
+_IMPORT_RE = re.compile(r'''^\s*import\s+(?:([\w$]+)\s*,?\s*)?(?:\{[^}]*\}\s*)?(?:\*\s+as\s+[\w$]+\s*)?(?:from\s+)?["']([^"']+)["']''', re.M)
+_NAVIGATE_RE = re.compile(r'''\bnavigate\(\s*(-1|["'][^"']*["']|`[^`]*`|createPageUrl\(\s*(?:["'][^"']*["']|`[^`]*`)\s*\))''')
+_LINK_RE = re.compile(r'''<(Link|NavLink|Navigate)\b[^>]*?\bto=\{?\s*(["'][^"']*["']|`[^`]*`|createPageUrl\(\s*(?:["'][^"']*["']|`[^`]*`)\s*\))''', re.S)
+_PAGE_URL_RE = re.compile(r'''createPageUrl\(\s*(["'][^"']*["']|`[^`]*`)\s*\)''')
+_LABEL_RE = re.compile(r'''<(?:Label|FormLabel)\b[^>]*>\s*(?:\{\s*t\(\s*["']([^"']+)["'][^)]*\)\s*\}|([^<{]*[^<{\s]))''', re.S)
+_LABEL_PROP_RE = re.compile(r'''\blabel=(?:"([^"]+)"|\{\s*t\(\s*["']([^"']+)["'][^)]*\)\s*\})''')
+_TEMPLATE_EXPR_RE = re.compile(r'\$\{([^}]*)\}')
+_PAGE_ROUTES_RE = re.compile(r'''^\s*([A-Za-z]\w*):\s*["']([^"']+)["']''', re.M)
+
+
+def _line_of(source, pos):
+    return source.count('\n', 0, pos) + 1
+
+
+def scan_file(path):
+    """
+    Extract raw facts from one source file.
+
+    Returns a marshal-friendly tuple (imports, targets, labels); this runs
+    in worker processes, so it must not depend on any parent state.
+    """
+    with open(path, encoding='utf-8', errors='replace') as f:
+        source = f.read()
+
+    imports = parse_imports(source)
+
+    targets = []
+    for match in _NAVIGATE_RE.finditer(source):
+        targets.append(('navigate', match.group(1), _line_of(source, match.start())))
+    for match in _LINK_RE.finditer(source):
+        kind = 'redirect' if match.group(1) == 'Navigate' else 'link'
+        targets.append((kind, match.group(2), _line_of(source, match.start())))
+
+    labels = []
+    for match in _LABEL_RE.finditer(source):
+        key, text = match.groups()
+        if key:
+            labels.append(('i18n', key, _line_of(source, match.start())))
+        elif text.strip():
+            labels.append(('text', ' '.join(text.split()), _line_of(source, match.start())))
+    for match in _LABEL_PROP_RE.finditer(source):
+        text, key = match.groups()
+        if key:
+            labels.append(('i18n', key, _line_of(source, match.start())))
+        else:
+            labels.append(('text', text, _line_of(source, match.start())))
+
+    return imports, tuple(targets), tuple(labels)
+
+
+def _tag_end(source, start):
+    """Index just past the '>' closing the JSX tag opened at `start`"""
+    depth = 0
+    quote = None
+    i = start
+    while i < len(source):
+        ch = source[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '"\'`':
+            quote = ch
+        elif ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+        elif ch == '>' and depth == 0:
+            return i + 1
+        i += 1
+    return len(source)
+
+
+def _join_route(parent, path):
+    if path.startswith('/'):
+        return path
+    if not parent or parent == '/':
+        return '/' + path
+    return parent.rstrip('/') + '/' + path
+
+
+def parse_routes(source):
+    """Flatten the <Route> tree of App.jsx into full paths"""
+    routes = []
+    stack = []
+    for match in re.finditer(r'<Route\b|</Route>', source):
+        if match.group(0) == '</Route>':
+            if stack:
+                stack.pop()
+            continue
+        end = _tag_end(source, match.start())
+        tag = source[match.start():end]
+        parent = stack[-1] if stack else ''
+        path_match = re.search(r'''\bpath=["']([^"']+)["']''', tag)
+        if path_match:
+            full = _join_route(parent, path_match.group(1))
+        elif re.search(r'\bindex\b', tag):
+            full = parent or '/'
+        else:
+            full = parent
+        redirect = re.search(r'''<Navigate\b[^>]*\bto=["']([^"']+)["']''', tag)
+        components = [name for name in re.findall(r'<([A-Z][\w.]*)', tag[1:]) if name != 'Navigate']
+        routes.append(RouteDef(full, components[-1] if components else '',
+                               redirect.group(1) if redirect else ''))
+        if not tag.rstrip('>').rstrip().endswith('/'):
+            stack.append(full)
+    return routes
+
+
+def parse_page_routes(source):
+    """The pageRoutes table behind createPageUrl() in src/admin/utils/index.js"""
+    start = source.find('pageRoutes')
+    end = source.find('};', start)
+    if start < 0 or end < 0:
+        return {}
+    return dict(_PAGE_ROUTES_RE.findall(source[start:end]))
+
+
+def _unquote(literal):
+    return literal[1:-1] if literal[:1] in '"\'`' else literal
+
+
+def _template_placeholder(expr):
+    # `${proposal.id}` -> {id}, `${encodeURIComponent(x)}` -> {x}
+    names = re.findall(r'[A-Za-z_$][\w$]*', expr)
+    return '{' + (names[-1] if names else 'value') + '}'
+
+
+def resolve_target(raw, page_routes):
+    """Normalize a raw navigation target into a route string, or None if dynamic"""
+    if raw == '-1':
+        return '(back)'
+
+    def page_url(match):
+        descriptor = _unquote(match.group(1))
+        name, _, query = descriptor.partition('?')
+        base = descriptor if descriptor.startswith('/') else page_routes.get(name, '/' + name.lower())
+        if descriptor.startswith('/'):
+            return base
+        return f"{base}?{query}" if query else base
+
+    value = raw
+    if value.startswith('createPageUrl'):
+        value = _PAGE_URL_RE.sub(page_url, value)
+    else:
+        value = _unquote(value)
+        value = re.sub(r'\$\{\s*' + _PAGE_URL_RE.pattern + r'\s*\}', page_url, value)
+    value = _TEMPLATE_EXPR_RE.sub(lambda m: _template_placeholder(m.group(1)), value)
+    if not value.startswith('/'):
+        return None
+    return value
+
+
+class _FileCache:
+    """Per-file scan results keyed by path, validated by mtime/size then content hash"""
+
+    def __init__(self, src_root):
+        key = hashlib.blake2b(os.path.abspath(src_root).encode(), digest_size=8).hexdigest()
+        self.path = os.path.join(CACHE_DIR, f"extract-{key}-v{EXTRACTOR_VERSION}.marshal")
+        try:
+            with open(self.path, 'rb') as f:
+                self.entries = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            self.entries = {}
+        self.dirty = False
+
+    def save(self):
+        if not self.dirty:
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp, 'wb') as f:
+                marshal.dump(self.entries, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+
+def iter_source_files(src_root):
+    for dirpath, dirnames, filenames in os.walk(src_root):
+        dirnames[:] = sorted(d for d in dirnames if d not in EXCLUDED_DIRS)
+        for name in sorted(filenames):
+            if name.endswith(SOURCE_EXTENSIONS) and not name.endswith('.d.ts'):
+                yield os.path.join(dirpath, name)
+
+
+def scan_tree(src_root, jobs=None, use_cache=True):
+    """
+    Scan every source file under `src_root`, reusing cached results.
+
+    Returns ({path: (imports, targets, labels)}, stats) where stats counts
+    files that were 'cached', 'rehashed' (touched but identical) and 'parsed'.
+    """
+    cache = _FileCache(src_root) if use_cache else None
+    entries = cache.entries if cache else {}
+    facts = {}
+    stats = {'cached': 0, 'rehashed': 0, 'parsed': 0}
+    stale = []
+    digests = {}
+
+    for path in iter_source_files(src_root):
+        st = os.stat(path)
+        entry = entries.get(path)
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+            facts[path] = entry[3]
+            stats['cached'] += 1
+            continue
+        with open(path, 'rb') as f:
+            digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        if entry and entry[2] == digest:
+            entries[path] = (st.st_mtime_ns, st.st_size, digest, entry[3])
+            facts[path] = entry[3]
+            stats['rehashed'] += 1
+            if cache:
+                cache.dirty = True
+            continue
+        stale.append(path)
+        digests[path] = (st.st_mtime_ns, st.st_size, digest)
+
+    if len(stale) >= POOL_THRESHOLD and jobs != 1:
+        from navmap.pool import available_cpus, process_pool
+
+        workers = jobs or available_cpus()
+        pool, _ = process_pool(workers)
+        with pool:
+            results = pool.map(scan_file, stale, chunksize=max(1, len(stale) // (workers * 4)))
+            scanned = list(zip(stale, results))
+    else:
+        scanned = [(path, scan_file(path)) for path in stale]
+
+    for path, result in scanned:
+        facts[path] = result
+        entries[path] = digests[path] + (result,)
+        stats['parsed'] += 1
+
+    if cache:
+        for path in list(entries):
+            if path not in facts:
+                del entries[path]
+        cache.dirty = cache.dirty or bool(stale) or len(entries) != len(facts)
+        cache.save()
+    return facts, stats
+
+
+def _load_translations(src_root):
+    import json
+
+    path = os.path.join(src_root, 'lib', 'i18n', 'locales', 'en', 'translation.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _translate(translations, key):
+    node = translations
+    for part in key.split('.'):
+        if not isinstance(node, dict) or part not in node:
+            return key
+        node = node[part]
+    return node if isinstance(node, str) else key
+
+
+def parse_imports(source):
+    """(default import name or '', module spec) of every import statement in a JS / JSX source"""
+    return tuple((name or '', spec) for name, spec in _IMPORT_RE.findall(source))
+
+
+def resolve_import(src_root, importer, spec):
+    """Source file an import spec ('@/pages/Home', './Card') of `importer` refers to, or None"""
+    if spec.startswith('@/'):
+        base = os.path.join(src_root, spec[2:])
+    elif spec.startswith('.'):
+        base = os.path.normpath(os.path.join(os.path.dirname(importer), spec))
+    else:
+        return None
+    candidates = [base] + [base + ext for ext in SOURCE_EXTENSIONS]
+    candidates += [os.path.join(base, 'index' + ext) for ext in SOURCE_EXTENSIONS]
+    for candidate in candidates:
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+class Extraction:
+    """Result of an extraction run; rows() renders it in the 11-column map schema"""
+
+    def __init__(self, src_root, routes, page_routes, facts, translations, stats):
+        self.src_root = src_root
+        self.routes = routes
+        self.page_routes = page_routes
+        self.facts = facts
+        self.translations = translations
+        self.stats = stats
+        self._files_by_route = self._attribute_files()
+
+    def _rel(self, path):
+        return os.path.relpath(path, os.path.dirname(self.src_root)).replace(os.sep, '/')
+
+    def _attribute_files(self):
+        """Map each routed page to every file it reaches through imports"""
+        app = os.path.join(self.src_root, 'App.jsx')
+        app_imports = {name: spec for name, spec in self.facts.get(app, ((), (), ()))[0] if name}
+        graph = {}
+        for path, (imports, _, _) in self.facts.items():
+            graph[path] = [
+                resolved for resolved in (resolve_import(self.src_root, path, spec) for _, spec in imports)
+                if resolved in self.facts
+            ]
+
+        files_by_route = {}
+        for route in self.routes:
+            spec = app_imports.get(route.component)
+            page = resolve_import(self.src_root, app, spec) if spec and not route.redirect else None
+            if page is None or route.path in files_by_route:
+                continue
+            seen = [page]
+            seen_set = {page}
+            for path in seen:
+                for dep in graph.get(path, ()):
+                    if dep not in seen_set:
+                        seen_set.add(dep)
+                        seen.append(dep)
+            files_by_route[route.path] = seen
+        return files_by_route
+
+    def routes_reaching(self, paths):
+        """App.jsx routes whose page is, or imports (transitively), one of `paths`"""
+        paths = set(paths)
+        return [route for route, files in self._files_by_route.items() if not paths.isdisjoint(files)]
+
+    def targets_by_route(self):
+        """{route: [resolved navigation targets, in source order]}"""
+        result = {}
+        for route, files in self._files_by_route.items():
+            targets = []
+            for path in files:
+                for _, raw, _ in self.facts[path][1]:
+                    target = resolve_target(raw, self.page_routes)
+                    if target and target not in targets:
+                        targets.append(target)
+            result[route] = targets
+        return result
+
+    def rows(self):
+        """Yield map rows: one screen row per routed page, then one row per field label"""
+        targets = self.targets_by_route()
+        sources = defaultdict(list)
+        for route, route_targets in targets.items():
+            for target in route_targets:
+                base = target.split('?', 1)[0]
+                if base != route and route not in sources[base]:
+                    sources[base].append(route)
+
+        redirects = {route.path: route.redirect for route in self.routes if route.redirect}
+        for route in self.routes:
+            files = self._files_by_route.get(route.path)
+            if route.redirect or not files or route.path in redirects:
+                continue
+            page = files[0]
+            yield (
+                route.path,
+                ', '.join(sources.get(route.path, ())) or '—',
+                ', '.join(targets[route.path]) or '—',
+                route.component,
+                '—',
+                f"Route element <{route.component}> ({self._rel(page)})",
+                '—', '—', '—', '—',
+                'Extracted from src/App.jsx',
+            )
+            seen = set()
+            for path in files:
+                if os.path.relpath(path, self.src_root).startswith(PRIMITIVE_DIRS):
+                    continue
+                section = os.path.splitext(os.path.basename(path))[0]
+                for kind, value, line in self.facts[path][2]:
+                    label = _translate(self.translations, value) if kind == 'i18n' else value
+                    if (section, label) in seen:
+                        continue
+                    seen.add((section, label))
+                    yield (
+                        route.path, '(self)', '(self)', section, label,
+                        f"Field label at {self._rel(path)}:{line}",
+                        '—', '—', '—', '—', '—',
+                    )
+
+
+def extract(src_root=DEFAULT_SRC, jobs=None, use_cache=True):
+    """Scan `src_root` and return an Extraction"""
+    facts, stats = scan_tree(src_root, jobs=jobs, use_cache=use_cache)
+    with open(os.path.join(src_root, 'App.jsx'), encoding='utf-8') as f:
+        routes = parse_routes(f.read())
+    utils = os.path.join(src_root, 'admin', 'utils', 'index.js')
+    try:
+        with open(utils, encoding='utf-8') as f:
+            page_routes = parse_page_routes(f.read())
+    except OSError:
+        page_routes = {}
+    return Extraction(src_root, routes, page_routes, facts, _load_translations(src_root), stats)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract navigation map rows from the React sources")
+    parser.add_argument("--src", default=DEFAULT_SRC, help="source root (default: the repo's src/)")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: the CPUs available)")
+    parser.add_argument("--format", choices=("md", "json"), default="md", help="output format")
+    parser.add_argument("--no-cache", action="store_true", help="ignore and do not update the scan cache")
+    args = parser.parse_args(argv)
+
+    try:
+        result = extract(args.src, jobs=args.jobs, use_cache=not args.no_cache)
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    rows = list(result.rows())
+    if args.format == 'json':
+        import json
+
+        json.dump([list(row) for row in rows], sys.stdout, ensure_ascii=False, indent=1)
+        sys.stdout.write('\n')
+    else:
+        for row in rows:
+            sys.stdout.write(format_row(row))
+    stats = result.stats
+    print(f"{len(rows)} rows from {len(result.facts)} files "
+          f"({stats['parsed']} parsed, {stats['rehashed']} rehashed, {stats['cached']} cached)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
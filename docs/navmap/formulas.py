@@ -0,0 +1,708 @@
+"""
+Vectorized evaluation of the map's calculated-field formulas
+
+The Supabase Column Name cell of a calculated field holds the formula the
+frontend applies to each record: "premium_amount * frequency_multiplier"
+(Annual Premium), "DATEDIFF(policy_end_date, NOW()) / 365" (Years
+Remaining), "COUNT(*) WHERE is_client=true" (Total Clients),
+"SUM(premium_amount) WHERE status='Active'". parse() compiles one into an
+AST of namedtuples. The grammar covers + - * / and parentheses, numbers,
+'quoted' strings and true / false / null, columns (optionally qualified:
+policies.sum_assured), NOW(), DATEDIFF(a, b) (days from b to a, MySQL
+style), the SUM / COUNT / AVG / MIN / MAX aggregates, a WHERE condition
+(= <> != < <= > >=, AND, OR, NOT) and GROUP BY one column.
+
+evaluate() runs a compiled formula over a whole batch of records at once,
+a pandas DataFrame or a {column: values} mapping, with NumPy. Each column
+is converted once to the kind it is used as (number, date, boolean or
+text), arithmetic and comparisons are single array operations, the WHERE
+condition becomes a mask, and aggregates reduce through that mask,
+grouped by factorized GROUP BY codes and np.bincount. Per-record formulas
+give one value per record (NaN where the WHERE condition is false),
+aggregates a number, and grouped aggregates a Series indexed by group.
+
+frequency_multiplier is not stored; as in the app it is derived from
+premium_frequency (Monthly 12, Quarterly 4, Semi-Annual 2, Annual 1).
+NumPy and pandas are needed for evaluation only; parsing and listing the
+map's formulas work without them.
+
+Usage: python -m navmap.formulas FILE.csv [--table TABLE] [--field NAME ...] [--formula TEXT ...] [--output FILE]
+       python -m navmap.formulas --list
+"""
+
+import argparse
+import re
+import sys
+from collections import namedtuple
+
+Literal = namedtuple('Literal', ['value'])
+Column = namedtuple('Column', ['name'])
+Call = namedtuple('Call', ['name', 'args'])
+Unary = namedtuple('Unary', ['op', 'operand'])
+Binary = namedtuple('Binary', ['op', 'left', 'right'])
+
+# A compiled formula; `aggregate` is True when `expr` reduces the records to one value (per group)
+Formula = namedtuple('Formula', ['text', 'expr', 'where', 'group_by', 'aggregate'])
+
+# A formula documented in the map, with the row it came from
+CalculatedField = namedtuple('CalculatedField', ['module', 'screen', 'section', 'field', 'table', 'formula'])
+
+AGGREGATES = frozenset(('SUM', 'COUNT', 'AVG', 'MIN', 'MAX'))
+# name -> allowed argument counts
+FUNCTIONS = {'NOW': (0,), 'DATEDIFF': (2,), 'SUM': (1,), 'COUNT': (0, 1), 'AVG': (1,), 'MIN': (1,), 'MAX': (1,)}
+
+KEYWORDS = frozenset(('WHERE', 'GROUP', 'BY', 'AND', 'OR', 'NOT', 'TRUE', 'FALSE', 'NULL'))
+COMPARISONS = frozenset(('=', '<>', '!=', '<', '<=', '>', '>='))
+
+# Columns the formulas use that the database does not store:
+# name -> (source column, {source value: derived value}, value for anything else)
+DERIVED_COLUMNS = {
+    'frequency_multiplier': ('premium_frequency', {'Monthly': 12, 'Quarterly': 4, 'Semi-Annual': 2, 'Annual': 1}, 1),
+}
+
+_TRUE_VALUES = frozenset(('true', 't', 'yes', 'y', '1'))
+
+# A cell that describes its formula in words, e.g. '(formula based on income, age, dependents)'
+_PROSE_RE = re.compile(r'\(.*\b[a-z]+ [a-z]+\b.*\)', re.S)
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?)
+      | '(?P<string>(?:[^']|'')*)'
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)
+      | (?P<op><=|>=|<>|!=|[-+*/(),=<>])
+    )""", re.X)
+
+
+class FormulaError(ValueError):
+    """Raised when a formula cannot be parsed or evaluated"""
+
+
+# -- parsing -----------------------------------------------------------------
+
+
+def tokenize(text):
+    """(kind, value) tokens of a formula; kind is number, string, name or op"""
+    tokens = []
+    pos = 0
+    end = len(text.rstrip())
+    while pos < end:
+        match = _TOKEN_RE.match(text, pos)
+        if match is None or match.end() == pos:
+            raise FormulaError(f"{text!r}: unexpected {text[pos:].strip()[:10]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'number':
+            value = float(value) if '.' in value else int(value)
+        elif kind == 'string':
+            value = value.replace("''", "'")
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.pos = 0
+
+    def error(self, message):
+        return FormulaError(f"{self.text!r}: {message}")
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def op(self, *ops):
+        kind, value = self.peek()
+        if kind == 'op' and value in ops:
+            self.pos += 1
+            return value
+        return None
+
+    def expect(self, op):
+        if self.op(op) is None:
+            raise self.error(f"expected {op!r}, found {self.peek()[1]!r}")
+
+    def keyword(self, word):
+        kind, value = self.peek()
+        if kind == 'name' and value.upper() == word:
+            self.pos += 1
+            return True
+        return False
+
+    def formula(self):
+        expr = self.expr()
+        where = group_by = None
+        if self.keyword('WHERE'):
+            where = self.condition()
+        if self.keyword('GROUP'):
+            if not self.keyword('BY'):
+                raise self.error("expected BY after GROUP")
+            kind, value = self.take()
+            if kind != 'name' or value.upper() in KEYWORDS:
+                raise self.error(f"expected a column after GROUP BY, found {value!r}")
+            group_by = value
+        if self.pos < len(self.tokens):
+            raise self.error(f"unexpected {self.peek()[1]!r}")
+        aggregate = _check_aggregates(expr, self)
+        if group_by is not None and not aggregate:
+            raise self.error("GROUP BY needs an aggregate such as SUM(...) or COUNT(*)")
+        if where is not None and _has_aggregate(where):
+            raise self.error("aggregates are not allowed in WHERE")
+        return Formula(self.text, expr, where, group_by, aggregate)
+
+    def condition(self):
+        node = self.conjunction()
+        while self.keyword('OR'):
+            node = Binary('OR', node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.negation()
+        while self.keyword('AND'):
+            node = Binary('AND', node, self.negation())
+        return node
+
+    def negation(self):
+        if self.keyword('NOT'):
+            return Unary('NOT', self.negation())
+        left = self.expr()
+        op = self.op(*COMPARISONS)
+        if op is None:
+            return left
+        return Binary('<>' if op == '!=' else op, left, self.expr())
+
+    def expr(self):
+        node = self.term()
+        while True:
+            op = self.op('+', '-')
+            if op is None:
+                return node
+            node = Binary(op, node, self.term())
+
+    def term(self):
+        node = self.factor()
+        while True:
+            op = self.op('*', '/')
+            if op is None:
+                return node
+            node = Binary(op, node, self.factor())
+
+    def factor(self):
+        if self.op('-'):
+            return Unary('-', self.factor())
+        if self.op('('):
+            node = self.condition()
+            self.expect(')')
+            return node
+        kind, value = self.take()
+        if kind == 'number':
+            return Literal(value)
+        if kind == 'string':
+            return Literal(value)
+        if kind != 'name':
+            raise self.error(f"expected a value, found {value!r}" if value is not None else "unexpected end")
+        upper = value.upper()
+        if upper in ('TRUE', 'FALSE'):
+            return Literal(upper == 'TRUE')
+        if upper == 'NULL':
+            return Literal(None)
+        if upper in KEYWORDS:
+            raise self.error(f"unexpected {value}")
+        if self.op('('):
+            return self.call(upper)
+        return Column(value)
+
+    def call(self, name):
+        if name not in FUNCTIONS:
+            raise self.error(f"unknown function {name}()")
+        args = []
+        if name == 'COUNT' and self.op('*'):
+            self.expect(')')
+            return Call(name, ())
+        if not self.op(')'):
+            args.append(self.expr())
+            while self.op(','):
+                args.append(self.expr())
+            self.expect(')')
+        if len(args) not in FUNCTIONS[name]:
+            raise self.error(f"{name}() takes {' or '.join(map(str, FUNCTIONS[name]))} argument(s), got {len(args)}")
+        return Call(name, tuple(args))
+
+
+def _children(node):
+    if isinstance(node, Call):
+        return node.args
+    if isinstance(node, Unary):
+        return (node.operand,)
+    if isinstance(node, Binary):
+        return (node.left, node.right)
+    return ()
+
+
+def _has_aggregate(node):
+    return (isinstance(node, Call) and node.name in AGGREGATES) or any(map(_has_aggregate, _children(node)))
+
+
+def _check_aggregates(expr, parser):
+    """True if `expr` aggregates; per-record columns outside an aggregate, or nested ones, are errors"""
+    if not _has_aggregate(expr):
+        return False
+
+    def visit(node, inside):
+        if isinstance(node, Call) and node.name in AGGREGATES:
+            if inside:
+                raise parser.error(f"{node.name}() cannot be nested in another aggregate")
+            inside = True
+        elif isinstance(node, Column) and not inside:
+            raise parser.error(f"{node.name} is used outside an aggregate")
+        for child in _children(node):
+            visit(child, inside)
+
+    visit(expr, False)
+    return True
+
+
+def parse(text):
+    """Compile a formula cell into a Formula; raises FormulaError if it does not fit the grammar"""
+    return _Parser(text.strip()).formula()
+
+
+def columns_of(formula):
+    """Columns a formula reads, in order of first use (derived columns replaced by their source)"""
+    names = {}
+
+    def visit(node):
+        if isinstance(node, Column):
+            name = node.name.rsplit('.', 1)[-1]
+            names.setdefault(DERIVED_COLUMNS[name][0] if name in DERIVED_COLUMNS else name)
+        for child in _children(node):
+            visit(child)
+
+    for node in (formula.expr, formula.where):
+        if node is not None:
+            visit(node)
+    if formula.group_by is not None:
+        names.setdefault(formula.group_by.rsplit('.', 1)[-1])
+    return tuple(names)
+
+
+def map_formulas(dataset):
+    """
+    (fields, unsupported): a CalculatedField for every formula cell in the
+    map that compiles, and (row, error) for those that do not. Cells that
+    describe a formula in prose are neither.
+    """
+    from navmap.summary import CALCULATED_MARKERS, COLUMN, is_calculated
+
+    fields = []
+    unsupported = []
+    compiled = {}
+    for section in dataset.sections:
+        for row in section.rows:
+            cell = row[COLUMN]
+            if cell in CALCULATED_MARKERS or _PROSE_RE.fullmatch(cell) or not is_calculated(row):
+                continue
+            formula = compiled.get(cell)
+            if formula is None:
+                try:
+                    formula = compiled[cell] = parse(cell)
+                except FormulaError as exc:
+                    unsupported.append((row, exc))
+                    continue
+            # A plain column name is a stored value, not a formula
+            if isinstance(formula.expr, Column) and formula.where is None:
+                continue
+            fields.append(CalculatedField(section.title, row[0], row[3], row[4], row[6], formula))
+    return fields, unsupported
+
+
+# -- evaluation --------------------------------------------------------------
+
+
+def _kind(node):
+    """What a node evaluates to: 'number', 'date', 'bool', 'text', or None for a column (whatever it is used as)"""
+    if isinstance(node, Literal):
+        value = node.value
+        if isinstance(value, bool):
+            return 'bool'
+        if isinstance(value, str):
+            return 'text'
+        return None if value is None else 'number'
+    if isinstance(node, Call):
+        return 'date' if node.name == 'NOW' else 'number'
+    if isinstance(node, Unary):
+        return 'bool' if node.op == 'NOT' else 'number'
+    if isinstance(node, Binary):
+        return 'bool' if node.op in COMPARISONS or node.op in ('AND', 'OR') else 'number'
+    return None
+
+
+class _Batch:
+    """Columns of a batch of records, each converted once per kind it is used as"""
+
+    def __init__(self, data, now, np, pd):
+        self.data = data
+        self.np = np
+        self.pd = pd
+        names = list(data.columns) if hasattr(data, 'columns') else list(data)
+        self.names = frozenset(names)
+        self.length = len(data) if hasattr(data, 'columns') else (len(data[names[0]]) if names else 0)
+        self.now = np.datetime64(now, 'us')
+        self.mask = None
+        self.codes = None
+        self.groups = 0
+        self._cache = {}
+
+    def raw(self, name):
+        """Values of a stored or derived column as a NumPy array"""
+        np = self.np
+        key = (name, 'raw')
+        values = self._cache.get(key)
+        if values is not None:
+            return values
+        column = name if name in self.names else name.rsplit('.', 1)[-1]
+        if column in self.names:
+            values = self.data[column]
+            values = values.to_numpy() if hasattr(values, 'to_numpy') else np.asarray(values)
+        elif column in DERIVED_COLUMNS:
+            source, table, default = DERIVED_COLUMNS[column]
+            if source not in self.names:
+                raise FormulaError(f"{column} is derived from {source}, which the records do not have")
+            values = self.lookup(source, lambda value: table.get(value, default), default, float)
+        else:
+            raise FormulaError(f"the records have no column {name!r}")
+        self._cache[key] = values
+        return values
+
+    def factorized(self, name):
+        """(codes, distinct values) of a column; code -1 is a missing value"""
+        key = (name, 'codes')
+        result = self._cache.get(key)
+        if result is None:
+            codes, uniques = self.pd.factorize(self.raw(name))
+            result = self._cache[key] = (codes, self.np.asarray(uniques, dtype=object))
+        return result
+
+    def lookup(self, name, function, missing, dtype):
+        """`function` applied to each distinct value of a column, then spread back over the records"""
+        codes, uniques = self.factorized(name)
+        table = self.np.array([function(value) for value in uniques] + [missing], dtype=dtype)
+        return table[codes]  # code -1 picks the trailing `missing`
+
+    def column(self, name, kind):
+        if kind in (None, 'text'):
+            return self.raw(name)
+        key = (name, kind)
+        values = self._cache.get(key)
+        if values is None:
+            raw = self.raw(name)
+            if kind == 'bool' and raw.dtype.kind == 'O':
+                # Text flags ('true', 'Y', ...) have a handful of distinct values
+                values = self.lookup(name, lambda value: self.scalar(value, 'bool'), False, bool)
+            else:
+                values = self.convert(raw, kind)
+            self._cache[key] = values
+        return values
+
+    def convert(self, values, kind):
+        np, pd = self.np, self.pd
+        if not isinstance(values, np.ndarray):
+            return self.scalar(values, kind)
+        if kind == 'number':
+            if values.dtype.kind in 'biuf':
+                return values.astype(float, copy=False)
+            return pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+        if kind == 'date':
+            if values.dtype.kind == 'M':
+                return values
+            dates = pd.to_datetime(pd.Series(values), errors='coerce', utc=True, format='ISO8601')
+            return dates.dt.tz_localize(None).to_numpy()
+        if kind == 'bool':
+            if values.dtype.kind == 'b':
+                return values
+            if values.dtype.kind in 'iuf':
+                return np.nan_to_num(values) != 0
+            return pd.Series(values, dtype=object).astype(str).str.strip().str.lower().isin(_TRUE_VALUES).to_numpy()
+        return values
+
+    def scalar(self, value, kind):
+        np = self.np
+        if value is None:
+            return np.nan if kind == 'number' else value
+        if kind == 'number':
+            try:
+                return float(value)
+            except ValueError:
+                raise FormulaError(f"{value!r} is not a number") from None
+        if kind == 'date':
+            if not isinstance(value, str):
+                return value
+            try:
+                return np.datetime64(value)
+            except ValueError:
+                raise FormulaError(f"{value!r} is not a date") from None
+        if kind == 'bool':
+            return str(value).strip().lower() in _TRUE_VALUES if isinstance(value, str) else bool(value)
+        return value
+
+
+def _evaluate(node, batch, kind=None):
+    np = batch.np
+    if isinstance(node, Literal):
+        return batch.scalar(node.value, kind or _kind(node))
+    if isinstance(node, Column):
+        return batch.column(node.name, kind)
+    if isinstance(node, Call):
+        if node.name == 'NOW':
+            return batch.now
+        if node.name == 'DATEDIFF':
+            later, earlier = (_evaluate(arg, batch, 'date') for arg in node.args)
+            days = np.asarray(later, dtype='datetime64[D]') - np.asarray(earlier, dtype='datetime64[D]')
+            return days / np.timedelta64(1, 'D')
+        return _aggregate(node, batch)
+    if isinstance(node, Unary):
+        if node.op == 'NOT':
+            return np.logical_not(_evaluate(node.operand, batch, 'bool'))
+        return -_evaluate(node.operand, batch, 'number')
+    op = node.op
+    if op in ('AND', 'OR'):
+        combine = np.logical_and if op == 'AND' else np.logical_or
+        return combine(_evaluate(node.left, batch, 'bool'), _evaluate(node.right, batch, 'bool'))
+    if op in COMPARISONS:
+        return _compare(node, batch)
+    left = _evaluate(node.left, batch, 'number')
+    right = _evaluate(node.right, batch, 'number')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if op == '+':
+            return left + right
+        if op == '-':
+            return left - right
+        if op == '*':
+            return left * right
+        # SQL gives NULL, not infinity, for a division by zero
+        return np.where(right == 0, np.nan, left / right)
+
+
+def _compare(node, batch):
+    np = batch.np
+    kinds = {_kind(node.left), _kind(node.right)} - {None}
+    if isinstance(node.right, Literal) and node.right.value is None or \
+            isinstance(node.left, Literal) and node.left.value is None:
+        # x = NULL / x <> NULL test for missing values
+        other = node.left if isinstance(node.right, Literal) and node.right.value is None else node.right
+        missing = batch.pd.isna(_evaluate(other, batch))
+        if node.op not in ('=', '<>'):
+            raise FormulaError(f"only = and <> compare with NULL, not {node.op}")
+        return missing if node.op == '=' else np.logical_not(missing)
+    kind = 'text' if 'text' in kinds else 'bool' if 'bool' in kinds else 'date' if 'date' in kinds else 'number'
+    if kind in ('text', 'bool') and node.op not in ('=', '<>'):
+        raise FormulaError(f"only = and <> compare {kind} values, not {node.op}")
+    if kind == 'text' and {type(node.left), type(node.right)} == {Column, Literal}:
+        # status = 'Active': compare the distinct values once, then spread through the codes
+        column, literal = (node.left, node.right) if isinstance(node.left, Column) else (node.right, node.left)
+        equal = batch.lookup(column.name, lambda value: value == literal.value, False, bool)
+        return equal if node.op == '=' else np.logical_not(equal)
+    left = _evaluate(node.left, batch, kind)
+    right = _evaluate(node.right, batch, kind)
+    if kind == 'text':
+        left = left.astype(object) if isinstance(left, np.ndarray) else left
+        right = right.astype(object) if isinstance(right, np.ndarray) else right
+    with np.errstate(invalid='ignore'):
+        if node.op == '=':
+            return np.asarray(left == right)
+        if node.op == '<>':
+            return np.asarray(left != right)
+        if node.op == '<':
+            return np.asarray(left < right)
+        if node.op == '<=':
+            return np.asarray(left <= right)
+        if node.op == '>':
+            return np.asarray(left > right)
+        return np.asarray(left >= right)
+
+
+def _aggregate(node, batch):
+    np = batch.np
+    length = batch.length
+    if node.args:
+        kind = 'number' if node.name != 'COUNT' else _kind(node.args[0])
+        values = np.broadcast_to(_evaluate(node.args[0], batch, kind), (length,))
+        present = ~batch.pd.isna(values)
+    else:
+        values = None
+        present = np.ones(length, dtype=bool)
+    if batch.mask is not None:
+        present &= batch.mask
+
+    if batch.codes is None:
+        if node.name == 'COUNT':
+            return float(np.count_nonzero(present))
+        selected = values[present]
+        if not selected.size:
+            return 0.0 if node.name == 'SUM' else np.nan
+        return float({'SUM': np.sum, 'AVG': np.mean, 'MIN': np.min, 'MAX': np.max}[node.name](selected))
+
+    groups = batch.groups
+    keep = present & (batch.codes >= 0)
+    codes = batch.codes[keep]
+    counts = np.bincount(codes, minlength=groups).astype(float)
+    if node.name == 'COUNT':
+        return counts
+    selected = values[keep]
+    if node.name in ('SUM', 'AVG'):
+        sums = np.bincount(codes, weights=selected, minlength=groups)
+        if node.name == 'SUM':
+            return sums
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+    reduce = np.minimum if node.name == 'MIN' else np.maximum
+    result = np.full(groups, np.inf if node.name == 'MIN' else -np.inf)
+    reduce.at(result, codes, selected)
+    result[counts == 0] = np.nan
+    return result
+
+
+def evaluate(formula, records, now=None):
+    """
+    Evaluate a Formula (or formula text) over a batch of records, a pandas
+    DataFrame or a {column: values} mapping.
+
+    Per-record formulas return a float array with one value per record
+    (NaN where the WHERE condition is false, or for comparisons a boolean
+    array); aggregates return a float, and GROUP BY a pandas Series indexed
+    by group. `now` (default: the current UTC time) is what NOW() returns.
+    """
+    import datetime
+
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(formula, str):
+        formula = parse(formula)
+    if now is None:
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    batch = _Batch(records, now, np, pd)
+    if formula.where is not None:
+        batch.mask = np.broadcast_to(np.asarray(_evaluate(formula.where, batch, 'bool'), dtype=bool),
+                                     (batch.length,))
+    index = None
+    if formula.group_by is not None:
+        batch.codes, index = pd.factorize(batch.raw(formula.group_by), sort=True)
+        batch.groups = len(index)
+
+    result = _evaluate(formula.expr, batch, 'number')
+    if formula.aggregate:
+        if index is None:
+            return float(result)
+        return pd.Series(np.broadcast_to(result, (batch.groups,)), index=pd.Index(index, name=formula.group_by))
+    result = np.broadcast_to(result, (batch.length,))
+    if batch.mask is not None:
+        result = np.where(batch.mask, result, np.nan)
+    return np.array(result)
+
+
+# -- command line ------------------------------------------------------------
+
+
+def _select(fields, names):
+    wanted = {name.lower() for name in names}
+    return [field for field in fields if field.field.lower() in wanted]
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Evaluate the navigation map's calculated fields over records")
+    parser.add_argument("records", nargs="?", help="CSV export of a table (policies, leads, tasks, ...)")
+    parser.add_argument("--table", default=None,
+                        help="table the records come from; fields the map ties to another table are left out")
+    parser.add_argument("--list", action="store_true", help="list the map's formulas and exit")
+    parser.add_argument("--field", action="append", default=[], metavar="NAME",
+                        help="evaluate this calculated field only (repeatable; default: every one the records allow)")
+    parser.add_argument("--formula", action="append", default=[], metavar="TEXT",
+                        help="evaluate a formula of your own (repeatable)")
+    parser.add_argument("--output", metavar="FILE", help="write the records plus one column per per-record field (CSV)")
+    parser.add_argument("--now", default=None, metavar="DATE", help="date NOW() returns (default: the current time)")
+    parser.add_argument("--limit", type=int, default=10, metavar="N", help="groups to print per grouped field")
+    args = parser.parse_args(argv)
+
+    fields, unsupported = map_formulas(load_dataset())
+    if args.list or not args.records:
+        for field in fields:
+            where = f" [{field.table}]" if field.table not in ('', '—') else ''
+            print(f"{field.module} › {field.screen} › {field.field}{where}: {field.formula.text}")
+        for row, exc in unsupported:
+            print(f"unsupported: {row[4]}: {exc}")
+        return 0
+
+    try:
+        custom = [CalculatedField('', '', '', text, '', parse(text)) for text in args.formula]
+    except FormulaError as exc:
+        parser.error(str(exc))
+    if args.table:
+        fields = [field for field in fields if field.table in ('', '—', args.table)]
+    chosen = _select(fields, args.field) if args.field else ([] if custom else fields)
+    if args.field and not chosen:
+        parser.error(f"no calculated field named {', '.join(args.field)}; see --list")
+    chosen += custom
+
+    import time
+
+    import pandas as pd
+
+    try:
+        header = set(pd.read_csv(args.records, nrows=0).columns)
+        now = pd.Timestamp(args.now).to_pydatetime() if args.now else None
+    except (OSError, ValueError) as exc:
+        parser.error(str(exc))
+    runnable = [field for field in chosen if set(columns_of(field.formula)) <= header]
+    skipped = [field for field in chosen if field not in runnable]
+    needed = sorted({column for field in runnable for column in columns_of(field.formula)})
+    if not runnable:
+        print(f"None of the {len(chosen)} formula(s) can run on the columns of {args.records}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    records = pd.read_csv(args.records, usecols=None if args.output else needed, low_memory=False)
+    loaded = time.perf_counter() - started
+    started = time.perf_counter()
+    per_record = {}
+    for field in runnable:
+        try:
+            result = evaluate(field.formula, records, now)
+        except FormulaError as exc:
+            print(f"  {field.field}: error: {exc}")
+            continue
+        if isinstance(result, float):
+            print(f"  {field.field} = {result:,.2f}    {field.formula.text}")
+        elif isinstance(result, pd.Series):
+            print(f"  {field.field}    {field.formula.text}")
+            for group, value in result.head(args.limit).items():
+                print(f"    {group}: {value:,.2f}")
+            if len(result) > args.limit:
+                print(f"    ... and {len(result) - args.limit} more groups")
+        else:
+            per_record[field.field] = result
+            values = pd.Series(result, dtype=float)
+            print(f"  {field.field}: {values.count():,} values, mean {values.mean():,.2f}, "
+                  f"min {values.min():,.2f}, max {values.max():,.2f}    {field.formula.text}")
+    elapsed = time.perf_counter() - started
+    print(f"{len(records):,} records, {len(runnable)} formula(s) in {elapsed:.2f}s (read in {loaded:.2f}s)")
+    if skipped:
+        print(f"Skipped {len(skipped)} formula(s) needing columns the records lack: "
+              + ', '.join(field.field for field in skipped))
+    if args.output and per_record:
+        records.assign(**per_record).to_csv(args.output, index=False)
+        print(f"Records written to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
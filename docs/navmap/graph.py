@@ -0,0 +1,399 @@
+"""
+Navigation graph built from the Navigate From / Navigate To columns
+
+Those cells are free text ("/customers, /quick-quote, /todo, /analytics",
+"/customers/detail?id={id}", "Sidebar, / (home)", "(back)"). Each entry is
+normalized to a route node by dropping the query string and any
+parenthetical note; "(self)", "(modal)", "(download)" and other pure
+markers add no edge, and "(back)" becomes an edge back to the rows'
+Navigate From routes.
+
+Every row contributes from -> screen and screen -> to edges, weighted by
+the number of rows that declare them. Routes reached from "Sidebar" or
+the "User dropdown" are app-shell destinations: with shell=True (the
+default) every signed-in route gets a one-click edge to them.
+
+Adjacency is stored CSR-style: an offsets array plus flat target and
+weight arrays (stdlib arrays of 4-byte ints), in both directions. On top
+of that the graph precomputes strongly connected components and a
+reachability bitset per component, so reachable() is two lookups and a
+bit test. Shortest click-paths run a BFS over the CSR arrays once per
+source and keep the parent array, so repeated queries from the same
+screen are a walk up that array.
+
+Usage: python -m navmap.graph [--path FROM TO] [--reachable FROM TO] [--orphans] [--dead-ends]
+"""
+
+import argparse
+import hashlib
+import marshal
+import os
+import re
+import sys
+from array import array
+from collections import deque
+
+from navmap.dataset import CACHE_DIR
+
+# Map columns holding the screen and its navigation cells
+SCREEN, NAVIGATE_FROM, NAVIGATE_TO = 0, 1, 2
+
+# Cells naming app-shell navigation rather than a route
+SHELL_SOURCES = ('Sidebar', 'User dropdown')
+
+# Routes served outside the signed-in app shell (see src/App.jsx)
+PUBLIC_ROUTES = frozenset(('/login', '/register'))
+
+# Markers that appear in Navigate From for a route users land on directly
+ENTRY_MARKERS = ('(entry)', '(recovery link)')
+
+BACK = '(back)'
+
+# Bump when the cached graph layout changes
+GRAPH_CACHE_VERSION = 1
+
+# BFS parent arrays kept per source for shortest_path()
+PATH_CACHE_SIZE = 256
+
+_ANNOTATION_RE = re.compile(r'\s*\([^)]*\)')
+
+
+def normalize_route(token):
+    """
+    Route node for one Navigate From / To entry, or None for markers.
+
+    '/customers/detail?id={id}' -> '/customers/detail'
+    '/ (home)'                  -> '/'
+    '(self)', 'Sidebar', 'None' -> None
+    """
+    token = token.strip()
+    if not token.startswith('/'):
+        return None
+    token = _ANNOTATION_RE.sub('', token.split('?', 1)[0].split('#', 1)[0]).strip()
+    if len(token) > 1:
+        token = token.rstrip('/')
+    return token or None
+
+
+def split_cell(cell):
+    """Comma-separated entries of a navigation cell, annotations kept"""
+    return [part.strip() for part in cell.split(',') if part.strip()]
+
+
+class NavigationGraph:
+    """
+    Directed route graph with CSR adjacency and precomputed reachability.
+
+    Build one with from_rows() / from_dataset() (or load_graph(), which
+    caches it); nodes are route strings such as '/customers/detail'.
+    """
+
+    def __init__(self, nodes, edges, entries=(), shell_targets=()):
+        """
+        nodes: route strings; edges: {(source, target): weight} over node
+        indices; entries / shell_targets: node indices.
+        """
+        self.nodes = list(nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.entries = frozenset(entries)
+        self.shell_targets = frozenset(shell_targets)
+        self.offsets, self.targets, self.weights = self._csr(len(self.nodes), edges)
+        self.in_offsets, self.sources, self.in_weights = self._csr(
+            len(self.nodes), {(t, s): w for (s, t), w in edges.items()})
+        self._component, self._reach = self._reachability()
+        self._parents = {}
+
+    # -- building -----------------------------------------------------------
+
+    @classmethod
+    def from_rows(cls, rows, shell=True):
+        index = {}
+        nodes = []
+        edges = {}
+        entries = set()
+        shell_targets = set()
+
+        def node(route):
+            i = index.get(route)
+            if i is None:
+                i = index[route] = len(nodes)
+                nodes.append(route)
+            return i
+
+        def add(source, target):
+            if source != target:
+                edges[source, target] = edges.get((source, target), 0) + 1
+
+        for row in rows:
+            screen = normalize_route(row[SCREEN])
+            if screen is None:
+                continue
+            here = node(screen)
+            origins = []
+            for entry in split_cell(row[NAVIGATE_FROM]):
+                if entry in ENTRY_MARKERS:
+                    entries.add(here)
+                elif entry in SHELL_SOURCES:
+                    shell_targets.add(here)
+                route = normalize_route(entry)
+                if route is not None:
+                    origins.append(node(route))
+            for origin in origins:
+                add(origin, here)
+            for entry in split_cell(row[NAVIGATE_TO]):
+                if entry == BACK:
+                    for origin in origins:
+                        add(here, origin)
+                    continue
+                route = normalize_route(entry)
+                if route is not None:
+                    add(here, node(route))
+
+        if shell:
+            for i, route in enumerate(nodes):
+                if route not in PUBLIC_ROUTES:
+                    for target in shell_targets:
+                        if target != i and (i, target) not in edges:
+                            edges[i, target] = 0
+        return cls(nodes, edges, entries, shell_targets)
+
+    @classmethod
+    def from_dataset(cls, dataset, shell=True):
+        return cls.from_rows((row for section in dataset.sections for row in section.rows), shell)
+
+    @staticmethod
+    def _csr(size, edges):
+        counts = [0] * (size + 1)
+        for source, _ in edges:
+            counts[source + 1] += 1
+        for i in range(size):
+            counts[i + 1] += counts[i]
+        offsets = array('I', counts)
+        targets = array('I', bytes(4 * len(edges)))
+        weights = array('I', bytes(4 * len(edges)))
+        fill = list(counts[:-1])
+        for (source, target), weight in sorted(edges.items()):
+            position = fill[source]
+            targets[position] = target
+            weights[position] = weight
+            fill[source] += 1
+        return offsets, targets, weights
+
+    def _reachability(self):
+        """
+        Component id per node (iterative Tarjan) and, per component, an int
+        bitset of the nodes reachable from it.
+        """
+        size = len(self.nodes)
+        offsets, targets = self.offsets, self.targets
+        order = [-1] * size
+        low = [0] * size
+        on_stack = [False] * size
+        component = array('I', bytes(4 * size))
+        stack = []
+        members = []
+        counter = 0
+        for root in range(size):
+            if order[root] != -1:
+                continue
+            work = [(root, offsets[root])]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            while work:
+                node, edge = work[-1]
+                if edge < offsets[node + 1]:
+                    work[-1] = (node, edge + 1)
+                    target = targets[edge]
+                    if order[target] == -1:
+                        order[target] = low[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack[target] = True
+                        work.append((target, offsets[target]))
+                    elif on_stack[target]:
+                        low[node] = min(low[node], order[target])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    group = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component[member] = len(members)
+                        group.append(member)
+                        if member == node:
+                            break
+                    members.append(group)
+
+        # Tarjan emits components in reverse topological order, so every
+        # successor component's bitset is complete before it is needed
+        reach = []
+        for group in members:
+            bits = 0
+            for member in group:
+                bits |= 1 << member
+            for member in group:
+                for edge in range(offsets[member], offsets[member + 1]):
+                    target_component = component[targets[edge]]
+                    if target_component != len(reach):
+                        bits |= reach[target_component]
+            reach.append(bits)
+        return component, reach
+
+    # -- queries ------------------------------------------------------------
+
+    def _node(self, route):
+        key = normalize_route(route) if route not in self.index else route
+        try:
+            return self.index[key]
+        except KeyError:
+            raise KeyError(f"unknown route: {route!r}") from None
+
+    def successors(self, route):
+        """[(route, weight), ...] one click away from `route`"""
+        i = self._node(route)
+        return [(self.nodes[self.targets[e]], self.weights[e]) for e in range(self.offsets[i], self.offsets[i + 1])]
+
+    def predecessors(self, route):
+        i = self._node(route)
+        return [(self.nodes[self.sources[e]], self.in_weights[e])
+                for e in range(self.in_offsets[i], self.in_offsets[i + 1])]
+
+    def reachable(self, source, target):
+        """True if `target` can be reached from `source` by following links"""
+        return bool(self._reach[self._component[self._node(source)]] >> self._node(target) & 1)
+
+    def reachable_from(self, source):
+        bits = self._reach[self._component[self._node(source)]]
+        return [node for i, node in enumerate(self.nodes) if bits >> i & 1]
+
+    def _bfs(self, source):
+        parents = self._parents.get(source)
+        if parents is not None:
+            return parents
+        parents = array('i', [-1]) * len(self.nodes)
+        parents[source] = source
+        offsets, targets = self.offsets, self.targets
+        queue = deque((source,))
+        while queue:
+            node = queue.popleft()
+            for edge in range(offsets[node], offsets[node + 1]):
+                target = targets[edge]
+                if parents[target] == -1:
+                    parents[target] = node
+                    queue.append(target)
+        if len(self._parents) >= PATH_CACHE_SIZE:
+            self._parents.pop(next(iter(self._parents)))
+        self._parents[source] = parents
+        return parents
+
+    def shortest_path(self, source, target):
+        """Fewest-click route list from `source` to `target`, or None if unreachable"""
+        start, goal = self._node(source), self._node(target)
+        if not self._reach[self._component[start]] >> goal & 1:
+            return None
+        parents = self._bfs(start)
+        path = [goal]
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        return [self.nodes[i] for i in reversed(path)]
+
+    def orphans(self):
+        """Routes nothing links to, other than entry points"""
+        return [node for i, node in enumerate(self.nodes)
+                if self.in_offsets[i] == self.in_offsets[i + 1] and i not in self.entries]
+
+    def dead_ends(self):
+        """Routes with no way onward"""
+        return [node for i, node in enumerate(self.nodes) if self.offsets[i] == self.offsets[i + 1]]
+
+    def unreachable(self):
+        """Routes no entry point can reach"""
+        bits = 0
+        for entry in self.entries:
+            bits |= self._reach[self._component[entry]]
+        return [node for i, node in enumerate(self.nodes) if not bits >> i & 1]
+
+    # -- persistence --------------------------------------------------------
+
+    def to_payload(self):
+        edges = {}
+        for source in range(len(self.nodes)):
+            for edge in range(self.offsets[source], self.offsets[source + 1]):
+                edges[source, self.targets[edge]] = self.weights[edge]
+        return (tuple(self.nodes), tuple(edges.items()), tuple(sorted(self.entries)),
+                tuple(sorted(self.shell_targets)))
+
+    @classmethod
+    def from_payload(cls, payload):
+        nodes, edges, entries, shell_targets = payload
+        return cls(nodes, dict(edges), entries, shell_targets)
+
+
+def _cache_path(digest, shell):
+    tag = f"py{sys.version_info[0]}{sys.version_info[1]}-m{marshal.version}-v{GRAPH_CACHE_VERSION}"
+    return os.path.join(CACHE_DIR, f"graph-{digest}-{'shell' if shell else 'plain'}-{tag}.marshal")
+
+
+def load_graph(dataset, shell=True, use_cache=True):
+    """NavigationGraph for a dataset, cached in navmap/.cache by the dataset digest"""
+    if not (use_cache and dataset.digest):
+        return NavigationGraph.from_dataset(dataset, shell)
+    digest = hashlib.blake2b(dataset.digest.encode(), digest_size=8).hexdigest()
+    cache_file = _cache_path(digest, shell)
+    try:
+        with open(cache_file, 'rb') as f:
+            return NavigationGraph.from_payload(marshal.load(f))
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    graph = NavigationGraph.from_dataset(dataset, shell)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{cache_file}.tmp{os.getpid()}"
+        with open(tmp, 'wb') as f:
+            marshal.dump(graph.to_payload(), f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+    return graph
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Query the navigation graph of the map")
+    parser.add_argument("--path", nargs=2, metavar=("FROM", "TO"), help="shortest click-path")
+    parser.add_argument("--reachable", nargs=2, metavar=("FROM", "TO"), help="can TO be reached from FROM")
+    parser.add_argument("--orphans", action="store_true", help="routes nothing links to")
+    parser.add_argument("--dead-ends", action="store_true", help="routes with no way onward")
+    parser.add_argument("--no-shell", action="store_true", help="ignore sidebar / user dropdown links")
+    args = parser.parse_args(argv)
+
+    graph = load_graph(load_dataset(), shell=not args.no_shell)
+    edge_count = len(graph.targets)
+    print(f"{len(graph.nodes)} routes, {edge_count} links, {len(graph.shell_targets)} shell destinations")
+    try:
+        if args.path:
+            path = graph.shortest_path(*args.path)
+            print(' → '.join(path) if path else f"{args.path[1]} is not reachable from {args.path[0]}")
+        if args.reachable:
+            print('yes' if graph.reachable(*args.reachable) else 'no')
+    except KeyError as exc:
+        parser.error(exc.args[0])
+    if args.orphans:
+        print('Orphans: ' + (', '.join(graph.orphans()) or '(none)'))
+    if args.dead_ends:
+        print('Dead ends: ' + (', '.join(graph.dead_ends()) or '(none)'))
+    if not (args.path or args.reachable or args.orphans or args.dead_ends):
+        for node in graph.nodes:
+            print(f"{node} → " + ', '.join(f"{target} ({weight})" for target, weight in graph.successors(node)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,411 @@
+"""
+Import edits from the XLSX map back into the dataset
+
+Analysts edit advisorhub-navigation-map-complete.xlsx in Excel; this reads
+the workbook back into navmap/data/navigation-map.json. The sheet is read
+as a stream straight from the package: the shared strings table is loaded
+once, then the sheet XML is walked row by row with iterparse and every
+row element is dropped as soon as it has been read, so memory stays flat
+however long the sheet is (openpyxl's read-only mode does the same walk
+through far more Python per cell).
+
+Row 1 is matched to the dataset columns by name, so reordered columns are
+fine. A row whose first cell carries a module icon is a section header,
+detected with the writer's own is_section_row(); rows after it belong to
+that module. A per-module workbook (navmap.sheets) has no such rows: its
+Index sheet lists each module with the sheet that holds its rows. Cells
+are normalized before they are compared: empty cells become '', numbers
+Excel inferred go back to their plain text, dates to ISO format, line
+endings to '\\n', and surrounding whitespace is dropped.
+
+The result is compared with the current dataset row by row by
+navmap.diff, keyed by (screen, screen section, section field) plus the
+occurrence number for repeated keys, and reported as added, removed and
+modified rows (a row that moved to another module counts as modified). Without --dry-run the
+dataset file is rewritten in its usual layout.
+
+Usage: python -m navmap.importer [FILE.xlsx] [--dry-run] [--output FILE] [--limit N]
+"""
+
+import argparse
+import posixpath
+import sys
+
+from navmap.dataset import DATA_FILE, Dataset, Section
+from navmap.diff import diff_datasets, format_changes
+
+_REL_NS = (
+    '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}',
+    '{http://purl.oclc.org/ooxml/officeDocument/relationships}',
+)
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+class WorkbookError(ValueError):
+    """Raised when the workbook does not look like the navigation map"""
+
+
+# -- streaming sheet reader --------------------------------------------------
+
+
+def _ns(tag):
+    return tag[:tag.index('}') + 1] if tag.startswith('{') else ''
+
+
+def _parse_xml(zf, name):
+    from xml.etree import ElementTree
+
+    with zf.open(name) as f:
+        return ElementTree.parse(f).getroot()
+
+
+def _resolve(base, target):
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(base), target))
+
+
+def _sheet_parts(zf):
+    """({sheet name: XML part, or None if it has none} in workbook order, date1904)"""
+    workbook = _parse_xml(zf, 'xl/workbook.xml')
+    ns = _ns(workbook.tag)
+    props = workbook.find(f'{ns}workbookPr')
+    date1904 = props is not None and props.get('date1904') in ('1', 'true')
+    rels = _parse_xml(zf, 'xl/_rels/workbook.xml.rels')
+    targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(f'{_PKG_REL_NS}Relationship')}
+    parts = {}
+    for sheet in workbook.findall(f'{ns}sheets/{ns}sheet'):
+        rel_id = next((sheet.get(ns_ + 'id') for ns_ in _REL_NS if sheet.get(ns_ + 'id')), None)
+        target = targets.get(rel_id)
+        parts[sheet.get('name')] = None if target is None else _resolve('xl/workbook.xml', target)
+    return parts, date1904
+
+
+def _sheet_part(parts, sheet_name=None):
+    """The XML part of the named sheet, or of the first one"""
+    if not parts:
+        raise WorkbookError("workbook has no sheets")
+    if sheet_name is None:
+        sheet_name = next(iter(parts))
+    elif sheet_name not in parts:
+        raise WorkbookError(f"no sheet named {sheet_name!r}")
+    if parts[sheet_name] is None:
+        raise WorkbookError(f"sheet {sheet_name!r} has no part")
+    return parts[sheet_name]
+
+
+def _shared_strings(zf):
+    try:
+        root = _parse_xml(zf, 'xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    ns = _ns(root.tag)
+    t, r = f'{ns}t', f'{ns}r'
+    strings = []
+    for si in root:
+        # Plain <t>, or rich text runs <r><t/></r>; phonetic runs (<rPh>) are not part of the value
+        strings.append(''.join(
+            (child.text or '') if child.tag == t else ''.join(part.text or '' for part in child.iter(t))
+            for child in si if child.tag in (t, r)
+        ))
+    return strings
+
+
+def _date_styles(zf):
+    """Indexes of cell styles whose number format is a date"""
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+
+    try:
+        root = _parse_xml(zf, 'xl/styles.xml')
+    except KeyError:
+        return frozenset()
+    ns = _ns(root.tag)
+    formats = dict(BUILTIN_FORMATS)
+    for fmt in root.iter(f'{ns}numFmt'):
+        formats[int(fmt.get('numFmtId'))] = fmt.get('formatCode')
+    xfs = root.find(f'{ns}cellXfs')
+    if xfs is None:
+        return frozenset()
+    return frozenset(
+        index for index, xf in enumerate(xfs)
+        if is_date_format(formats.get(int(xf.get('numFmtId', 0)), 'General'))
+    )
+
+
+_DIGITS = '0123456789'
+_COLUMNS = {}
+
+
+def _column_index(ref):
+    """Zero-based column of a cell reference ('C12' -> 2), memoized by its letters"""
+    letters = ref.rstrip(_DIGITS)
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    _COLUMNS[letters] = index - 1
+    return index - 1
+
+
+def _sheet_reader(zf, date1904):
+    """
+    Function that yields (row number, [cell values]) for every non-empty
+    row of one sheet part of `zf`; the shared strings and the date styles
+    are loaded once for all the sheets it reads.
+    """
+    from xml.etree.ElementTree import iterparse
+
+    strings = _shared_strings(zf)
+    date_styles = _date_styles(zf)
+    to_date = None
+    if date_styles:
+        from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+
+        epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+        def to_date(value):
+            return from_excel(value, epoch)
+
+    def read(part):
+        columns = _COLUMNS
+        with zf.open(part) as f:
+            events = iterparse(f, events=('start', 'end'))
+            ns = ''
+            row_tag = sheet_data = None
+            for event, elem in events:
+                if event == 'start':
+                    if row_tag is None:
+                        ns = _ns(elem.tag)
+                        row_tag = f'{ns}row'
+                        v_tag, t_tag = f'{ns}v', f'{ns}t'
+                    elif sheet_data is None and elem.tag == f'{ns}sheetData':
+                        sheet_data = elem
+                    continue
+                if elem.tag != row_tag:
+                    continue
+                values = []
+                for cell in elem:
+                    ref = cell.get('r')
+                    if ref is None:
+                        col = len(values)
+                    else:
+                        col = columns.get(ref.rstrip(_DIGITS))
+                        if col is None:
+                            col = _column_index(ref)
+                    kind = cell.get('t')
+                    if kind == 'inlineStr':
+                        value = ''.join(t.text or '' for t in cell.iter(t_tag))
+                    else:
+                        node = cell.find(v_tag)
+                        text = None if node is None else node.text
+                        if text is None:
+                            continue
+                        if kind == 's':
+                            value = strings[int(text)]
+                        elif kind in ('str', 'e', 'd'):
+                            value = text
+                        elif kind == 'b':
+                            value = text == '1'
+                        else:
+                            value = float(text) if any(c in text for c in '.eE') else int(text)
+                            if to_date is not None and int(cell.get('s', 0)) in date_styles:
+                                value = to_date(value)
+                    if col == len(values):
+                        values.append(value)
+                    else:
+                        if col > len(values):
+                            values.extend([None] * (col - len(values) + 1))
+                        values[col] = value
+                if any(value is not None for value in values):
+                    yield int(elem.get('r') or 0), values
+                # Drop the rows read so far so the tree never grows
+                if sheet_data is not None:
+                    sheet_data.clear()
+                else:
+                    elem.clear()
+
+    return read
+
+
+def iter_sheet(path, sheet_name=None):
+    """
+    Yield (row number, [cell values]) for every non-empty row of a sheet.
+
+    Values are str, int, float, bool or datetime, None for empty cells;
+    the list ends at the row's last non-empty cell.
+    """
+    import zipfile
+
+    with zipfile.ZipFile(path) as zf:
+        parts, date1904 = _sheet_parts(zf)
+        yield from _sheet_reader(zf, date1904)(_sheet_part(parts, sheet_name))
+
+
+# -- normalization and merge -------------------------------------------------
+
+
+def normalize_cell(value):
+    """Cell value as the dataset stores it"""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        if '\r' in value:
+            value = value.replace('\r\n', '\n').replace('\r', '\n')
+        return value.strip()
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else repr(value)
+    if hasattr(value, 'isoformat'):
+        if hasattr(value, 'hour') and not (value.hour or value.minute or value.second or value.microsecond):
+            return value.date().isoformat()
+        return value.isoformat(sep=' ') if hasattr(value, 'hour') else value.isoformat()
+    return str(value)
+
+
+def _positions(where, number, header, columns):
+    """Positions of `columns` in a header row, and the row's width"""
+    if header is None:
+        raise WorkbookError(f"{where}: the sheet is empty")
+    names = [normalize_cell(name) for name in header]
+    missing = [name for name in columns if name not in names]
+    if missing:
+        raise WorkbookError(f"{where}: header row {number} is missing column(s): {', '.join(missing)}")
+    return [names.index(name) for name in columns], len(names)
+
+
+def _split_label(label):
+    """(title, icon) of a module label such as '🔐 LOGIN & AUTH'"""
+    from navmap.xlsx import SECTION_ICONS
+
+    icon = next((icon for icon in SECTION_ICONS if label.startswith(icon)), label.split(' ', 1)[0])
+    return label[len(icon):].strip(), icon
+
+
+def _read_map_sheet(path, rows, columns):
+    """Sections of the single "Navigation Map" sheet, whose section header rows split the modules"""
+    from navmap.xlsx import is_section_row
+
+    number, header = next(rows, (0, None))
+    positions, width = _positions(path, number, header, columns)
+    sections = []
+    current = None
+    for number, values in rows:
+        if len(values) < width:
+            values = values + [None] * (width - len(values))
+        if is_section_row(values):
+            current = _split_label(normalize_cell(values[0])) + ([],)
+            sections.append(current)
+            continue
+        if current is None:
+            raise WorkbookError(
+                f"{path}: row {number} comes before the first section header (a row like '🔐 LOGIN & AUTH')"
+            )
+        current[2].append(tuple(normalize_cell(values[pos]) for pos in positions))
+    return [Section(title, icon, tuple(rows)) for title, icon, rows in sections]
+
+
+def _read_module_sheets(path, parts, read, columns):
+    """Sections of a per-module workbook (navmap.sheets): one per row of the Index's module block"""
+    from navmap.sheets import INDEX_SHEET_TITLE
+
+    modules = []
+    rows = read(_sheet_part(parts, INDEX_SHEET_TITLE))
+    for number, values in rows:
+        if normalize_cell(values[0]) == 'Module' and 'Sheet' in values:
+            sheet_col = values.index('Sheet')
+            break
+    else:
+        raise WorkbookError(f"{path}: the {INDEX_SHEET_TITLE} sheet has no Module / Sheet table")
+    # The module block ends at the first blank row
+    for next_number, values in rows:
+        if next_number != number + 1 or not values or values[0] is None:
+            break
+        number = next_number
+        sheet = normalize_cell(values[sheet_col] if len(values) > sheet_col else None)
+        modules.append((normalize_cell(values[0]), sheet))
+
+    sections = []
+    for label, sheet in modules:
+        if sheet not in parts:
+            raise WorkbookError(f"{path}: the {INDEX_SHEET_TITLE} sheet lists {sheet!r}, which is not in the workbook")
+        rows = read(_sheet_part(parts, sheet))
+        number, header = next(rows, (0, None))
+        positions, width = _positions(f"{path} [{sheet}]", number, header, columns)
+        fields = []
+        for _, values in rows:
+            if len(values) < width:
+                values = values + [None] * (width - len(values))
+            fields.append(tuple(normalize_cell(values[pos]) for pos in positions))
+        sections.append(Section(*_split_label(label), tuple(fields)))
+    return sections
+
+
+def read_workbook(path, columns, sheet_name=None):
+    """
+    Dataset built from the workbook, with `columns` in the dataset's order.
+
+    Without a `sheet_name` this reads the "Navigation Map" sheet, else a
+    per-module workbook through its Index sheet, else the first sheet.
+    Raises WorkbookError if a column is missing or a field row comes
+    before the first section header.
+    """
+    import zipfile
+
+    from navmap.sheets import INDEX_SHEET_TITLE
+    from navmap.xlsx import SHEET_TITLE
+
+    with zipfile.ZipFile(path) as zf:
+        parts, date1904 = _sheet_parts(zf)
+        read = _sheet_reader(zf, date1904)
+        if sheet_name is None and SHEET_TITLE not in parts and INDEX_SHEET_TITLE in parts:
+            sections = _read_module_sheets(path, parts, read, columns)
+        else:
+            if sheet_name is None and SHEET_TITLE in parts:
+                sheet_name = SHEET_TITLE
+            sections = _read_map_sheet(path, read(_sheet_part(parts, sheet_name)), columns)
+    return Dataset(tuple(columns), sections)
+
+
+def add_arguments(parser):
+    from navmap.document import XLSX_OUTPUT
+
+    parser.add_argument("workbook", nargs="?", default=XLSX_OUTPUT, help=f"edited workbook (default: {XLSX_OUTPUT})")
+    parser.add_argument("--sheet", default=None, help="sheet to read (default: the map sheet, else the module sheets listed in the Index, else the first)")
+    parser.add_argument("--dry-run", action="store_true", help="report the changes without writing the dataset")
+    parser.add_argument("--output", default=DATA_FILE, help="dataset file to write (default: the canonical one)")
+    parser.add_argument("--limit", type=int, default=20, metavar="N", help="changes to list (default: 20)")
+
+
+def run(args):
+    import zipfile
+    from xml.etree.ElementTree import ParseError
+
+    from navmap.dataset import dump_dataset, load_dataset
+
+    current = load_dataset()
+    try:
+        imported = read_workbook(args.workbook, current.columns, args.sheet)
+    except (WorkbookError, OSError, KeyError, zipfile.BadZipFile, ParseError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    changes = diff_datasets(current, imported)
+    print(f"📥 {args.workbook}: {imported.row_count} rows in {len(imported.sections)} sections")
+    print(format_changes(changes, args.limit))
+    if args.dry_run:
+        return 0
+    # Section order or titles can change without any row changing, so always compare the whole file
+    if dump_dataset(imported, args.output):
+        print(f"✅ Updated {args.output}")
+    else:
+        print(f"✅ {args.output} is already up to date")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merge edits made in the XLSX map back into the dataset")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
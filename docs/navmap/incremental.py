@@ -0,0 +1,256 @@
+"""
+Incremental regeneration of the navigation map outputs
+
+Every output is split into parts: the header, one part per module section
+(LOGIN & AUTH, HOME DASHBOARD, ...) and the footer. Each part gets a
+content hash, and the hashes are kept in a manifest next to the outputs
+(.navmap-manifest.json) together with the size and mtime of the file
+written.
+
+On the next run:
+
+* if the inputs and the output file are exactly as recorded, nothing is
+  written at all (the file's mtime is left alone);
+* Markdown output is re-assembled part by part: unchanged parts are copied
+  byte-for-byte from the previous file and only changed parts are
+  re-rendered;
+* formats that cannot be patched in place (XLSX) are rewritten in full
+  whenever any part changed.
+"""
+
+import hashlib
+import marshal
+import os
+from collections import namedtuple
+
+from navmap.markdown import MarkdownTableWriter
+
+MANIFEST_NAME = '.navmap-manifest.json'
+
+HEADER = '__header__'
+FOOTER = '__footer__'
+
+# Bump to invalidate every manifest entry after a change in how parts are hashed
+MANIFEST_VERSION = 1
+
+Result = namedtuple('Result', ['status', 'rendered'])
+
+
+def fingerprint(value):
+    """Stable hex digest of a marshal-able value (str, bytes, tuples of those, ...)"""
+    return hashlib.blake2b(marshal.dumps(value), digest_size=16).hexdigest()
+
+
+def file_fingerprint(*paths):
+    """Digest of the given files' bytes, e.g. the renderer sources"""
+    h = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+class Manifest:
+    """Per-output part hashes, persisted as JSON next to the outputs"""
+
+    def __init__(self, directory='.'):
+        self.path = os.path.join(directory, MANIFEST_NAME)
+        self._dirty = False
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                import json
+
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        if data.get('version') != MANIFEST_VERSION:
+            data = {'version': MANIFEST_VERSION, 'outputs': {}}
+        self._data = data
+
+    def entry(self, output_file):
+        return self._data['outputs'].get(os.path.basename(output_file))
+
+    def record(self, output_file, inputs, parts, spans=None):
+        stat = os.stat(output_file)
+        entry = {
+            'inputs': inputs,
+            'parts': dict(parts),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+        }
+        if spans is not None:
+            entry['spans'] = spans
+        self._data['outputs'][os.path.basename(output_file)] = entry
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        import json
+
+        tmp = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def input_digest(dataset, header, footer, options=()):
+    """
+    Combined digest of everything an output is rendered from.
+
+    `options` covers anything else that changes the rendering (marker
+    style, renderer source digest, ...). It is built from the dataset's
+    file digest, so a no-op run never hashes the sections individually.
+    """
+    return fingerprint((MANIFEST_VERSION, dataset.digest, header, footer, tuple(options)))
+
+
+def section_parts(dataset, header, footer, options=()):
+    """Ordered (name, digest) pairs for the header, each section and the footer"""
+    options = tuple(options)
+    parts = [(HEADER, fingerprint((header, options)))]
+    for section in dataset.sections:
+        parts.append((section.title, fingerprint((section.title, section.icon, section.rows, options))))
+    parts.append((FOOTER, fingerprint((footer, options))))
+    return parts
+
+
+def _output_untouched(entry, output_file):
+    """True if the output is still exactly the file we recorded"""
+    try:
+        stat = os.stat(output_file)
+    except OSError:
+        return False
+    return stat.st_size == entry.get('size') and stat.st_mtime_ns == entry.get('mtime_ns')
+
+
+def is_current(manifest, output_file, inputs):
+    entry = manifest.entry(output_file)
+    return bool(entry) and entry.get('inputs') == inputs and _output_untouched(entry, output_file)
+
+
+def changed_parts(manifest, output_file, parts):
+    """Names of the parts whose hash differs from the manifest"""
+    entry = manifest.entry(output_file) or {}
+    previous = entry.get('parts', {})
+    return [name for name, digest in parts if previous.get(name) != digest]
+
+
+class _CountingWriter:
+    """Encodes text onto a binary file and tracks the byte offset"""
+
+    def __init__(self, raw):
+        self._raw = raw
+        self.offset = 0
+
+    def write(self, text):
+        data = text.encode('utf-8')
+        self._raw.write(data)
+        self.offset += len(data)
+
+    def write_bytes(self, data):
+        self._raw.write(data)
+        self.offset += len(data)
+
+
+def _copy_span(src, dst, start, end):
+    src.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        chunk = src.read(min(remaining, 1 << 20))
+        if not chunk:
+            raise OSError('previous output is shorter than its manifest')
+        dst.write_bytes(chunk)
+        remaining -= len(chunk)
+
+
+def write_markdown_incremental(output_file, header, dataset, footer, section_marker,
+                               manifest, options=()):
+    """
+    Regenerate a Markdown map, re-rendering only changed parts.
+
+    Returns Result(status, rendered) where status is 'unchanged',
+    'partial' or 'full' and rendered lists the parts that were rendered.
+    """
+    inputs = input_digest(dataset, header, footer, options)
+    if is_current(manifest, output_file, inputs):
+        return Result('unchanged', [])
+
+    parts = section_parts(dataset, header, footer, options)
+    entry = manifest.entry(output_file)
+    reusable = {}
+    if entry and 'spans' in entry and _output_untouched(entry, output_file):
+        previous = entry['parts']
+        reusable = {
+            name: entry['spans'][name] for name, digest in parts
+            if previous.get(name) == digest and name in entry['spans']
+        }
+
+    sections = {section.title: section for section in dataset.sections}
+    blanks = ('',) * (len(dataset.columns) - 1)
+    spans = {}
+    rendered = []
+    tmp = f"{output_file}.tmp{os.getpid()}"
+    old = open(output_file, 'rb') if reusable else None
+    try:
+        with open(tmp, 'wb') as raw:
+            out = _CountingWriter(raw)
+            for name, _ in parts:
+                start = out.offset
+                if name in reusable:
+                    _copy_span(old, out, *reusable[name])
+                else:
+                    rendered.append(name)
+                    with MarkdownTableWriter(out) as writer:
+                        if name == HEADER:
+                            writer.write(header)
+                        elif name == FOOTER:
+                            writer.write(footer)
+                        else:
+                            section = sections[name]
+                            writer.write_row((section_marker(section),) + blanks)
+                            writer.write_rows(section.rows)
+                spans[name] = [start, out.offset]
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    finally:
+        if old is not None:
+            old.close()
+
+    os.replace(tmp, output_file)
+    manifest.record(output_file, inputs, parts, spans)
+    return Result('partial' if reusable else 'full', rendered)
+
+
+def write_incremental(output_file, dataset, header, footer, manifest, write, options=()):
+    """
+    Regenerate an output that can only be written whole (e.g. XLSX).
+
+    `write(path)` produces the file. It is called only when some part
+    changed; the new file is written to a temporary path first so a failed
+    run never leaves a truncated output behind.
+    """
+    inputs = input_digest(dataset, header, footer, options)
+    if is_current(manifest, output_file, inputs):
+        return Result('unchanged', [])
+
+    parts = section_parts(dataset, header, footer, options)
+    changed = changed_parts(manifest, output_file, parts)
+    if not os.path.exists(output_file):
+        changed = [name for name, _ in parts]
+
+    root, ext = os.path.splitext(output_file)
+    tmp = f"{root}.tmp{os.getpid()}{ext}"
+    try:
+        write(tmp)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    os.replace(tmp, output_file)
+    manifest.record(output_file, inputs, parts)
+    return Result('full', changed)
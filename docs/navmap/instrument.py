@@ -0,0 +1,233 @@
+"""
+Per-stage instrumentation for the generators
+
+Code marks its stages with
+
+    with stage('to_excel') as st:
+        ...
+        st.rows = row_count
+
+and, when profiling is on, every stage records wall time, CPU time, the
+peak Python heap it needed on top of what was live when it started
+(tracemalloc) and rows/sec if it reported a row count. Stages may nest;
+the report keeps their depth. Optionally each stage runs under its own
+cProfile profiler (suspended while a nested stage runs), and the stats of
+the hottest innermost stage are dumped for pstats/snakeviz.
+
+Profiling is off unless enable() is called (python -m navmap <command>
+--profile [FILE], or NAVMAP_PROFILE=FILE in the environment). While off,
+stage() hands back one shared no-op context manager and nothing else is
+imported or traced.
+"""
+
+import os
+import time
+
+# Environment variables that turn profiling on without a flag; '1' means the default report file
+ENV_REPORT = 'NAVMAP_PROFILE'
+ENV_CPROFILE = 'NAVMAP_CPROFILE'
+
+DEFAULT_REPORT = 'navmap-profile.json'
+
+REPORT_VERSION = 1
+
+
+class _NullStage:
+    __slots__ = ('rows',)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+_active = None
+
+
+def stage(name, rows=None):
+    """Context manager timing one named stage; a shared no-op while profiling is off"""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name, rows)
+
+
+def active():
+    """The running Profiler, or None"""
+    return _active
+
+
+class Stage:
+    __slots__ = ('profiler', 'name', 'rows', 'depth', 'wall', 'cpu', 'peak', 'children',
+                 '_start_wall', '_start_cpu', '_start_memory', '_cprofile')
+
+    def __init__(self, profiler, name, rows=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.depth = 0
+        self.wall = self.cpu = 0.0
+        self.peak = 0
+        self.children = 0
+        self._cprofile = None
+
+    def __enter__(self):
+        self.profiler._push(self)
+        self._start_cpu = time.process_time()
+        self._start_wall = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.wall = time.perf_counter() - self._start_wall
+        self.cpu = time.process_time() - self._start_cpu
+        self.profiler._pop(self)
+        return False
+
+    @property
+    def rows_per_sec(self):
+        if not self.rows or not self.wall:
+            return None
+        return round(self.rows / self.wall)
+
+    def as_dict(self):
+        return {
+            'name': self.name,
+            'depth': self.depth,
+            'wall_seconds': round(self.wall, 6),
+            'cpu_seconds': round(self.cpu, 6),
+            'peak_bytes': self.peak,
+            'rows': self.rows,
+            'rows_per_sec': self.rows_per_sec,
+        }
+
+
+class Profiler:
+    """Collects Stages in the order they started"""
+
+    def __init__(self, memory=True, cprofile=False):
+        self.memory = memory
+        self.cprofile = cprofile
+        self.stages = []
+        self._stack = []
+        self._tracemalloc = None
+
+    def stage(self, name, rows=None):
+        return Stage(self, name, rows)
+
+    def start(self):
+        if self.memory:
+            import tracemalloc
+
+            self._tracemalloc = tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+        return self
+
+    def stop(self):
+        if self._tracemalloc is not None and self._tracemalloc.is_tracing():
+            self._tracemalloc.stop()
+        self._tracemalloc = None
+
+    def _push(self, st):
+        st.depth = len(self._stack)
+        self.stages.append(st)
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None:
+            parent.children += 1
+        tm = self._tracemalloc
+        if tm is not None:
+            current, peak = tm.get_traced_memory()
+            if parent is not None:
+                parent.peak = max(parent.peak, peak - parent._start_memory)
+            tm.reset_peak()
+            st._start_memory = current
+        if self.cprofile:
+            if parent is not None and parent._cprofile is not None:
+                parent._cprofile.disable()
+            import cProfile
+
+            st._cprofile = cProfile.Profile()
+            st._cprofile.enable()
+        self._stack.append(st)
+
+    def _pop(self, st):
+        self._stack.pop()
+        parent = self._stack[-1] if self._stack else None
+        if st._cprofile is not None:
+            st._cprofile.disable()
+            if parent is not None and parent._cprofile is not None:
+                parent._cprofile.enable()
+        tm = self._tracemalloc
+        if tm is not None:
+            peak = tm.get_traced_memory()[1]
+            st.peak = max(st.peak, peak - st._start_memory)
+            if parent is not None:
+                parent.peak = max(parent.peak, peak - parent._start_memory)
+
+    def hottest(self):
+        """The innermost stage with the largest wall time, or None"""
+        leaves = [st for st in self.stages if not st.children]
+        return max(leaves, key=lambda st: st.wall, default=None)
+
+    def report(self, command=None):
+        hottest = self.hottest()
+        return {
+            'version': REPORT_VERSION,
+            'command': command,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'memory': self.memory,
+            'cprofile': self.cprofile,
+            'hottest': hottest.name if hottest else None,
+            'stages': [st.as_dict() for st in self.stages],
+        }
+
+    def write_report(self, path, command=None):
+        import json
+
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.report(command), f, indent=2)
+            f.write('\n')
+        os.replace(tmp, path)
+
+    def dump_hottest(self, path):
+        """Write the hottest stage's cProfile stats to `path`; returns the stage or None"""
+        hottest = self.hottest()
+        if hottest is None or hottest._cprofile is None:
+            return None
+        hottest._cprofile.dump_stats(path)
+        return hottest
+
+    def format(self):
+        lines = [f"{'stage':<24} {'wall s':>9} {'cpu s':>9} {'peak MiB':>9} {'rows/s':>11}"]
+        for st in self.stages:
+            name = '  ' * st.depth + st.name
+            peak = f"{st.peak / (1 << 20):.1f}" if self.memory else '-'
+            rate = f"{st.rows_per_sec:,}" if st.rows_per_sec else '-'
+            lines.append(f"{name:<24} {st.wall:>9.3f} {st.cpu:>9.3f} {peak:>9} {rate:>11}")
+        return '\n'.join(lines)
+
+
+def enable(memory=True, cprofile=False):
+    """Start profiling; stage() records from now until disable()"""
+    global _active
+    _active = Profiler(memory=memory, cprofile=cprofile).start()
+    return _active
+
+
+def disable():
+    """Stop profiling and return the Profiler that was running, or None"""
+    global _active
+    profiler, _active = _active, None
+    if profiler is not None:
+        profiler.stop()
+    return profiler
+
+
+def environment_settings(environ=os.environ):
+    """(report file, cProfile dump file) requested through the environment; either may be None"""
+    report = environ.get(ENV_REPORT) or None
+    if report == '1':
+        report = DEFAULT_REPORT
+    return report, environ.get(ENV_CPROFILE) or None
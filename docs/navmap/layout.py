@@ -0,0 +1,58 @@
+"""
+Workbook layout shared by the XLSX writers
+
+The column widths and the summary blocks are the same whether the map is
+written through openpyxl (navmap.xlsx) or as hand-written SpreadsheetML
+(navmap.sheets). They live here, away from openpyxl, so the per-module
+writer and its pool workers never import it.
+"""
+
+# Column widths, in the same order as the map columns
+COLUMN_WIDTHS = [
+    25,  # Current Screen
+    35,  # Navigate From
+    35,  # Navigate To
+    25,  # Screen Section
+    25,  # Section Field
+    50,  # Description
+    20,  # Supabase Table
+    25,  # Supabase Column
+    12,  # Data Type
+    10,  # Editable
+    50,  # Validation Rule
+]
+
+
+def summary_tables(summary):
+    """
+    Blocks of the Summary sheet: (header, rows) for the totals, the
+    modules and the Supabase tables. Ratios are floats, shown as percents.
+    """
+    total = summary.total
+    totals = [
+        ("Total Pages", summary.pages),
+        ("Total Fields Documented", total.rows),
+        ("Editable Fields", total.editable),
+        ("Read-Only Fields", total.read_only),
+        ("Editable Ratio", total.editable_ratio),
+        ("Calculated Fields", total.calculated),
+        ("Supabase Tables", len(total.tables)),
+        ("Supabase Columns", len(total.columns)),
+        ("Query Parameters", len(total.params)),
+    ]
+    modules = [
+        (title, c.rows, c.editable, c.read_only, c.editable_ratio, c.calculated,
+         len(c.tables), len(c.columns), len(c.params))
+        for title, c in summary.modules.items()
+    ]
+    tables = [
+        (name, c.rows, c.editable, c.read_only, c.editable_ratio, c.calculated, len(c.columns), len(c.modules))
+        for name, c in sorted(summary.tables.items(), key=lambda item: (-item[1].rows, item[0]))
+    ]
+    return [
+        (("Metric", "Value"), totals),
+        (("Module", "Fields", "Editable", "Read-Only", "Editable %", "Calculated", "Tables", "Columns",
+          "Query Params"), modules),
+        (("Supabase Table", "Fields", "Editable", "Read-Only", "Editable %", "Calculated", "Columns",
+          "Modules"), tables),
+    ]
@@ -0,0 +1,382 @@
+"""
+Multi-locale generation of the navigation map
+
+The dataset is loaded once and translated into every requested locale,
+and each locale's Markdown and XLSX map is then written by a pool of
+worker processes, so adding locales costs little more than the slowest
+single output.
+
+Translations come from the app's own i18next catalogs
+(src/lib/i18n/locales/<locale>/translation.json): every English string of
+the en catalog is indexed by its normalized text (case, surrounding
+spaces and a trailing ':', '*' or '.' ignored), and a map string is
+translated through the key it matches. Strings made of ' / '-separated
+parts are translated part by part. Map-specific wording the app does not
+use can be added in navmap/data/locales/<locale>.json ({"English":
+"translation"}), which takes precedence; `--report FILE` writes every
+untranslated string in that shape, ready to be filled in.
+
+Translated are the section titles, Screen Section, Section Field and
+Description cells; routes, table and column names, types and the
+column headers stay as they are, so every locale's map still lines up
+with the English one. Lookups are memoized per locale, so each distinct
+string is resolved once however often it occurs.
+
+The app's language preference lists EN / ZH / MY / TH; MY is the 'ms'
+catalog, and a locale without a catalog is reported and skipped.
+
+Usage: python -m navmap.locales [LOCALE ...] [--formats md xlsx] [--dir DIR] [--workers N] [--report FILE]
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+from collections import namedtuple
+
+from navmap.dataset import Dataset, Section
+from navmap.extract import REPO_ROOT
+
+LOCALES_DIR = os.path.join(REPO_ROOT, 'src', 'lib', 'i18n', 'locales')
+OVERRIDES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'locales')
+
+SOURCE_LOCALE = 'en'
+
+# Language preference codes (the map's Language row) that differ from the catalog names
+ALIASES = {'my': 'ms'}
+
+# Map columns whose text is translated: Screen Section, Section Field, Description
+TRANSLATED_COLUMNS = (3, 4, 5)
+
+FORMATS = ('md', 'xlsx')
+
+Result = namedtuple('Result', ['locale', 'format', 'path', 'seconds', 'worker'])
+
+_STRIP_RE = re.compile(r'[\s:*.…]+$')
+_SPACE_RE = re.compile(r'\s+')
+
+
+class LocaleError(ValueError):
+    """Raised when a locale catalog is missing or unreadable"""
+
+
+def normalize(text):
+    """Lookup form of a string: 'Full Name *' and 'full name:' both give 'full name'"""
+    return _SPACE_RE.sub(' ', _STRIP_RE.sub('', text.strip())).casefold()
+
+
+def available_locales(directory=LOCALES_DIR):
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return []
+    return [name for name in names if os.path.isfile(os.path.join(directory, name, 'translation.json'))]
+
+
+def _flatten(tree, prefix=''):
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        elif isinstance(value, str):
+            yield prefix + key, value
+
+
+def load_catalog(locale, directory=LOCALES_DIR):
+    """{dotted key: text} of a locale's translation.json"""
+    import json
+
+    path = os.path.join(directory, locale, 'translation.json')
+    try:
+        with open(path, encoding='utf-8') as f:
+            return dict(_flatten(json.load(f)))
+    except (OSError, ValueError) as exc:
+        raise LocaleError(f"{locale}: cannot read {path}: {exc}") from exc
+
+
+def load_overrides(locale, directory=OVERRIDES_DIR):
+    """{normalized English: translation} from navmap/data/locales/<locale>.json, if there is one"""
+    import json
+
+    try:
+        with open(os.path.join(directory, f"{locale}.json"), encoding='utf-8') as f:
+            entries = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        raise LocaleError(f"{locale}: cannot read overrides: {exc}") from exc
+    return {normalize(english): text for english, text in entries.items() if text}
+
+
+def phrase_index(source):
+    """{normalized English text: key}; the first key wins when a text appears twice"""
+    index = {}
+    for key, text in source.items():
+        index.setdefault(normalize(text), key)
+    return index
+
+
+class Translator:
+    """Memoized English -> locale lookup that records what it could not translate"""
+
+    def __init__(self, locale, phrases, catalog, overrides=None):
+        self.locale = locale
+        self._phrases = phrases
+        self._catalog = catalog
+        self._overrides = overrides or {}
+        self._cache = {}
+        # English text -> occurrences, for the untranslated report
+        self.missing = {}
+
+    @property
+    def distinct(self):
+        """Distinct strings looked up so far"""
+        return len(self._cache)
+
+    def _resolve(self, text):
+        key = normalize(text)
+        if not any(char.isalpha() for char in key):
+            # '—', numbers and the like read the same in every locale
+            return text
+        found = self._overrides.get(key)
+        if found is None:
+            phrase = self._phrases.get(key)
+            found = self._catalog.get(phrase) if phrase is not None else None
+        if found is None and ' / ' in text:
+            parts = [self._resolve(part) for part in text.split(' / ')]
+            if all(part is not None for part in parts):
+                return ' / '.join(parts)
+        return found
+
+    def __call__(self, text):
+        cached = self._cache.get(text)
+        if cached is None:
+            cached = self._cache[text] = self._resolve(text)
+            if cached is None:
+                cached = self._cache[text] = ''
+        if cached:
+            return cached
+        if text:
+            self.missing[text] = self.missing.get(text, 0) + 1
+        return text
+
+
+def translators(locales, directory=LOCALES_DIR, overrides_dir=OVERRIDES_DIR):
+    """{locale: Translator} for every target locale; the source catalog is indexed once"""
+    phrases = phrase_index(load_catalog(SOURCE_LOCALE, directory))
+    return {
+        locale: Translator(locale, phrases, load_catalog(locale, directory), load_overrides(locale, overrides_dir))
+        for locale in locales if locale != SOURCE_LOCALE
+    }
+
+
+def translate_dataset(dataset, translate):
+    """Copy of `dataset` with section titles and the TRANSLATED_COLUMNS run through `translate`"""
+    columns = TRANSLATED_COLUMNS
+    sections = []
+    for section in dataset.sections:
+        rows = []
+        for row in section.rows:
+            cells = list(row)
+            for col in columns:
+                cells[col] = translate(cells[col])
+            rows.append(tuple(cells))
+        sections.append(Section(translate(section.title), section.icon, tuple(rows)))
+    return Dataset(dataset.columns, sections)
+
+
+def output_paths(locales, formats=FORMATS, directory='.'):
+    """{(locale, format): path}; English keeps the usual names, other locales get a .<locale> suffix"""
+    from navmap.document import MARKDOWN_OUTPUT, XLSX_OUTPUT
+
+    names = {'md': MARKDOWN_OUTPUT, 'xlsx': XLSX_OUTPUT}
+    paths = {}
+    for locale in locales:
+        for fmt in formats:
+            root, ext = os.path.splitext(names[fmt])
+            name = names[fmt] if locale == SOURCE_LOCALE else f"{root}.{locale}{ext}"
+            paths[locale, fmt] = os.path.join(directory, name)
+    return paths
+
+
+# -- worker jobs -------------------------------------------------------------
+
+# {locale: (columns, sections, note)} handed to forked workers; set just before the pool starts
+_SHARED = None
+
+
+def _markdown_job(path, dataset, note):
+    from navmap.document import markdown_marker, render_footer, render_header
+    from navmap.markdown import render_markdown
+    from navmap.rowstore import RowStore
+    from navmap.summary import summarize
+
+    summary = summarize(dataset)
+    rows = RowStore.from_dataset(dataset).iter_rows(section_marker=markdown_marker)
+    render_markdown(path, render_header(summary), rows, render_footer(summary) + note)
+
+
+def _xlsx_job(path, dataset, note):
+    from navmap.sheets import write_xlsx_sheets
+
+    # The locales already fan out over the pool, so each workbook renders its sheets in-process;
+    # the note is Markdown, so its emphasis and code marks are dropped for the Index cell
+    write_xlsx_sheets(path, dataset, workers=0, note=note.strip().replace('**', '').replace('`', ''))
+
+
+_JOBS = {'md': _markdown_job, 'xlsx': _xlsx_job}
+
+
+def _run_job(locale, fmt, path, payload=None):
+    columns, sections, note = payload if payload is not None else _SHARED[locale]
+    started = time.perf_counter()
+    _JOBS[fmt](path, Dataset(columns, [Section(*section) for section in sections]), note)
+    return Result(locale, fmt, path, time.perf_counter() - started, os.getpid())
+
+
+def _worker_job(locale, fmt, path, payload=None):
+    from navmap import instrument
+
+    instrument.disable()
+    return _run_job(locale, fmt, path, payload)
+
+
+def generate(dataset, locales, formats=FORMATS, directory='.', workers=None,
+             locales_dir=LOCALES_DIR, overrides_dir=OVERRIDES_DIR):
+    """
+    Write every (locale, format) output of `dataset`.
+
+    Returns (results, translators): Results in completion order and the
+    {locale: Translator} used, whose .missing holds the untranslated
+    strings. `workers` defaults to one process per output, up to the CPUs
+    available; 0 or 1 writes everything in this process.
+    """
+    global _SHARED
+
+    from navmap.document import LOCALE_NOTE
+    from navmap.pool import available_cpus, process_pool
+
+    tables = translators(locales, locales_dir, overrides_dir)
+    payloads = {}
+    for locale in locales:
+        translator = tables.get(locale)
+        if translator is None:
+            localized, note = dataset, ''
+        else:
+            localized = translate_dataset(dataset, translator)
+            note = LOCALE_NOTE.format(locale=locale, translated=translator.distinct - len(translator.missing),
+                                      total=translator.distinct)
+        payloads[locale] = (tuple(localized.columns), [tuple(section) for section in localized.sections], note)
+
+    jobs = output_paths(locales, formats, directory)
+    if workers is None:
+        workers = available_cpus()
+    workers = min(workers, len(jobs))
+
+    results = []
+    if workers <= 1:
+        for (locale, fmt), path in jobs.items():
+            results.append(_run_job(locale, fmt, path, payloads[locale]))
+        return results, tables
+
+    from concurrent.futures import as_completed
+
+    _SHARED = payloads
+    pool, forked = process_pool(workers)
+    try:
+        futures = [pool.submit(_worker_job, locale, fmt, path, None if forked else payloads[locale])
+                   for (locale, fmt), path in jobs.items()]
+        results.extend(future.result() for future in as_completed(futures))
+    finally:
+        pool.shutdown(cancel_futures=True)
+        _SHARED = None
+    return results, tables
+
+
+def missing_report(tables):
+    """{locale: {English: ''}} of untranslated strings, most frequent first (the overrides file shape)"""
+    return {
+        locale: {text: '' for text, _ in sorted(translator.missing.items(), key=lambda item: (-item[1], item[0]))}
+        for locale, translator in tables.items()
+    }
+
+
+def resolve_locales(requested, directory=LOCALES_DIR):
+    """(locales to write, requested locales without a catalog)"""
+    available = available_locales(directory)
+    if not requested:
+        return available, []
+    locales, unknown = [], []
+    for locale in requested:
+        locale = ALIASES.get(locale.lower(), locale.lower())
+        if locale in available:
+            if locale not in locales:
+                locales.append(locale)
+        else:
+            unknown.append(locale)
+    return locales, unknown
+
+
+def add_arguments(parser):
+    parser.add_argument("locales", nargs="*", metavar="LOCALE",
+                        help="locales to write, e.g. en zh my (default: every catalog in src/lib/i18n/locales)")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS), help="outputs per locale")
+    parser.add_argument("--dir", default=".", help="output directory (default: current directory)")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="processes writing the outputs (default: one per output, up to the CPU count)")
+    parser.add_argument("--report", metavar="FILE",
+                        help="write the untranslated strings per locale as JSON (navmap/data/locales override shape)")
+    parser.add_argument("--limit", type=int, default=5, metavar="N", help="untranslated strings to list per locale")
+
+
+def run(args, dataset):
+    locales, unknown = resolve_locales(args.locales)
+    for locale in unknown:
+        print(f"⚠️  No translation catalog for '{locale}' in {os.path.relpath(LOCALES_DIR)}; skipped")
+    if not locales:
+        print("error: no locale to write", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    try:
+        os.makedirs(args.dir, exist_ok=True)
+        results, tables = generate(dataset, locales, args.formats, args.dir, args.workers)
+    except (LocaleError, OSError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - started
+
+    for result in sorted(results, key=lambda result: (locales.index(result.locale), result.format)):
+        print(f"✅ {result.path}: {result.seconds:.2f} s (pid {result.worker})")
+    for locale, translator in tables.items():
+        distinct = translator.distinct
+        print(f"🌐 {locale}: {distinct - len(translator.missing)} of {distinct} distinct strings translated, "
+              f"{len(translator.missing)} left in English")
+        for text, count in sorted(translator.missing.items(), key=lambda item: -item[1])[:args.limit]:
+            print(f"     {count:>3}× {text}")
+    print(f"⏱️  Total: {elapsed:.2f} s for {len(results)} output(s) in {len(locales)} locale(s)")
+
+    if args.report:
+        import json
+
+        try:
+            with open(args.report, 'w', encoding='utf-8') as f:
+                json.dump(missing_report(tables), f, ensure_ascii=False, indent=2)
+                f.write('\n')
+        except OSError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        print(f"📝 Untranslated strings: {args.report}")
+    return 0
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Write the navigation map in several locales at once")
+    add_arguments(parser)
+    return run(parser.parse_args(argv), load_dataset())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+"""
+Buffered Markdown rendering for the navigation map
+
+Rows are escaped and joined into table lines, collected in a bounded
+in-memory buffer and handed to the file in large chunks instead of one
+write() call per row.
+"""
+
+# Flush to the underlying file once this many characters are buffered
+DEFAULT_BUFFER_SIZE = 1 << 18
+
+
+def escape_cell(value):
+    """Make a cell value safe to embed in a Markdown table row"""
+    if value is None:
+        return ''
+    # '|' would end the cell and a raw newline would end the table row
+    return _escape(str(value))
+
+
+def _escape(text):
+    if '|' in text:
+        text = text.replace('|', '\\|')
+    if '\n' in text or '\r' in text:
+        text = text.replace('\r\n', '<br>').replace('\r', '<br>').replace('\n', '<br>')
+    return text
+
+
+def format_row(cells):
+    """Render one table row, including the trailing newline"""
+    try:
+        # Join once with a separator that cannot need escaping, so the common
+        # case costs a single scan of the line instead of one per cell
+        line = '\x1f'.join(cells)
+    except TypeError:
+        pass
+    else:
+        # Unless a cell holds the separator itself, which would split it in two
+        if line.count('\x1f') == len(cells) - 1:
+            return '| ' + _escape(line).replace('\x1f', ' | ') + ' |\n'
+    return '| ' + ' | '.join([escape_cell(cell) for cell in cells]) + ' |\n'
+
+
+class MarkdownTableWriter:
+    """
+    Chunked writer around an open text file.
+
+    Text is accumulated until `buffer_size` characters are pending, then
+    written in a single call. Use as a context manager (or call flush())
+    so the final partial chunk is not lost.
+    """
+
+    def __init__(self, f, buffer_size=DEFAULT_BUFFER_SIZE):
+        self._f = f
+        self._buffer_size = buffer_size
+        self._chunks = []
+        self._pending = 0
+        self.rows_written = 0
+
+    def write(self, text):
+        self._chunks.append(text)
+        self._pending += len(text)
+        if self._pending >= self._buffer_size:
+            self.flush()
+
+    def write_row(self, cells):
+        self.write(format_row(cells))
+        self.rows_written += 1
+
+    def write_rows(self, rows, max_rows=None):
+        """Write rows from any iterable, stopping after `max_rows` if given"""
+        for row in rows:
+            if max_rows is not None and self.rows_written >= max_rows:
+                break
+            self.write_row(row)
+        return self.rows_written
+
+    def flush(self):
+        if self._chunks:
+            self._f.write(''.join(self._chunks))
+            self._chunks = []
+            self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+
+def render_markdown(output_file, header, rows, footer, max_rows=None,
+                    buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Stream header, table rows and footer into `output_file`.
+
+    `rows` is consumed lazily. With `max_rows` set only the first rows are
+    written (preview mode). Returns the number of table rows written.
+    """
+    with open(output_file, 'w', encoding='utf-8') as f:
+        with MarkdownTableWriter(f, buffer_size) as writer:
+            writer.write(header)
+            writer.write_rows(rows, max_rows)
+            writer.write(footer)
+    return writer.rows_written
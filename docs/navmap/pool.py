@@ -0,0 +1,38 @@
+"""
+Process pools for the generators that fan work out to several CPUs
+
+navmap.export, navmap.locales and navmap.sheets all hand the loaded rows
+to a ProcessPoolExecutor. They share one way of sizing it and of starting
+it: the fork start method where the platform has it, so workers inherit
+the rows a generator parks in a module-level variable before starting
+the pool instead of having them pickled once per task.
+"""
+
+import os
+
+
+def available_cpus():
+    """CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def spare_cpus():
+    """CPUs left for workers when this process keeps one for itself"""
+    return available_cpus() - 1
+
+
+def process_pool(workers):
+    """
+    (ProcessPoolExecutor with `workers` processes, forked): `forked` is True
+    when the workers inherit this process's memory, so tasks may leave out
+    the data the parent set aside for them.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context), context.get_start_method() == 'fork'
@@ -0,0 +1,199 @@
+"""
+Route prefetch manifest for the Vite SPA
+
+For every route in the navigation graph, lists the routes users are most
+likely to open next, with the page module that renders each of them, so
+the SPA can warm those chunks while the current page is idle.
+
+Likelihood comes from the map itself: an edge's score is the number of
+field rows plus the number of distinct screen sections that link to the
+target, and each route keeps its top targets as a share of its total.
+App-shell (sidebar) links are left out, since they apply to every page
+equally and say nothing about the next hop.
+
+Map routes ('/customers/detail') are resolved against the <Route> tree in
+src/App.jsx ('/advisor/customers/detail'), following <Navigate>
+redirects, and the element's import gives the module. Module keys are
+written as '/src/admin/pages/CustomerDetail.jsx', the form Vite uses for
+import.meta.glob('/src/admin/pages/*.jsx') keys, so the app can do:
+
+    const pages = import.meta.glob('/src/admin/pages/*.jsx');
+    manifest.routes[path]?.prefetch.forEach(({ module }) => pages[module]?.());
+
+Usage: python -m navmap.prefetch [-o FILE] [--top N]
+"""
+
+import argparse
+import os
+import sys
+
+from navmap.extract import DEFAULT_SRC, parse_imports, parse_routes, resolve_import
+from navmap.graph import BACK, NAVIGATE_FROM, NAVIGATE_TO, SCREEN, normalize_route, split_cell
+
+DEFAULT_OUTPUT = 'advisorhub-prefetch-manifest.json'
+
+# Targets kept per route, and the smallest share worth a prefetch
+DEFAULT_TOP = 3
+MIN_SHARE = 0.1
+
+MANIFEST_VERSION = 1
+
+# Portal the map's routes live under in App.jsx, and its index route
+APP_PREFIX = '/advisor'
+HOME_ROUTE = '/'
+
+
+def edge_scores(rows):
+    """
+    {(screen, target): [fields, sections]} for every in-app link in the map.
+
+    A row links each of its Navigate From routes to its screen, and its
+    screen to each Navigate To route ((back) resolves to the row's Navigate
+    From routes); markers and shell links add nothing.
+    """
+    fields = {}
+    sections = {}
+    for row in rows:
+        screen = normalize_route(row[SCREEN])
+        if screen is None:
+            continue
+        origins = [route for route in map(normalize_route, split_cell(row[NAVIGATE_FROM])) if route]
+        targets = set()
+        for entry in split_cell(row[NAVIGATE_TO]):
+            if entry == BACK:
+                targets.update(origins)
+            else:
+                route = normalize_route(entry)
+                if route:
+                    targets.add(route)
+        targets.discard(screen)
+        links = [(screen, target) for target in targets]
+        links += [(origin, screen) for origin in set(origins) if origin != screen]
+        for key in links:
+            fields[key] = fields.get(key, 0) + 1
+            sections.setdefault(key, set()).add(row[3])
+    return {key: [count, len(sections[key])] for key, count in fields.items()}
+
+
+class RouteResolver:
+    """Maps map routes to App.jsx paths and page modules"""
+
+    def __init__(self, src_root=DEFAULT_SRC):
+        app = os.path.join(src_root, 'App.jsx')
+        with open(app, encoding='utf-8') as f:
+            source = f.read()
+        self.src_root = src_root
+        self.routes = {}
+        self.redirects = {}
+        for route in parse_routes(source):
+            if route.redirect:
+                self.redirects.setdefault(route.path, route.redirect)
+            elif route.component:
+                self.routes[route.path] = route.component
+        self.imports = {}
+        for name, spec in parse_imports(source):
+            if name:
+                path = resolve_import(src_root, app, spec)
+                if path:
+                    self.imports[name] = path
+
+    def app_path(self, route):
+        """App.jsx path rendering a map route, or None"""
+        candidates = [route, APP_PREFIX + route] if route != HOME_ROUTE else [f"{APP_PREFIX}/home", route]
+        for path in candidates:
+            seen = set()
+            while path in self.redirects and path not in seen:
+                seen.add(path)
+                path = self.redirects[path]
+            if path in self.routes:
+                return path
+        return None
+
+    def module(self, app_path):
+        """Vite glob key of the page module for an App.jsx path"""
+        path = self.imports.get(self.routes.get(app_path))
+        if not path:
+            return None
+        rel = os.path.relpath(path, os.path.dirname(self.src_root)).replace(os.sep, '/')
+        return '/' + rel
+
+
+def build_manifest(dataset, resolver, top=DEFAULT_TOP, min_share=MIN_SHARE):
+    rows = [row for section in dataset.sections for row in section.rows]
+    scores = edge_scores(rows)
+    outgoing = {}
+    for (screen, target), (fields, sections) in scores.items():
+        outgoing.setdefault(screen, []).append((fields + sections, fields, sections, target))
+
+    routes = {}
+    unresolved = set()
+    for screen, edges in outgoing.items():
+        source = resolver.app_path(screen)
+        if source is None:
+            unresolved.add(screen)
+            continue
+        total = sum(edge[0] for edge in edges)
+        prefetch = []
+        for score, fields, sections, target in sorted(edges, key=lambda edge: (-edge[0], edge[3])):
+            app_path = resolver.app_path(target)
+            module = resolver.module(app_path) if app_path else None
+            if module is None:
+                unresolved.add(target)
+                continue
+            share = score / total
+            if share < min_share or len(prefetch) >= top:
+                continue
+            prefetch.append({
+                'route': app_path,
+                'module': module,
+                'weight': round(share, 3),
+                'fields': fields,
+                'sections': sections,
+            })
+        if prefetch:
+            routes[source] = {'module': resolver.module(source), 'prefetch': prefetch}
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': dataset.digest,
+        'routes': dict(sorted(routes.items())),
+    }
+    return manifest, sorted(unresolved)
+
+
+def write_manifest(output_file, manifest):
+    """Write the manifest as JSON; returns False if the file already had this content"""
+    import json
+
+    text = json.dumps(manifest, indent=2, ensure_ascii=False) + '\n'
+    try:
+        with open(output_file, encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    tmp = f"{output_file}.tmp{os.getpid()}"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp, output_file)
+    return True
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Generate the SPA route prefetch manifest from the navigation map")
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help=f"output file (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, help="targets kept per route")
+    parser.add_argument("--src", default=DEFAULT_SRC, help="source root holding App.jsx")
+    args = parser.parse_args(argv)
+
+    manifest, unresolved = build_manifest(load_dataset(), RouteResolver(args.src), top=args.top)
+    changed = write_manifest(args.output, manifest)
+    print(f"{'Wrote' if changed else 'Up to date:'} {args.output} ({len(manifest['routes'])} routes)")
+    if unresolved:
+        print(f"Not in App.jsx: {', '.join(unresolved)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,395 @@
+"""
+Query-pattern index advisor
+
+Many map rows spell out the query a screen runs, either in the Supabase
+Column Name cell ("COUNT(*) WHERE completed=false", "ORDER BY
+published_date DESC", "SUM(premium_amount) WHERE status='Active'") or in
+the notes ("Count of policies with status = 'Active'"). List filters
+("Status Filter" on leads.status, "Date Range Filter" on
+tasks.date) are queries too: an equality or range predicate on their
+column.
+
+parse_patterns() turns those rows into QueryPattern records (table,
+equality / range predicates, sort keys, aggregate). check() crosses them
+with the indexes in the schema catalog (navmap.schema) and flags the
+patterns no index can serve; candidates() proposes CREATE INDEX statements
+for those and render_migration() formats them as a migration file.
+
+Usage: python -m navmap.queries [--all] [--migration FILE]
+"""
+
+import argparse
+import re
+import sys
+from collections import namedtuple
+
+from navmap.schema import EXTERNAL_SCHEMAS
+
+# One query found in the map. eq: ((column, value), ...) where value is the
+# SQL literal or '' for "some value chosen in the UI"; ranges: (column, ...);
+# order: ((column, descending), ...); group: (column, ...)
+QueryPattern = namedtuple(
+    'QueryPattern', ['screen', 'section', 'field', 'table', 'eq', 'ranges', 'order', 'group', 'aggregate', 'text'])
+
+Candidate = namedtuple('Candidate', ['name', 'table', 'keys', 'where', 'patterns'])
+
+Finding = namedtuple('Finding', ['pattern', 'status', 'index'])
+
+# Finding.status values
+SUPPORTED = 'supported'
+UNINDEXED = 'unindexed'
+NO_TABLE = 'no_table'
+NO_PREDICATE = 'no_predicate'
+
+_IDENT = r'[a-z_][a-z0-9_]*'
+_LITERAL = r"(?:'[^']*'|true|false|null|-?\d+(?:\.\d+)?)"
+_AGGREGATE_RE = re.compile(r'\b(count|sum|avg|min|max)\s*\(\s*(\*|(?:' + _IDENT + r'\.)?' + _IDENT + r')\s*\)', re.I)
+_WHERE_RE = re.compile(r'\bwhere\s+(.*?)(?=\s+(?:order|group)\s+by\b|$)', re.I)
+_ORDER_RE = re.compile(r'\border\s+by\s+(.*?)(?=\s+(?:group\s+by|limit)\b|$)', re.I)
+_GROUP_RE = re.compile(r'\bgroup\s+by\s+(.*?)(?=\s+(?:order\s+by|limit)\b|$)', re.I)
+_CONDITION_RE = re.compile(r'^(?:(' + _IDENT + r')\.)?(' + _IDENT + r')\s*(=|!=|<>|<=|>=|<|>|\bis\s+not\b|\bis\b)\s*(' + _LITERAL + r')$', re.I)
+# "Count of policies with status = 'Active'"
+_PROSE_COUNT_RE = re.compile(
+    r'\bcount\s+of\s+(' + _IDENT + r')\s+(?:with|where)\s+(' + _IDENT + r')\s*(=|!=|<>)\s*(' + _LITERAL + r')', re.I)
+
+
+def _split_and(text):
+    return [part.strip() for part in re.split(r'\s+and\s+', text, flags=re.I) if part.strip()]
+
+
+def _conditions(text):
+    """(eq, ranges) from a WHERE clause; unparseable conjuncts are skipped"""
+    eq = []
+    ranges = []
+    for part in _split_and(text):
+        match = _CONDITION_RE.match(part)
+        if not match:
+            continue
+        _, column, op, value = match.groups()
+        op = ' '.join(op.lower().split())
+        column = column.lower()
+        if op == '=':
+            eq.append((column, value.lower() if value[0] != "'" else value))
+        elif op in ('is', 'is not'):
+            eq.append((column, f"{op} {value.lower()}"))
+        else:
+            # != / <> and inequalities can only use an index as a range scan
+            ranges.append(column)
+    return eq, ranges
+
+
+def _order_keys(text):
+    keys = []
+    for part in text.split(','):
+        match = re.match(r'^\s*(?:' + _IDENT + r'\.)?(' + _IDENT + r')(?:\s+(asc|desc))?', part.strip(), re.I)
+        if match:
+            keys.append((match.group(1).lower(), (match.group(2) or '').lower() == 'desc'))
+    return tuple(keys)
+
+
+def _plain_table(table):
+    if not re.match(r'^' + _IDENT + r'$', table) or table.startswith(EXTERNAL_SCHEMAS):
+        return ''
+    return table
+
+
+def parse_row(row, catalog=None):
+    """QueryPattern for one map row, or None if the row does not describe a query"""
+    screen, section, field, table, column = row[0], row[3], row[4], row[6], row[7]
+    notes = f"{row[5]} {row[10]}"
+    table = _plain_table(table)
+    eq, ranges, order, group = [], [], (), ()
+    aggregate = ''
+    text = ''
+
+    if re.search(r'\b(?:where|order\s+by|group\s+by)\b|\b(?:count|sum|avg|min|max)\s*\(', column, re.I):
+        text = column
+        aggregate_match = _AGGREGATE_RE.search(column)
+        if aggregate_match:
+            aggregate = f"{aggregate_match.group(1).upper()}({aggregate_match.group(2)})"
+            qualified = aggregate_match.group(2).split('.')
+            if len(qualified) == 2 and not table:
+                table = qualified[0]
+        where = _WHERE_RE.search(column)
+        if where:
+            eq, ranges = _conditions(where.group(1))
+        order_match = _ORDER_RE.search(column)
+        if order_match:
+            order = _order_keys(order_match.group(1))
+        group_match = _GROUP_RE.search(column)
+        if group_match:
+            group = tuple(name for name, _ in _order_keys(group_match.group(1)))
+    else:
+        prose = _PROSE_COUNT_RE.search(notes)
+        if prose:
+            table, column_name, op, value = prose.groups()
+            text = prose.group(0)
+            aggregate = 'COUNT(*)'
+            eq, ranges = _conditions(f"{column_name} {op} {value}")
+        elif field.endswith('Filter') and table and re.match(r'^' + _IDENT + r'$', column):
+            text = f"{field} on {table}.{column}"
+            if 'date range' in field.lower() or 'date range' in notes.lower():
+                ranges = [column]
+            else:
+                eq = [(column, '')]
+        else:
+            return None
+
+    if not table and catalog is not None:
+        # "SUM(premium_amount) WHERE status='Active'" names no table; use the
+        # only table that has all the referenced columns, if there is one
+        referenced = {name for name, _ in eq} | set(ranges) | {name for name, _ in order}
+        if _aggregate_column(aggregate):
+            referenced.add(_aggregate_column(aggregate))
+        tables = [t for t, columns in catalog.tables.items() if referenced and referenced <= columns.keys()]
+        if len(tables) == 1:
+            table = tables[0]
+
+    return QueryPattern(screen, section, field, table, tuple(eq), tuple(ranges), order, group, aggregate, text)
+
+
+def _aggregate_column(aggregate):
+    """Column inside an aggregate such as 'SUM(policies.sum_assured)', or ''"""
+    match = re.match(r'^\w+\((?:' + _IDENT + r'\.)?(' + _IDENT + r')\)$', aggregate)
+    return match.group(1) if match else ''
+
+
+def parse_patterns(dataset, catalog=None):
+    patterns = []
+    for section in dataset.sections:
+        for row in section.rows:
+            pattern = parse_row(row, catalog)
+            if pattern is not None:
+                patterns.append(pattern)
+    return patterns
+
+
+def _implied(conjunct, pattern):
+    """True if an index's partial predicate conjunct holds for every row the pattern reads"""
+    conjunct = ' '.join(conjunct.split())
+    match = re.match(r'^\(?(' + _IDENT + r')\s+is\s+not\s+null\)?$', conjunct, re.I)
+    if match:
+        column = match.group(1).lower()
+        # equality with a value, or a range scan, never matches NULL
+        return any(c == column and v != 'is null' for c, v in pattern.eq) or column in pattern.ranges
+    eq, _ = _conditions(conjunct)
+    return bool(eq) and all(pair in pattern.eq for pair in eq)
+
+
+def _usable_prefix(index, pattern):
+    """
+    How much of the pattern an index serves: (equality columns matched,
+    range/sort served, equality columns wanted) or None if the index
+    cannot be used at all.
+    """
+    if index.method != 'btree':
+        return None
+    if index.where and not all(_implied(c, pattern) for c in _split_and(index.where)):
+        return None
+    fixed_by_index = set()
+    if index.where:
+        fixed_by_index = {column for column, _ in _conditions(index.where)[0]}
+    wanted_eq = {column for column, _ in pattern.eq} - fixed_by_index
+    keys = [key.expr for key in index.keys]
+    position = 0
+    matched = 0
+    while position < len(keys) and keys[position] in wanted_eq:
+        matched += 1
+        position += 1
+    tail = keys[position] if position < len(keys) else None
+    served_tail = bool(tail) and (tail in pattern.ranges or (pattern.order and tail == pattern.order[0][0]))
+    if matched == 0 and not served_tail and not (fixed_by_index and not wanted_eq and not pattern.ranges and not pattern.order):
+        return None
+    return matched, served_tail, len(wanted_eq)
+
+
+def supporting_index(catalog, pattern):
+    """Best index for a pattern, or None. An index supports it when it covers
+    every equality column and, if there is one, the range / leading sort key."""
+    best = None
+    best_score = None
+    for index in catalog.indexes_on(pattern.table):
+        usage = _usable_prefix(index, pattern)
+        if usage is None:
+            continue
+        matched, served_tail, wanted = usage
+        needs_tail = bool(pattern.ranges or pattern.order)
+        if matched < wanted or (needs_tail and not served_tail and wanted == 0):
+            continue
+        score = (matched, served_tail, -len(index.keys))
+        if best_score is None or score > best_score:
+            best, best_score = index, score
+    return best
+
+
+def check(catalog, patterns):
+    findings = []
+    for pattern in patterns:
+        if not (pattern.eq or pattern.ranges or pattern.order):
+            # A bare COUNT(*) or GROUP BY reads the whole (advisor's) table anyway
+            findings.append(Finding(pattern, NO_PREDICATE, None))
+        elif not pattern.table or not catalog.has_table(pattern.table):
+            findings.append(Finding(pattern, NO_TABLE, None))
+        else:
+            index = supporting_index(catalog, pattern)
+            findings.append(Finding(pattern, SUPPORTED if index else UNINDEXED, index))
+    return findings
+
+
+def candidate_for(pattern):
+    """Candidate index for an unindexed pattern: equality columns, then the range / sort column"""
+    keys = []
+    where = []
+    for column, value in pattern.eq:
+        if value in ('true', 'false'):
+            # Low-cardinality flag with a constant: a partial index is smaller and exact
+            where.append(f"{column} = {value}")
+        elif column not in [k for k, _ in keys]:
+            keys.append((column, False))
+    if pattern.ranges:
+        keys.append((pattern.ranges[0], False))
+    elif pattern.order:
+        keys.append(pattern.order[0])
+    if not keys:
+        keys = [(column, False) for column, _ in pattern.eq]
+    name = [column for column, _ in keys]
+    for condition in where:
+        column, value = condition.split(' = ')
+        name += [value] if column in name else [column, value]
+    return Candidate(f"idx_{pattern.table}_{'_'.join(name)}", pattern.table, tuple(keys), ' AND '.join(where), (pattern,))
+
+
+def candidates(findings):
+    """Deduplicated candidate indexes for the findings with status 'unindexed' or 'no_table'"""
+    merged = {}
+    for finding in findings:
+        if finding.status not in (UNINDEXED, NO_TABLE) or not finding.pattern.table:
+            continue
+        candidate = candidate_for(finding.pattern)
+        key = (candidate.table, candidate.keys, candidate.where)
+        if key in merged:
+            merged[key] = merged[key]._replace(patterns=merged[key].patterns + candidate.patterns)
+        else:
+            merged[key] = candidate
+    # Drop a candidate another one already serves: same leading keys and the
+    # same partial predicate, or no partial predicate at all. Its patterns
+    # move to the candidate that serves it, following the chain to one that
+    # nothing serves (each step adds keys or drops the predicate, so it ends)
+    servers = {}
+    for key in merged:
+        table, keys, where = key
+        servers[key] = next((other for other in merged if other != key and other[0] == table
+                             and other[2] in (where, '') and other[1][:len(keys)] == keys
+                             and (len(other[1]) > len(keys) or other[2] != where)), None)
+    for key, candidate in merged.items():
+        root = key
+        while servers[root] is not None:
+            root = servers[root]
+        if root != key:
+            merged[root] = merged[root]._replace(patterns=merged[root].patterns + candidate.patterns)
+    return [candidate for key, candidate in merged.items() if servers[key] is None]
+
+
+def _index_sql(candidate):
+    keys = ', '.join(f"{column} DESC" if descending else column for column, descending in candidate.keys)
+    sql = f"CREATE INDEX IF NOT EXISTS {candidate.name}\nON {candidate.table}({keys})"
+    if candidate.where:
+        sql += f"\nWHERE {candidate.where}"
+    return sql + ';'
+
+
+def render_migration(candidate_list, catalog, created=''):
+    """Candidate migration in the style of supabase/migrations"""
+    lines = [
+        "-- Candidate indexes for unindexed screen queries",
+        f"-- Created: {created}" if created else "-- Created: (generated)",
+        "-- Purpose: Support the WHERE / ORDER BY patterns documented in the navigation map",
+        "-- Generated by: python -m navmap.queries --migration <file>; review before applying",
+    ]
+    by_table = {}
+    for candidate in candidate_list:
+        by_table.setdefault(candidate.table, []).append(candidate)
+    for table, items in by_table.items():
+        lines += [
+            "",
+            "-- " + "=" * 76,
+            f"-- {table.upper()} TABLE INDEXES",
+            "-- " + "=" * 76,
+        ]
+        for candidate in items:
+            screens = sorted({f"{p.screen} › {p.field}" for p in candidate.patterns})
+            lines.append("")
+            lines.append(f"-- Used by: {'; '.join(screens)}")
+            if catalog.has_table(table):
+                lines.append(_index_sql(candidate))
+            else:
+                lines.append(f"-- Table {table} is not created by any migration yet; enable once it exists:")
+                lines += ['-- ' + line for line in _index_sql(candidate).split('\n')]
+    return '\n'.join(lines) + '\n'
+
+
+def _describe(pattern):
+    parts = []
+    if pattern.aggregate:
+        parts.append(pattern.aggregate)
+    if pattern.eq:
+        parts.append('WHERE ' + ' AND '.join(f"{c} = {v or '?'}" if not v.startswith('is') else f"{c} {v}"
+                                             for c, v in pattern.eq))
+    if pattern.ranges:
+        parts.append('RANGE ' + ', '.join(pattern.ranges))
+    if pattern.order:
+        parts.append('ORDER BY ' + ', '.join(f"{c} DESC" if d else c for c, d in pattern.order))
+    if pattern.group:
+        parts.append('GROUP BY ' + ', '.join(pattern.group))
+    return f"{pattern.table or '?'}: {' '.join(parts)}"
+
+
+def format_report(findings, show_all=False):
+    lines = []
+    counts = {}
+    for finding in findings:
+        counts[finding.status] = counts.get(finding.status, 0) + 1
+    lines.append(f"{len(findings)} query patterns: " + ', '.join(f"{n} {status}" for status, n in sorted(counts.items())))
+    for status, title in ((UNINDEXED, 'No supporting index'), (NO_TABLE, 'Table not in migrations'),
+                          (SUPPORTED, 'Supported'), (NO_PREDICATE, 'Full-table aggregates')):
+        items = [f for f in findings if f.status == status]
+        if not items or (not show_all and status in (SUPPORTED, NO_PREDICATE)):
+            continue
+        lines.append('')
+        lines.append(f"{title}:")
+        for finding in items:
+            via = f"  [{finding.index.name}]" if finding.index else ''
+            lines.append(f"  {finding.pattern.screen} › {finding.pattern.field}: {_describe(finding.pattern)}{via}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+    from navmap.schema import build_catalog
+
+    parser = argparse.ArgumentParser(description="Report map query patterns that no index supports")
+    parser.add_argument("--all", action="store_true", help="also list supported and full-table patterns")
+    parser.add_argument("--migration", metavar="FILE", help="write the candidate indexes as a migration file")
+    args = parser.parse_args(argv)
+
+    catalog = build_catalog()
+    findings = check(catalog, parse_patterns(load_dataset(), catalog))
+    print(format_report(findings, show_all=args.all))
+
+    candidate_list = candidates(findings)
+    if candidate_list:
+        from datetime import date
+
+        migration = render_migration(candidate_list, catalog, date.today().isoformat())
+        if args.migration:
+            with open(args.migration, 'w', encoding='utf-8') as f:
+                f.write(migration)
+            print(f"\n{len(candidate_list)} candidate indexes written to {args.migration}")
+        else:
+            print('\nCandidate migration:\n')
+            print(migration)
+    return 1 if any(f.status == UNINDEXED for f in findings) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Dictionary-encoded columnar storage for navigation map rows
+
+Cell values repeat heavily ("—", "/customers/detail", "Sidebar", "N",
+"policies", ...), so each column keeps a dictionary of distinct strings and
+an array of small integer codes into it. Codes live in stdlib arrays that
+start as one byte per cell and widen only when a column's dictionary
+outgrows the current width. Rows are exposed through RowView, a `__slots__`
+object that decodes cells on access.
+
+Filters compare codes rather than strings. When NumPy is installed they run
+as vectorized comparisons over zero-copy views of the code arrays;
+otherwise they fall back to a single C-level pass via itertools.compress.
+"""
+
+from array import array
+from itertools import compress
+
+from navmap.dataset import Section, section_label
+
+# Short attribute names for the 11 map columns, in column order
+FIELDS = (
+    'screen',
+    'navigate_from',
+    'navigate_to',
+    'section',
+    'field',
+    'description',
+    'table',
+    'column',
+    'data_type',
+    'editable',
+    'notes',
+)
+
+# array typecode -> (max distinct values, NumPy dtype name)
+_WIDTHS = (('B', 1 << 8, 'uint8'), ('H', 1 << 16, 'uint16'), ('I', 1 << 32, 'uint32'))
+_DTYPES = {typecode: dtype for typecode, _, dtype in _WIDTHS}
+
+
+def optional_numpy():
+    """The numpy module, or None when it is not installed (every caller has a pure-Python path)"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class RowView:
+    """Read-only view of one stored row; cells are decoded on access"""
+
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __len__(self):
+        return len(self._store.columns)
+
+    def __getitem__(self, col):
+        if isinstance(col, slice):
+            return self.as_tuple()[col]
+        store = self._store
+        return store._values[col][store._codes[col][self._index]]
+
+    def __iter__(self):
+        index = self._index
+        for values, codes in zip(self._store._values, self._store._codes):
+            yield values[codes[index]]
+
+    def __eq__(self, other):
+        if isinstance(other, RowView):
+            other = other.as_tuple()
+        try:
+            return self.as_tuple() == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"RowView({self.as_tuple()!r})"
+
+    @property
+    def module(self):
+        """(title, icon) of the module section this row belongs to"""
+        store = self._store
+        return store.sections[store._section_codes[self._index]]
+
+    def as_tuple(self):
+        return tuple(self)
+
+    def as_dict(self):
+        return dict(zip(FIELDS, self))
+
+
+def _field_property(col):
+    return property(lambda view: view[col], doc=f"Value of the {FIELDS[col]!r} column")
+
+
+for _col, _name in enumerate(FIELDS):
+    setattr(RowView, _name, _field_property(_col))
+del _col, _name
+
+
+class RowStore:
+    """
+    Columnar store of map rows grouped into module sections.
+
+    Append rows with append()/extend() (or build one with from_dataset()),
+    then iterate RowViews, decode whole columns with column(), or filter
+    with indices()/select(), e.g. store.select(table='policies', editable='Y').
+    """
+
+    __slots__ = ('columns', 'sections', '_values', '_lookup', '_codes',
+                 '_section_codes', '_section_lookup')
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.sections = []
+        self._values = [[] for _ in self.columns]
+        self._lookup = [{} for _ in self.columns]
+        self._codes = [array('B') for _ in self.columns]
+        self._section_codes = array('B')
+        self._section_lookup = {}
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        store = cls(dataset.columns)
+        for section in dataset.sections:
+            store.extend(section.rows, section=(section.title, section.icon))
+        return store
+
+    def __len__(self):
+        return len(self._section_codes)
+
+    def __getitem__(self, index):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('row index out of range')
+        return RowView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield RowView(self, index)
+
+    # -- building -----------------------------------------------------------
+
+    @staticmethod
+    def _widen(codes, size):
+        for typecode, limit, _ in _WIDTHS:
+            if size <= limit:
+                if typecode == codes.typecode:
+                    return codes
+                return array(typecode, codes)
+        raise OverflowError('too many distinct values in one column')
+
+    def _encode_section(self, section):
+        code = self._section_lookup.get(section)
+        if code is None:
+            code = len(self.sections)
+            self._section_lookup[section] = code
+            self.sections.append(section)
+            self._section_codes = self._widen(self._section_codes, len(self.sections))
+        return code
+
+    def append(self, row, section=('', '')):
+        if len(row) != len(self.columns):
+            raise ValueError(f"expected {len(self.columns)} cells, got {len(row)}: {row!r}")
+        # Encode first: a new section can widen (replace) the code array
+        code = self._encode_section(tuple(section))
+        self._section_codes.append(code)
+        for col, value in enumerate(row):
+            lookup = self._lookup[col]
+            code = lookup.get(value)
+            if code is None:
+                values = self._values[col]
+                code = len(values)
+                lookup[value] = code
+                values.append(value)
+                self._codes[col] = self._widen(self._codes[col], len(values))
+            self._codes[col].append(code)
+
+    def extend(self, rows, section=('', '')):
+        for row in rows:
+            self.append(row, section)
+
+    # -- reading ------------------------------------------------------------
+
+    def _col(self, field):
+        if isinstance(field, int):
+            return field
+        try:
+            return FIELDS.index(field)
+        except ValueError:
+            return self.columns.index(field)
+
+    def column(self, field):
+        """Decoded values of one column, in row order"""
+        col = self._col(field)
+        values = self._values[col]
+        return [values[code] for code in self._codes[col]]
+
+    def distinct(self, field):
+        """Distinct values of one column, in first-seen order"""
+        return list(self._values[self._col(field)])
+
+    def codes(self, field):
+        """Raw code array of one column (a NumPy view when NumPy is available)"""
+        codes = self._codes[self._col(field)]
+        np = optional_numpy()
+        if np is None:
+            return codes
+        return np.frombuffer(codes, dtype=_DTYPES[codes.typecode]) if len(codes) else np.zeros(0, dtype='uint8')
+
+    def iter_rows(self, section_marker=None):
+        """
+        Yield row tuples in order with a section header row before each
+        section, the same shape as Dataset.iter_rows().
+        """
+        blanks = ('',) * (len(self.columns) - 1)
+        current = None
+        values = self._values
+        codes = self._codes
+        section_codes = self._section_codes
+        for index in range(len(self)):
+            code = section_codes[index]
+            if code != current:
+                current = code
+                section = Section(*self.sections[code], rows=None)
+                yield (section_marker(section) if section_marker else section_label(section),) + blanks
+            yield tuple([vals[cs[index]] for vals, cs in zip(values, codes)])
+
+    # -- filtering ----------------------------------------------------------
+
+    def _wanted_codes(self, col, value):
+        lookup = self._lookup[col]
+        if isinstance(value, str):
+            code = lookup.get(value)
+            return [] if code is None else [code]
+        return [lookup[v] for v in value if v in lookup]
+
+    def mask(self, **criteria):
+        """
+        Boolean mask of rows matching every criterion.
+
+        Criteria are keyword arguments keyed by FIELDS name; each value is a
+        string or a collection of strings (matched as "any of"). Returns a
+        NumPy bool array when NumPy is installed, otherwise a list of bools.
+        """
+        np = optional_numpy()
+        size = len(self)
+        result = None
+        for field, value in criteria.items():
+            col = self._col(field)
+            wanted = self._wanted_codes(col, value)
+            if np is not None:
+                codes = self.codes(col)
+                if not wanted:
+                    part = np.zeros(size, dtype=bool)
+                elif len(wanted) == 1:
+                    part = codes == wanted[0]
+                else:
+                    part = np.isin(codes, wanted)
+                result = part if result is None else result & part
+            else:
+                wanted = frozenset(wanted)
+                part = list(map(wanted.__contains__, self._codes[col]))
+                result = part if result is None else list(map(bool.__and__, result, part))
+        if result is None:
+            return np.ones(size, dtype=bool) if np is not None else [True] * size
+        return result
+
+    def indices(self, **criteria):
+        """Row indices matching every criterion (see mask())"""
+        mask = self.mask(**criteria)
+        np = optional_numpy()
+        if np is not None:
+            return np.flatnonzero(mask)
+        return list(compress(range(len(self)), mask))
+
+    def select(self, **criteria):
+        """New RowStore holding only the rows matching every criterion"""
+        return self.take(self.indices(**criteria))
+
+    def take(self, indices):
+        """New RowStore holding the given rows, in the given order"""
+        subset = RowStore(self.columns)
+        subset.sections = list(self.sections)
+        subset._section_lookup = dict(self._section_lookup)
+        subset._values = [list(values) for values in self._values]
+        subset._lookup = [dict(lookup) for lookup in self._lookup]
+        subset._codes = [_take(codes, indices) for codes in self._codes]
+        subset._section_codes = _take(self._section_codes, indices)
+        return subset
+
+
+def _take(codes, indices):
+    np = optional_numpy()
+    if np is None or not len(codes):
+        return array(codes.typecode, [codes[i] for i in indices])
+    view = np.frombuffer(codes, dtype=_DTYPES[codes.typecode])
+    picked = array(codes.typecode)
+    picked.frombytes(view[np.asarray(indices, dtype=np.intp)].tobytes())
+    return picked
@@ -0,0 +1,554 @@
+"""
+Supabase schema index built from the SQL migrations
+
+Replays docs/supabase-schema.sql (the base schema) and then every file in
+supabase/migrations in filename order, tracking CREATE TABLE, ALTER TABLE
+(ADD / DROP / RENAME / ALTER COLUMN ... TYPE), DROP TABLE and
+CREATE / DROP INDEX into an in-memory Catalog of tables, columns, types
+and indexes.
+
+Each file is reduced to a list of schema operations and those are cached
+in navmap/.cache by content hash, so adding a migration only costs parsing
+that one file; replaying the cached operations is a few dict updates.
+
+The catalog answers "does users.advisor_id_expiry exist and what type is
+it" with a hash lookup, which apply_schema() uses to verify or fill the
+Supabase Table, Supabase Column Name and Data Type cells of the map.
+
+Usage: python -m navmap.schema [--verify | --fill] [--tables]
+"""
+
+import argparse
+import hashlib
+import marshal
+import os
+import re
+import sys
+from collections import namedtuple
+
+from navmap.dataset import CACHE_DIR, Dataset, Section
+from navmap.extract import REPO_ROOT
+
+BASE_SCHEMA = os.path.join(REPO_ROOT, 'docs', 'supabase-schema.sql')
+MIGRATIONS_DIR = os.path.join(REPO_ROOT, 'supabase', 'migrations')
+
+# Bump when parse_sql() output changes so cached operations are discarded
+SCHEMA_CACHE_VERSION = 1
+
+# Table prefixes managed by Supabase itself, never created by our migrations
+EXTERNAL_SCHEMAS = ('auth.', 'storage.')
+
+Index = namedtuple('Index', ['name', 'table', 'keys', 'unique', 'method', 'where', 'source'])
+IndexKey = namedtuple('IndexKey', ['expr', 'descending', 'nulls'])
+Issue = namedtuple('Issue', ['row', 'kind', 'detail'])
+
+# SQL type family -> map Data Type values compatible with it
+_TYPE_FAMILIES = (
+    (('bool', 'boolean'), 'boolean', {'boolean'}),
+    (('timestamp', 'timestamptz'), 'datetime', {'datetime', 'date', 'time'}),
+    (('date',), 'date', {'date', 'datetime'}),
+    (('time', 'timetz'), 'time', {'time'}),
+    (('int', 'int2', 'int4', 'int8', 'integer', 'smallint', 'bigint', 'serial', 'serial2', 'serial4', 'serial8',
+      'smallserial', 'bigserial', 'numeric', 'decimal', 'real', 'double', 'float', 'float4', 'float8', 'money'),
+     'number', {'number'}),
+    (('json', 'jsonb'), 'object', {'object', 'array', 'list', 'mixed', 'timeseries'}),
+    (('text', 'varchar', 'character', 'char', 'bpchar', 'citext', 'uuid', 'inet', 'bytea'), 'string',
+     {'string', 'text', 'enum', 'file'}),
+)
+
+_IDENT = r'(?:"[^"]+"|[A-Za-z_][\w$]*)(?:\.(?:"[^"]+"|[A-Za-z_][\w$]*))?'
+_CREATE_TABLE_RE = re.compile(
+    r'^create\s+(?:(?:global\s+|local\s+)?(?:temp|temporary|unlogged)\s+)?table\s+(?:if\s+not\s+exists\s+)?(' + _IDENT + r')\s*\((.*)\)',
+    re.I | re.S)
+_ALTER_TABLE_RE = re.compile(r'^alter\s+table\s+(?:if\s+exists\s+)?(?:only\s+)?(' + _IDENT + r')\s+(.*)$', re.I | re.S)
+_DROP_TABLE_RE = re.compile(r'^drop\s+table\s+(?:if\s+exists\s+)?(.+?)(?:\s+(?:cascade|restrict))?$', re.I | re.S)
+_CREATE_INDEX_RE = re.compile(
+    r'^create\s+(unique\s+)?index\s+(?:concurrently\s+)?(?:if\s+not\s+exists\s+)?(' + _IDENT + r')?\s*on\s+(?:only\s+)?('
+    + _IDENT + r')\s*(?:using\s+(\w+)\s*)?\((.*)$',
+    re.I | re.S)
+_DROP_INDEX_RE = re.compile(r'^drop\s+index\s+(?:concurrently\s+)?(?:if\s+exists\s+)?(.+?)(?:\s+(?:cascade|restrict))?$', re.I | re.S)
+_TABLE_CONSTRAINT_RE = re.compile(r'^(?:constraint|primary\s+key|unique|foreign\s+key|check|exclude|like)\b', re.I)
+_COLUMN_CONSTRAINT_RE = re.compile(
+    r'\s+(?:not\s+null|null|default|primary\s+key|references|check|unique|generated|constraint|collate)\b', re.I)
+_PLAIN_COLUMN_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+
+def _name(ident):
+    """Unqualified, case-folded identifier: public."Leads" -> leads"""
+    parts = [p[1:-1] if p.startswith('"') else p.lower() for p in re.findall(r'"[^"]+"|[^.]+', ident.strip())]
+    if len(parts) > 1 and parts[0] == 'public':
+        parts = parts[1:]
+    return '.'.join(parts)
+
+
+def split_statements(sql):
+    """
+    Split SQL text into statements with comments removed.
+
+    Understands '...' strings, "..." identifiers, $tag$ ... $tag$ bodies,
+    -- line comments and /* */ block comments, so semicolons inside any of
+    those do not end a statement.
+    """
+    statements = []
+    buf = []
+    i = 0
+    n = len(sql)
+    while i < n:
+        ch = sql[i]
+        if ch == '-' and sql.startswith('--', i):
+            end = sql.find('\n', i)
+            i = n if end < 0 else end
+            continue
+        if ch == '/' and sql.startswith('/*', i):
+            end = sql.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            buf.append(' ')
+            continue
+        if ch in '\'"':
+            end = i + 1
+            while True:
+                end = sql.find(ch, end)
+                if end < 0:
+                    end = n
+                    break
+                if sql.startswith(ch * 2, end):
+                    end += 2
+                    continue
+                break
+            buf.append(sql[i:end + 1])
+            i = end + 1
+            continue
+        if ch == '$':
+            tag = re.match(r'\$[A-Za-z_]*\$', sql[i:])
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                end = n if end < 0 else end + len(tag.group(0))
+                buf.append(sql[i:end])
+                i = end
+                continue
+        if ch == ';':
+            statement = ' '.join(''.join(buf).split())
+            if statement:
+                statements.append(statement)
+            buf = []
+            i += 1
+            continue
+        buf.append(ch)
+        i += 1
+    statement = ' '.join(''.join(buf).split())
+    if statement:
+        statements.append(statement)
+    return statements
+
+
+def _split_top_level(text, sep=','):
+    """Split on `sep` outside parentheses and quotes"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in '\'"':
+            quote = ch
+        elif ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+        elif ch == sep and depth == 0:
+            parts.append(text[start:i].strip())
+            start = i + 1
+    tail = text[start:].strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def _column_def(definition):
+    """('name', 'type') from a column definition, or None for table constraints"""
+    if _TABLE_CONSTRAINT_RE.match(definition):
+        return None
+    match = re.match(r'("[^"]+"|[A-Za-z_][\w$]*)\s*(.*)$', definition, re.S)
+    if not match:
+        return None
+    rest = match.group(2)
+    constraint = _COLUMN_CONSTRAINT_RE.search(' ' + rest)
+    sql_type = (' ' + rest)[:constraint.start()] if constraint else rest
+    return _name(match.group(1)), ' '.join(sql_type.split()).lower()
+
+
+def _index_keys(body):
+    """Index key list and WHERE predicate from the text after 'on table ('"""
+    depth = 1
+    for i, ch in enumerate(body):
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                keys_text, rest = body[:i], body[i + 1:]
+                break
+    else:
+        keys_text, rest = body, ''
+    keys = []
+    for part in _split_top_level(keys_text):
+        match = re.match(r'^(.*?)(?:\s+(asc|desc))?(?:\s+nulls\s+(first|last))?$', part, re.I | re.S)
+        expr = match.group(1).strip()
+        if re.match(r'^' + _IDENT + r'$', expr):
+            expr = _name(expr)
+        keys.append((expr, (match.group(2) or '').lower() == 'desc', (match.group(3) or '').lower()))
+    where = re.search(r'\bwhere\s+(.*)$', rest, re.I | re.S)
+    return tuple(keys), where.group(1).strip() if where else ''
+
+
+def _alter_ops(table, actions):
+    ops = []
+    for action in _split_top_level(actions):
+        match = re.match(r'^add\s+(?:column\s+)?(?:if\s+not\s+exists\s+)?(.*)$', action, re.I | re.S)
+        if match and not _TABLE_CONSTRAINT_RE.match(match.group(1)):
+            column = _column_def(match.group(1))
+            if column:
+                ops.append(('add_column', table, column[0], column[1]))
+            continue
+        match = re.match(r'^drop\s+(?:column\s+)?(?:if\s+exists\s+)?("[^"]+"|[A-Za-z_][\w$]*)', action, re.I)
+        if match and not re.match(r'^drop\s+constraint\b', action, re.I):
+            ops.append(('drop_column', table, _name(match.group(1))))
+            continue
+        match = re.match(r'^rename\s+(?:column\s+)?("[^"]+"|[A-Za-z_][\w$]*)\s+to\s+("[^"]+"|[A-Za-z_][\w$]*)$', action, re.I)
+        if match and not re.match(r'^rename\s+to\b', action, re.I):
+            ops.append(('rename_column', table, _name(match.group(1)), _name(match.group(2))))
+            continue
+        match = re.match(r'^rename\s+to\s+(' + _IDENT + r')$', action, re.I)
+        if match:
+            ops.append(('rename_table', table, _name(match.group(1))))
+            continue
+        match = re.match(r'^alter\s+(?:column\s+)?("[^"]+"|[A-Za-z_][\w$]*)\s+(?:set\s+data\s+)?type\s+(.*?)(?:\s+using\s+.*)?$',
+                         action, re.I | re.S)
+        if match:
+            ops.append(('alter_type', table, _name(match.group(1)), ' '.join(match.group(2).split()).lower()))
+    return ops
+
+
+def parse_sql(sql):
+    """Reduce SQL text to a tuple of schema operations (see Catalog.apply)"""
+    ops = []
+    for statement in split_statements(sql):
+        match = _CREATE_TABLE_RE.match(statement)
+        if match:
+            columns = tuple(filter(None, map(_column_def, _split_top_level(match.group(2)))))
+            ops.append(('create_table', _name(match.group(1)), columns))
+            continue
+        match = _ALTER_TABLE_RE.match(statement)
+        if match:
+            ops.extend(_alter_ops(_name(match.group(1)), match.group(2)))
+            continue
+        match = _CREATE_INDEX_RE.match(statement)
+        if match:
+            unique, name, table, method, body = match.groups()
+            keys, where = _index_keys(body)
+            ops.append(('create_index', _name(name) if name else '', _name(table), bool(unique),
+                        (method or 'btree').lower(), keys, where))
+            continue
+        match = _DROP_TABLE_RE.match(statement)
+        if match:
+            for table in _split_top_level(match.group(1)):
+                ops.append(('drop_table', _name(table)))
+            continue
+        match = _DROP_INDEX_RE.match(statement)
+        if match:
+            for name in _split_top_level(match.group(1)):
+                ops.append(('drop_index', _name(name)))
+    return tuple(ops)
+
+
+class Catalog:
+    """Tables, columns, types and indexes after replaying the migrations"""
+
+    def __init__(self):
+        # {table: {column: sql type}}, columns in declaration order
+        self.tables = {}
+        self.indexes = {}
+        self.sources = []
+        self.digest = None
+
+    def apply(self, ops, source=''):
+        tables = self.tables
+        for op in ops:
+            kind = op[0]
+            if kind == 'create_table':
+                # CREATE TABLE IF NOT EXISTS keeps an existing definition
+                if op[1] not in tables:
+                    tables[op[1]] = dict(op[2])
+            elif kind == 'add_column':
+                tables.setdefault(op[1], {}).setdefault(op[2], op[3])
+            elif kind == 'drop_column':
+                tables.get(op[1], {}).pop(op[2], None)
+            elif kind == 'rename_column':
+                columns = tables.get(op[1], {})
+                if op[2] in columns:
+                    tables[op[1]] = {op[3] if c == op[2] else c: t for c, t in columns.items()}
+            elif kind == 'alter_type':
+                if op[2] in tables.get(op[1], {}):
+                    tables[op[1]][op[2]] = op[3]
+            elif kind == 'rename_table':
+                if op[1] in tables:
+                    tables[op[2]] = tables.pop(op[1])
+                    for name, index in list(self.indexes.items()):
+                        if index.table == op[1]:
+                            self.indexes[name] = index._replace(table=op[2])
+            elif kind == 'drop_table':
+                tables.pop(op[1], None)
+                for name, index in list(self.indexes.items()):
+                    if index.table == op[1]:
+                        del self.indexes[name]
+            elif kind == 'create_index':
+                _, name, table, unique, method, keys, where = op
+                name = name or f"{table}_{'_'.join(k[0] for k in keys)}_idx"
+                if name not in self.indexes:
+                    self.indexes[name] = Index(name, table, tuple(IndexKey(*k) for k in keys),
+                                               unique, method, where, source)
+            elif kind == 'drop_index':
+                self.indexes.pop(op[1], None)
+        if source:
+            self.sources.append(source)
+
+    def has_table(self, table):
+        return table in self.tables
+
+    def column_type(self, table, column):
+        """SQL type of table.column, or None if the column is unknown"""
+        return self.tables.get(table, {}).get(column)
+
+    def indexes_on(self, table):
+        return [index for index in self.indexes.values() if index.table == table]
+
+    def tables_with_column(self, column):
+        return [table for table, columns in self.tables.items() if column in columns]
+
+    def to_payload(self):
+        return (
+            {table: tuple(columns.items()) for table, columns in self.tables.items()},
+            tuple(index[:2] + (tuple(map(tuple, index.keys)),) + index[3:] for index in self.indexes.values()),
+            tuple(self.sources),
+        )
+
+    @classmethod
+    def from_payload(cls, payload, digest=None):
+        catalog = cls()
+        tables, indexes, sources = payload
+        catalog.tables = {table: dict(columns) for table, columns in tables.items()}
+        for name, table, keys, unique, method, where, source in indexes:
+            catalog.indexes[name] = Index(name, table, tuple(IndexKey(*k) for k in keys),
+                                          unique, method, where, source)
+        catalog.sources = list(sources)
+        catalog.digest = digest
+        return catalog
+
+
+def migration_files(base_schema=BASE_SCHEMA, migrations_dir=MIGRATIONS_DIR):
+    """Schema files in replay order: the base schema, then migrations by name"""
+    files = [base_schema] if base_schema and os.path.isfile(base_schema) else []
+    if os.path.isdir(migrations_dir):
+        files += [os.path.join(migrations_dir, name) for name in sorted(os.listdir(migrations_dir))
+                  if name.endswith('.sql')]
+    return files
+
+
+def _cache_path():
+    tag = f"py{sys.version_info[0]}{sys.version_info[1]}-m{marshal.version}-v{SCHEMA_CACHE_VERSION}"
+    return os.path.join(CACHE_DIR, f"schema-{tag}.marshal")
+
+
+def build_catalog(files=None, use_cache=True):
+    """
+    Replay `files` (default: migration_files()) into a Catalog.
+
+    Per-file operations are cached by mtime/size and content hash, and the
+    finished catalog by the ordered list of file digests.
+    """
+    files = migration_files() if files is None else files
+    cache = {}
+    if use_cache:
+        try:
+            with open(_cache_path(), 'rb') as f:
+                cache = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            cache = {}
+    file_entries = cache.get('files', {})
+    dirty = False
+
+    digests = []
+    file_ops = []
+    for path in files:
+        st = os.stat(path)
+        entry = file_entries.get(path)
+        if not (entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size):
+            with open(path, 'rb') as f:
+                raw = f.read()
+            digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+            if entry and entry[2] == digest:
+                entry = (st.st_mtime_ns, st.st_size, digest, entry[3])
+            else:
+                entry = (st.st_mtime_ns, st.st_size, digest, parse_sql(raw.decode('utf-8', 'replace')))
+            file_entries[path] = entry
+            dirty = True
+        digests.append(entry[2])
+        file_ops.append((path, entry[3]))
+
+    key = hashlib.blake2b(marshal.dumps(tuple(digests)), digest_size=16).hexdigest()
+    cached_catalog = cache.get('catalog')
+    if cached_catalog and cached_catalog[0] == key:
+        catalog = Catalog.from_payload(cached_catalog[1], key)
+    else:
+        catalog = Catalog()
+        for path, ops in file_ops:
+            catalog.apply(ops, os.path.basename(path))
+        catalog.digest = key
+        cache['catalog'] = (key, catalog.to_payload())
+        dirty = True
+
+    if use_cache and dirty:
+        cache['files'] = {path: file_entries[path] for path in files}
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp = f"{_cache_path()}.tmp{os.getpid()}"
+            with open(tmp, 'wb') as f:
+                marshal.dump(cache, f)
+            os.replace(tmp, _cache_path())
+        except OSError:
+            pass
+    return catalog
+
+
+def map_data_type(sql_type):
+    """Map a SQL type to the map's Data Type vocabulary ('string', 'number', ...)"""
+    if sql_type.endswith('[]') or sql_type.startswith('array'):
+        return 'array'
+    # The base type name only ('character varying(50)' -> 'character'); int4range or interval are not an int
+    head = re.match(r'[a-z][a-z0-9]*', sql_type)
+    head = head.group(0) if head else ''
+    for names, data_type, _ in _TYPE_FAMILIES:
+        if head in names:
+            return data_type
+    return None
+
+
+def _compatible(sql_type, data_type):
+    if sql_type.endswith('[]'):
+        return data_type in ('array', 'list')
+    mapped = map_data_type(sql_type)
+    for _, family, allowed in _TYPE_FAMILIES:
+        if family == mapped:
+            return data_type in allowed
+    return True
+
+
+def plain_columns(cell):
+    """Column names in a cell if it is a plain list ('name, email'), else []"""
+    names = [part.strip() for part in cell.split(',')]
+    if names and all(_PLAIN_COLUMN_RE.match(name) for name in names):
+        return names
+    return []
+
+
+def checkable_table(table):
+    """True if a Supabase Table cell names a table the migrations should define (not '—', auth.*, storage.*)"""
+    return bool(table) and table not in ('—', 'auth') and not table.startswith(EXTERNAL_SCHEMAS) and '.' not in table
+
+
+def check_row(catalog, row):
+    """Schema issues for one map row, as (kind, detail) pairs"""
+    table, column_cell, data_type = row[6], row[7], row[8]
+    if not checkable_table(table):
+        return []
+    if not catalog.has_table(table):
+        return [('unknown_table', table)]
+    issues = []
+    columns = plain_columns(column_cell)
+    for column in columns:
+        sql_type = catalog.column_type(table, column)
+        if sql_type is None:
+            issues.append(('unknown_column', f"{table}.{column}"))
+        elif len(columns) == 1 and data_type not in ('', '—') and not _compatible(sql_type, data_type):
+            issues.append(('type_mismatch', f"{table}.{column} is {sql_type}, map says {data_type}"))
+    return issues
+
+
+def fill_row(catalog, row):
+    """Row with the Supabase Table and Data Type cells filled where the catalog is unambiguous"""
+    row = list(row)
+    columns = plain_columns(row[7])
+    if row[6] in ('', '—') and len(columns) == 1:
+        tables = catalog.tables_with_column(columns[0])
+        if len(tables) == 1:
+            row[6] = tables[0]
+    if row[8] in ('', '—') and len(columns) == 1:
+        sql_type = catalog.column_type(row[6], columns[0])
+        mapped = map_data_type(sql_type) if sql_type else None
+        if mapped:
+            row[8] = mapped
+    return tuple(row)
+
+
+def apply_schema(dataset, catalog, mode='verify'):
+    """
+    Check (mode='verify') or fill and check (mode='fill') every row.
+
+    Returns (dataset, issues). In fill mode the returned dataset carries a
+    digest derived from the original digest and the catalog, so incremental
+    runs notice schema changes too.
+    """
+    issues = []
+    sections = []
+    for section in dataset.sections:
+        rows = tuple(fill_row(catalog, row) for row in section.rows) if mode == 'fill' else section.rows
+        for row in rows:
+            for kind, detail in check_row(catalog, row):
+                issues.append(Issue(row, kind, detail))
+        sections.append(Section(section.title, section.icon, rows))
+    if mode != 'fill':
+        return dataset, issues
+    digest = hashlib.blake2b(f"{dataset.digest}:{catalog.digest}".encode(), digest_size=16).hexdigest()
+    return Dataset(dataset.columns, sections, digest), issues
+
+
+def format_issues(issues, limit=None):
+    lines = []
+    for issue in issues[:limit]:
+        lines.append(f"  {issue.kind}: {issue.detail}  ({issue.row[0]} › {issue.row[3]} › {issue.row[4]})")
+    if limit is not None and len(issues) > limit:
+        lines.append(f"  ... and {len(issues) - limit} more")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Index the Supabase schema from the SQL migrations")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--verify", action="store_true", help="check the map's table/column/type cells")
+    mode.add_argument("--fill", action="store_true", help="show what --schema fill would fill in, then verify")
+    parser.add_argument("--tables", action="store_true", help="list every table with its columns")
+    parser.add_argument("--no-cache", action="store_true", help="re-parse every migration")
+    args = parser.parse_args(argv)
+
+    catalog = build_catalog(use_cache=not args.no_cache)
+    print(f"{len(catalog.tables)} tables, {sum(map(len, catalog.tables.values()))} columns, "
+          f"{len(catalog.indexes)} indexes from {len(catalog.sources)} files")
+    if args.tables:
+        for table, columns in sorted(catalog.tables.items()):
+            print(f"{table}: " + ', '.join(f"{c} {t}" for c, t in columns.items()))
+    if args.verify or args.fill:
+        dataset = load_dataset()
+        _, issues = apply_schema(dataset, catalog, 'fill' if args.fill else 'verify')
+        print(f"{len(issues)} schema issues")
+        if issues:
+            print(format_issues(issues))
+        return 1 if issues else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
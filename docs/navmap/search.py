@@ -0,0 +1,387 @@
+"""
+BM25 retrieval over navigation map rows
+
+Each field row is one document. Its module, screen, section, field,
+description, table, column and validation cells are tokenized (lowercase
+words, with routes, snake_case and camelCase split into their parts) and
+weighted per column, so a hit on the field name counts for more than one
+in the description. BM25 impacts (idf times the saturated term frequency)
+are computed once at build time, so a query is a sum of precomputed
+weights over the postings of its terms followed by a top-k selection.
+
+The index is a single binary file:
+
+    header      magic, version, byte order, counts, BM25 parameters, dataset digest
+    directory   (offset, length) of each array below, 8-byte aligned
+    terms       sorted vocabulary: offsets + UTF-8 blob (binary searched in place)
+    postings    per-term offsets + document ids (uint32) + impacts (float32)
+    documents   per-document cell offsets + per-cell byte offsets + UTF-8 blob
+                of the cells of each row (module first)
+
+SearchIndex.open() memory-maps it and reads every array through
+zero-copy memoryviews (or NumPy views when NumPy is installed), so opening
+costs nothing per row and the OS pages in only what queries touch.
+load_index() keeps one index per dataset digest in navmap/.cache.
+
+Usage: python -m navmap.search QUERY [-k N] [--json] [--rebuild]
+"""
+
+import argparse
+import hashlib
+import heapq
+import math
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from collections import namedtuple
+
+from navmap.dataset import CACHE_DIR
+
+INDEX_VERSION = 2
+MAGIC = b'NAVBM25\x00'
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Column -> weight of its tokens; Navigate From / To, Data Type and Editable are not indexed
+COLUMN_WEIGHTS = (
+    (0, 2.0),   # Current Screen / Module
+    (3, 2.0),   # Screen Section
+    (4, 3.0),   # Section Field
+    (5, 1.0),   # Description / Key Interactions
+    (6, 1.5),   # Supabase Table
+    (7, 1.5),   # Supabase Column Name
+    (10, 1.0),  # Validation Rule / Notes
+)
+MODULE_WEIGHT = 1.0
+
+DEFAULT_TOP = 10
+
+# Above this many postings a query accumulates scores with NumPy instead of a dict
+VECTOR_POSTINGS = 4096
+
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'its',
+    'of', 'on', 'or', 'the', 'this', 'that', 'to', 'with',
+))
+
+_CAMEL_RE = re.compile(r'([a-z0-9])([A-Z])')
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+# magic, version, byte order ('<' or '>'), documents, terms, k1, b, dataset digest
+_HEADER = struct.Struct('=8sIcxxxIIdd32s')
+_ARRAYS = ('term_offsets', 'terms', 'post_offsets', 'post_docs', 'post_weights', 'doc_offsets', 'cell_offsets',
+           'docs')
+_DIRECTORY = struct.Struct('=' + 'QQ' * len(_ARRAYS))
+_BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+Hit = namedtuple('Hit', ['score', 'doc', 'module', 'row'])
+
+
+def tokenize(text):
+    """Lowercase word tokens, with camelCase, snake_case and routes split apart"""
+    if not text:
+        return []
+    return [token for token in _TOKEN_RE.findall(_CAMEL_RE.sub(r'\1 \2', text).lower())
+            if token not in STOPWORDS]
+
+
+def _document_terms(module, row):
+    weights = {}
+    for token in tokenize(module):
+        weights[token] = weights.get(token, 0.0) + MODULE_WEIGHT
+    for col, weight in COLUMN_WEIGHTS:
+        for token in tokenize(row[col]):
+            weights[token] = weights.get(token, 0.0) + weight
+    return weights
+
+
+def build_index(dataset, path, k1=K1, b=B):
+    """Tokenize every field row of `dataset` and write the index file to `path`"""
+    postings = {}
+    lengths = []
+    doc_offsets = array('Q', [0])
+    cell_offsets = array('Q', [0])
+    docs = bytearray()
+    for section in dataset.sections:
+        for row in section.rows:
+            doc = len(lengths)
+            terms = _document_terms(section.title, row)
+            lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                postings.setdefault(term, []).append((doc, tf))
+            # Cells are stored back to back; their offsets, not a separator, mark where each ends
+            for cell in (section.title,) + tuple(row):
+                docs += cell.encode('utf-8')
+                cell_offsets.append(len(docs))
+            doc_offsets.append(len(cell_offsets) - 1)
+
+    count = len(lengths)
+    average = (sum(lengths) / count) if count else 0.0
+    vocabulary = sorted(postings)
+    term_offsets = array('I', [0])
+    terms = bytearray()
+    post_offsets = array('I', [0])
+    post_docs = array('I')
+    post_weights = array('f')
+    for term in vocabulary:
+        terms += term.encode('utf-8')
+        term_offsets.append(len(terms))
+        entries = postings[term]
+        idf = math.log(1.0 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+        for doc, tf in entries:
+            norm = k1 * (1.0 - b + b * lengths[doc] / average)
+            post_docs.append(doc)
+            post_weights.append(idf * tf * (k1 + 1.0) / (tf + norm))
+        post_offsets.append(len(post_docs))
+
+    blobs = [term_offsets.tobytes(), bytes(terms), post_offsets.tobytes(), post_docs.tobytes(),
+             post_weights.tobytes(), doc_offsets.tobytes(), cell_offsets.tobytes(), bytes(docs)]
+    header = _HEADER.pack(MAGIC, INDEX_VERSION, _BYTE_ORDER, count, len(vocabulary), k1, b,
+                          (dataset.digest or '').encode('ascii')[:32])
+    position = _align(_HEADER.size + _DIRECTORY.size)
+    directory = []
+    for blob in blobs:
+        directory += [position, len(blob)]
+        position = _align(position + len(blob))
+
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        f.write(_DIRECTORY.pack(*directory))
+        for offset, blob in zip(directory[::2], blobs):
+            f.write(b'\x00' * (offset - f.tell()))
+            f.write(blob)
+    os.replace(tmp, path)
+    return count, len(vocabulary)
+
+
+def _align(position):
+    return (position + 7) & ~7
+
+
+class SearchIndex:
+    """Read-only view of an index file; use open() and close() (or a with-block)"""
+
+    def __init__(self, buffer, mapping=None):
+        view = memoryview(buffer)
+        if len(view) < _HEADER.size + _DIRECTORY.size:
+            raise ValueError("search index is truncated")
+        magic, version, order, count, term_count, k1, b, digest = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != INDEX_VERSION:
+            raise ValueError("not a navmap search index of this version")
+        if order != _BYTE_ORDER:
+            raise ValueError("search index was built on a machine with the other byte order")
+        directory = _DIRECTORY.unpack_from(view, _HEADER.size)
+        spans = {}
+        for name, offset, size in zip(_ARRAYS, directory[::2], directory[1::2]):
+            if offset + size > len(view):
+                raise ValueError("search index is truncated")
+            spans[name] = view[offset:offset + size]
+
+        self.doc_count = count
+        self.term_count = term_count
+        self.k1, self.b = k1, b
+        self.digest = digest.rstrip(b'\x00').decode('ascii')
+        self._mapping = mapping
+        self._views = list(spans.values())
+        self._term_offsets = spans['term_offsets'].cast('I')
+        self._terms = spans['terms']
+        self._post_offsets = spans['post_offsets'].cast('I')
+        self._post_docs = spans['post_docs'].cast('I')
+        self._post_weights = spans['post_weights'].cast('f')
+        self._doc_offsets = spans['doc_offsets'].cast('Q')
+        self._cell_offsets = spans['cell_offsets'].cast('Q')
+        self._docs = spans['docs']
+        self._views += [self._term_offsets, self._post_offsets, self._post_docs,
+                        self._post_weights, self._doc_offsets, self._cell_offsets, view]
+
+        from navmap.rowstore import optional_numpy
+
+        np = optional_numpy()
+        self._np = np
+        if np is not None:
+            self._np_docs = np.frombuffer(spans['post_docs'], dtype=np.uint32)
+            self._np_weights = np.frombuffer(spans['post_weights'], dtype=np.float32)
+
+    @classmethod
+    def open(cls, path):
+        import mmap
+
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return cls(mapping, mapping)
+        except Exception:
+            mapping.close()
+            raise
+
+    def close(self):
+        self._np_docs = self._np_weights = None
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._mapping is not None:
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _term(self, index):
+        offsets = self._term_offsets
+        return bytes(self._terms[offsets[index]:offsets[index + 1]])
+
+    def _postings(self, term):
+        """(start, end) of a term's postings, or None"""
+        key = term.encode('utf-8')
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.term_count and self._term(lo) == key:
+            return self._post_offsets[lo], self._post_offsets[lo + 1]
+        return None
+
+    def document(self, doc):
+        """(module, row) of a document id"""
+        ends = self._cell_offsets[self._doc_offsets[doc]:self._doc_offsets[doc + 1] + 1]
+        start = ends[0]
+        blob = bytes(self._docs[start:ends[-1]])
+        cells = [blob[begin - start:end - start].decode('utf-8') for begin, end in zip(ends, ends[1:])]
+        return cells[0], tuple(cells[1:])
+
+    def _spans(self, query):
+        return [span for span in map(self._postings, dict.fromkeys(tokenize(query))) if span]
+
+    def _accumulate(self, spans):
+        scores = {}
+        docs, weights = self._post_docs, self._post_weights
+        for start, end in spans:
+            for doc, weight in zip(docs[start:end], weights[start:end]):
+                scores[doc] = scores.get(doc, 0.0) + weight
+        return scores
+
+    def scores(self, query):
+        """{doc: BM25 score} for every document matching a query term"""
+        return self._accumulate(self._spans(query))
+
+    def search(self, query, k=DEFAULT_TOP):
+        """Top `k` Hits for a free-text query, best first"""
+        spans = self._spans(query)
+        if not spans or k <= 0:
+            return []
+        np = self._np
+        if np is not None and sum(end - start for start, end in spans) > VECTOR_POSTINGS:
+            totals = np.zeros(self.doc_count, dtype=np.float32)
+            for start, end in spans:
+                # Ids are unique within one term's postings, so fancy-index += is safe
+                totals[self._np_docs[start:end]] += self._np_weights[start:end]
+            matched = np.flatnonzero(totals)
+            if len(matched) > k:
+                matched = matched[np.argpartition(-totals[matched], k - 1)[:k]]
+            ranked = sorted(zip(totals[matched].tolist(), matched.tolist()), key=lambda hit: (-hit[0], hit[1]))
+        else:
+            scores = self._accumulate(spans)
+            ranked = heapq.nsmallest(k, ((score, doc) for doc, score in scores.items()),
+                                     key=lambda hit: (-hit[0], hit[1]))
+        hits = []
+        for score, doc in ranked:
+            module, row = self.document(doc)
+            hits.append(Hit(round(score, 4), doc, module, row))
+        return hits
+
+
+def index_path(digest):
+    key = hashlib.blake2b((digest or '').encode(), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIR, f"search-{key}-v{INDEX_VERSION}.bm25")
+
+
+def load_index(dataset=None, rebuild=False):
+    """Open the index for `dataset` (default: the map), building it into navmap/.cache if needed"""
+    if dataset is None:
+        from navmap.dataset import load_dataset
+
+        dataset = load_dataset()
+    path = index_path(dataset.digest)
+    if not rebuild:
+        try:
+            index = SearchIndex.open(path)
+        except (OSError, ValueError):
+            pass
+        else:
+            if index.digest == (dataset.digest or ''):
+                return index
+            index.close()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        build_index(dataset, path)
+    except OSError:
+        # Read-only checkout: build into a temp file, which stays mapped after it is unlinked
+        import tempfile
+
+        fd, path = tempfile.mkstemp(suffix='.bm25')
+        os.close(fd)
+        try:
+            build_index(dataset, path)
+            return SearchIndex.open(path)
+        finally:
+            os.unlink(path)
+    return SearchIndex.open(path)
+
+
+def format_hits(hits, columns):
+    """Markdown table of hits, ready to paste into a prompt"""
+    from navmap.markdown import format_row
+
+    lines = [format_row(('Module',) + tuple(columns)), format_row(('---',) * (len(columns) + 1))]
+    lines += [format_row((hit.module,) + hit.row) for hit in hits]
+    return ''.join(lines)
+
+
+def add_arguments(parser):
+    parser.add_argument("query", nargs="+", help="free-text query")
+    parser.add_argument("-k", "--top", type=int, default=DEFAULT_TOP, help=f"rows to return (default: {DEFAULT_TOP})")
+    parser.add_argument("--json", action="store_true", help="print hits as JSON records")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the index first")
+
+
+def run(args):
+    from navmap.dataset import load_dataset
+
+    dataset = load_dataset()
+    with load_index(dataset, rebuild=args.rebuild) as index:
+        started = time.perf_counter()
+        hits = index.search(' '.join(args.query), args.top)
+        elapsed = time.perf_counter() - started
+        if args.json:
+            import json
+
+            keys = ('Module',) + tuple(dataset.columns)
+            records = [dict(zip(keys, (hit.module,) + hit.row), score=hit.score) for hit in hits]
+            print(json.dumps(records, ensure_ascii=False, indent=2))
+        else:
+            print(format_hits(hits, dataset.columns), end='')
+        print(f"{len(hits)} of {index.doc_count} rows in {elapsed * 1000:.3f} ms", file=sys.stderr)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find the navigation map rows most relevant to a query")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
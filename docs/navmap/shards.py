@@ -0,0 +1,255 @@
+"""
+Sharded output: one file per module section plus a manifest
+
+Agents that only need /policies/detail should not have to load the whole
+map. write_shards() writes, into one directory,
+
+    login-auth.md, home-dashboard.md, ...   one Markdown table per module
+    login-auth.json, ...                    the same rows as JSON (optional)
+    manifest.json                           what each shard covers
+
+The manifest lists every shard's title, icon, files, routes (the screens
+its rows belong to), Supabase tables, row count and byte sizes, so a
+loader can pick the shard for a route or table without opening the
+others.
+
+Each shard's content hash (its rows plus the renderer sources) is kept in
+the manifest along with the size and mtime of the files written. On the
+next run a shard whose hash matches and whose files are untouched is not
+rendered at all; the rest are rendered and written concurrently by a
+thread pool. Shards of sections that no longer exist are removed.
+
+Usage: python -m navmap.shards [-o DIR] [--json] [--workers N]
+"""
+
+import argparse
+import os
+import re
+import sys
+from collections import namedtuple
+
+from navmap.graph import normalize_route
+from navmap.incremental import file_fingerprint, fingerprint
+from navmap.instrument import stage
+
+DEFAULT_DIR = 'navigation-map-shards'
+MANIFEST_FILE = 'manifest.json'
+
+# Bump when the shard layout changes so every shard is rewritten
+SHARD_VERSION = 1
+
+DEFAULT_WORKERS = 4
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Map columns used for the manifest
+SCREEN, TABLE = 0, 6
+
+Result = namedtuple('Result', ['written', 'unchanged', 'removed'])
+
+
+def slugify(title):
+    """'TO-DO & CALENDAR' -> 'to-do-calendar'"""
+    return _SLUG_RE.sub('-', title.lower()).strip('-') or 'section'
+
+
+def shard_names(sections):
+    """Unique file stem per section, in order"""
+    names = []
+    seen = {}
+    for section in sections:
+        slug = slugify(section.title)
+        count = seen.get(slug, 0)
+        seen[slug] = count + 1
+        names.append(slug if not count else f"{slug}-{count + 1}")
+    return names
+
+
+def render_markdown_shard(section, columns):
+    from navmap.dataset import section_label
+    from navmap.markdown import format_row
+
+    lines = [f"# {section_label(section)}\n\n", format_row(columns), format_row(('---',) * len(columns))]
+    lines += [format_row(row) for row in section.rows]
+    return ''.join(lines).encode('utf-8')
+
+
+def render_json_shard(section, columns):
+    import json
+
+    doc = {
+        'title': section.title,
+        'icon': section.icon,
+        'columns': list(columns),
+        'rows': [list(row) for row in section.rows],
+    }
+    return (json.dumps(doc, ensure_ascii=False, indent=1) + '\n').encode('utf-8')
+
+
+def section_routes(section):
+    return sorted({route for route in (normalize_route(row[SCREEN]) for row in section.rows) if route})
+
+
+def section_tables(section):
+    return sorted({row[TABLE] for row in section.rows if row[TABLE] not in ('', '—')})
+
+
+def _untouched(path, recorded):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return recorded is not None and [stat.st_size, stat.st_mtime_ns] == recorded
+
+
+def _write(path, data):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_manifest(directory):
+    import json
+
+    try:
+        with open(os.path.join(directory, MANIFEST_FILE), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('version') == SHARD_VERSION else None
+
+
+def write_shards(dataset, directory=DEFAULT_DIR, json_shards=False, workers=DEFAULT_WORKERS):
+    """
+    Bring `directory` up to date with one shard per section of `dataset`.
+
+    Returns Result(written, unchanged, removed) with the shard stems in
+    each state.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    os.makedirs(directory, exist_ok=True)
+    formats = ('md', 'json') if json_shards else ('md',)
+    renderer = file_fingerprint(__file__, os.path.join(_HERE, 'markdown.py'))
+    columns = tuple(dataset.columns)
+    previous = {shard['name']: shard for shard in (load_manifest(directory) or {}).get('shards', ())}
+
+    shards = []
+    pending = []
+    for name, section in zip(shard_names(dataset.sections), dataset.sections):
+        digest = fingerprint((SHARD_VERSION, renderer, columns, section.title, section.icon, section.rows))
+        files = {fmt: f"{name}.{fmt}" for fmt in formats}
+        old = previous.get(name) or {}
+        old_stat = old.get('stat', {})
+        stale = [
+            fmt for fmt in formats
+            if old.get('hash') != digest or not _untouched(os.path.join(directory, files[fmt]), old_stat.get(fmt))
+        ]
+        kept = [fmt for fmt in formats if fmt not in stale]
+        shard = {
+            'name': name,
+            'title': section.title,
+            'icon': section.icon,
+            'files': files,
+            'routes': section_routes(section),
+            'tables': section_tables(section),
+            'rows': len(section.rows),
+            'bytes': {fmt: old['bytes'][fmt] for fmt in kept},
+            'hash': digest,
+            'stat': {fmt: old_stat[fmt] for fmt in kept},
+        }
+        shards.append(shard)
+        if stale:
+            pending.append((shard, section, stale))
+
+    def render_and_write(job):
+        shard, section, stale = job
+        for fmt in stale:
+            render = render_markdown_shard if fmt == 'md' else render_json_shard
+            data = render(section, columns)
+            shard['stat'][fmt] = _write(os.path.join(directory, shard['files'][fmt]), data)
+            shard['bytes'][fmt] = len(data)
+        return shard['name']
+
+    with stage('shards', rows=sum(len(section.rows) for _, section, _ in pending)):
+        if len(pending) > 1 and workers > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(pending))) as pool:
+                written = list(pool.map(render_and_write, pending))
+        else:
+            written = [render_and_write(job) for job in pending]
+
+    keep = {file for shard in shards for file in shard['files'].values()}
+    removed = []
+    for name, old in previous.items():
+        stale = [file for file in old.get('files', {}).values() if file not in keep]
+        for file in stale:
+            try:
+                os.unlink(os.path.join(directory, file))
+            except OSError:
+                pass
+        if stale and name not in {shard['name'] for shard in shards}:
+            removed.append(name)
+
+    manifest = {
+        'version': SHARD_VERSION,
+        'source': dataset.digest,
+        'columns': list(columns),
+        'shards': shards,
+    }
+    _write_manifest(directory, manifest)
+    unchanged = [shard['name'] for shard in shards if shard['name'] not in set(written)]
+    return Result(written, unchanged, removed)
+
+
+def _write_manifest(directory, manifest):
+    import json
+
+    path = os.path.join(directory, MANIFEST_FILE)
+    text = json.dumps(manifest, ensure_ascii=False, indent=2) + '\n'
+    try:
+        with open(path, encoding='utf-8') as f:
+            if f.read() == text:
+                return False
+    except OSError:
+        pass
+    _write(path, text.encode('utf-8'))
+    return True
+
+
+def add_arguments(parser):
+    parser.add_argument("-o", "--output", default=DEFAULT_DIR, metavar="DIR",
+                        help=f"shard directory (default: {DEFAULT_DIR})")
+    parser.add_argument("--json", action="store_true", help="also write a JSON shard per module")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, metavar="N",
+                        help=f"threads writing shards (default: {DEFAULT_WORKERS})")
+
+
+def run(args, dataset):
+    result = write_shards(dataset, args.output, json_shards=args.json, workers=args.workers)
+    total = len(result.written) + len(result.unchanged)
+    if not result.written and not result.removed:
+        print(f"✅ {args.output}: all {total} shards up to date, nothing written")
+    else:
+        print(f"✅ {args.output}: {len(result.written)} of {total} shards written")
+        if result.written:
+            print(f"🔁 Written: {', '.join(result.written)}")
+        if result.removed:
+            print(f"🗑️  Removed: {', '.join(result.removed)}")
+    print(f"📄 Manifest: {os.path.join(args.output, MANIFEST_FILE)}")
+    return 0
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Write one Markdown (and JSON) shard per module plus a manifest")
+    add_arguments(parser)
+    return run(parser.parse_args(argv), load_dataset())
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,464 @@
+"""
+Per-module XLSX workbook, built in parallel
+
+write_xlsx_sheets() writes one worksheet per module (Login & Auth, Home
+Dashboard, Customer Management, ...) behind an Index sheet whose module
+names link to their sheets and which carries the summary statistics.
+Every module sheet has its own header row, frozen pane and autofilter,
+so each opens and filters on its own instead of as part of one long sheet.
+
+The sheets share nothing, so each one is rendered straight to
+SpreadsheetML and deflated in a process pool; cells are inline strings and
+the few cell styles are fixed indexes into one shared styles.xml, which is
+what lets a part be built without seeing the others. This process renders
+the Index and the package parts meanwhile, then writes the compressed
+parts into the zip as they are, so the build time on a large map falls
+with the number of CPUs. As in navmap.export, forked workers inherit the
+rows; otherwise each job gets its rows pickled. With one CPU, or
+workers=0, the sheets are rendered in-process.
+
+navmap.importer reads this layout back through the Index sheet's Sheet
+column.
+
+Usage: python -m navmap.sheets [-o FILE] [--workers N]
+"""
+
+import argparse
+import os
+import re
+import struct
+import sys
+import zlib
+from collections import namedtuple
+
+from navmap.instrument import stage
+from navmap.layout import COLUMN_WIDTHS, summary_tables
+
+INDEX_SHEET_TITLE = "Index"
+
+# Excel's limits on worksheet names
+MAX_SHEET_NAME = 31
+_INVALID_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+_RESERVED_SHEET_NAMES = ('history',)
+
+# Cell style indexes into STYLES_XML's cellXfs
+STYLE_HEADER, STYLE_PERCENT, STYLE_LINK = 1, 2, 3
+
+INDEX_WIDTHS = [32, 24] + [13] * 8
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_WORKSHEET_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml'
+
+# Header colours match the single-sheet export (navmap.xlsx)
+STYLES_XML = (
+    _XML_DECL + f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="3">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><u/><sz val="11"/><color rgb="FF0563C1"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF366092"/><bgColor rgb="FF366092"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center" wrapText="1"/></xf>'
+    '<xf numFmtId="9" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+# A compressed package part: deflated bytes plus what the zip directory needs
+Part = namedtuple('Part', ['name', 'crc', 'size', 'data'])
+
+
+class SheetsError(RuntimeError):
+    """Raised when the workbook cannot be packaged"""
+
+
+# -- names and cells ---------------------------------------------------------
+
+
+def sheet_names(titles):
+    """
+    Excel-safe, unique worksheet name for each module title, in order
+    ('LOGIN & AUTH' -> 'Login & Auth'): at most 31 characters, none of
+    []:*?/\\, unique ignoring case and never clashing with the Index.
+    """
+    taken = {INDEX_SHEET_TITLE.lower(), *_RESERVED_SHEET_NAMES}
+    names = []
+    for title in titles:
+        base = _INVALID_SHEET_CHARS.sub(' ', title.title()).strip(" '")[:MAX_SHEET_NAME].rstrip(" '") or 'Module'
+        name = base
+        copy = 1
+        while name.lower() in taken:
+            copy += 1
+            suffix = f" ({copy})"
+            name = base[:MAX_SHEET_NAME - len(suffix)].rstrip(" '") + suffix
+        taken.add(name.lower())
+        names.append(name)
+    return names
+
+
+def column_letter(index):
+    """'A' for column 1, 'AA' for column 27"""
+    letters = ''
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+_ESCAPE_RE = re.compile('[&<>"\x00-\x08\x0b\x0c\x0e-\x1f]')
+_ILLEGAL_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def escape(text):
+    """Text safe for XML content and attributes; control characters XML cannot carry are dropped"""
+    if _ESCAPE_RE.search(text) is None:
+        return text
+    text = _ILLEGAL_RE.sub('', text)
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+def quote_sheet(name):
+    """Sheet name as it appears in a formula or link ('Login & Auth' -> "'Login & Auth'")"""
+    return "'" + name.replace("'", "''") + "'"
+
+
+def _inline(text, style=0):
+    """The attributes and body of an inline-string cell, after its reference"""
+    space = ' xml:space="preserve"' if text[0] in ' \t\n' or text[-1] in ' \t\n' else ''
+    styled = f' s="{style}"' if style else ''
+    return f'{styled} t="inlineStr"><is><t{space}>{escape(text)}</t></is></c>'
+
+
+def _value_cell(ref, value, style=0):
+    if value is None or value == '':
+        return ''
+    if isinstance(value, str):
+        return f'<c r="{ref}"' + _inline(value, style)
+    if isinstance(value, float):
+        style = style or STYLE_PERCENT
+    styled = f' s="{style}"' if style else ''
+    return f'<c r="{ref}"{styled}><v>{value!r}</v></c>'
+
+
+def _sheet_xml(widths, rows_xml, dimension, frozen=False, autofilter=None, links=()):
+    parts = [_XML_DECL, f'<worksheet xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">',
+             f'<dimension ref="{dimension}"/>']
+    if frozen:
+        parts.append('<sheetViews><sheetView workbookViewId="0">'
+                     '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+                     '<selection pane="bottomLeft" activeCell="A2" sqref="A2"/>'
+                     '</sheetView></sheetViews>')
+    else:
+        parts.append('<sheetViews><sheetView workbookViewId="0"/></sheetViews>')
+    parts.append('<sheetFormatPr defaultRowHeight="15"/><cols>')
+    parts.extend(f'<col min="{idx}" max="{idx}" width="{width}" customWidth="1"/>'
+                 for idx, width in enumerate(widths, start=1))
+    parts.append('</cols><sheetData>')
+    parts.append(rows_xml)
+    parts.append('</sheetData>')
+    if autofilter:
+        parts.append(f'<autoFilter ref="{autofilter}"/>')
+    if links:
+        parts.append('<hyperlinks>')
+        parts.extend(f'<hyperlink ref="{ref}" location="{escape(location)}" display="{escape(display)}"/>'
+                     for ref, location, display in links)
+        parts.append('</hyperlinks>')
+    parts.append('</worksheet>')
+    return ''.join(parts)
+
+
+def _compress(name, text):
+    data = text.encode('utf-8')
+    deflate = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return Part(name, zlib.crc32(data), len(data), deflate.compress(data) + deflate.flush())
+
+
+# -- sheets ------------------------------------------------------------------
+
+
+def render_module_sheet(columns, rows):
+    """
+    Worksheet XML for one module: the header row, then one row per field.
+    Returns (xml, autofilter range).
+    """
+    letters = [column_letter(idx) for idx in range(1, len(columns) + 1)]
+    out = ['<row r="1">']
+    out.extend(f'<c r="{letter}1"' + _inline(name, STYLE_HEADER) for letter, name in zip(letters, columns))
+    out.append('</row>')
+    # Cells repeat heavily (routes, tables, types, Y/N); each distinct one is escaped once
+    fragments = {}
+    number = 1
+    for row in rows:
+        number += 1
+        cells = [f'<row r="{number}">']
+        for letter, value in zip(letters, row):
+            if not value:
+                continue
+            fragment = fragments.get(value)
+            if fragment is None:
+                fragment = fragments[value] = _inline(value)
+            cells.append(f'<c r="{letter}{number}"{fragment}')
+        cells.append('</row>')
+        out.append(''.join(cells))
+    extent = f"A1:{letters[-1]}{number}"
+    xml = _sheet_xml(COLUMN_WIDTHS[:len(columns)], ''.join(out), extent, frozen=True, autofilter=extent)
+    return xml, extent
+
+
+def render_index_sheet(summary, modules, note=''):
+    """
+    Index worksheet XML: the modules, each linked to its sheet, then the
+    totals and the Supabase tables (navmap.layout.summary_tables), then
+    `note` in a row of its own when given.
+    `modules` is [(title, icon, sheet name)] in sheet order.
+    """
+    totals, module_block, tables = summary_tables(summary)
+    stats = {row[0]: row[1:] for row in module_block[1]}
+    header = (module_block[0][0], 'Sheet') + tuple(module_block[0][1:])
+    module_rows = [((f"{icon} {title}", name) + stats.get(title, ()), name) for title, icon, name in modules]
+
+    out = []
+    links = []
+    number = 0
+    for block, (names, rows) in enumerate(((header, module_rows), (totals[0], totals[1]), (tables[0], tables[1]))):
+        if block:
+            number += 1  # a blank row between blocks
+        number += 1
+        out.append(f'<row r="{number}">' + ''.join(
+            _value_cell(f"{column_letter(idx)}{number}", name, STYLE_HEADER) for idx, name in enumerate(names, start=1)
+        ) + '</row>')
+        for row in rows:
+            target = None
+            if block == 0:
+                row, target = row
+            number += 1
+            cells = []
+            for idx, value in enumerate(row, start=1):
+                ref = f"{column_letter(idx)}{number}"
+                if target is not None and idx == 1:
+                    cells.append(_value_cell(ref, value, STYLE_LINK))
+                    links.append((ref, f"{quote_sheet(target)}!A1", value))
+                else:
+                    cells.append(_value_cell(ref, value))
+            out.append(f'<row r="{number}">' + ''.join(cells) + '</row>')
+    if note:
+        number += 2
+        out.append(f'<row r="{number}">' + _value_cell(f"A{number}", note) + '</row>')
+    return _sheet_xml(INDEX_WIDTHS, ''.join(out), f"A1:{column_letter(len(INDEX_WIDTHS))}{number}", links=links)
+
+
+# -- package -----------------------------------------------------------------
+
+
+def _package_parts(names, filters):
+    """Uncompressed (name, xml) for every part but the worksheets"""
+    sheets = len(names)
+    content_types = [
+        _XML_DECL, '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">',
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>',
+        '<Default Extension="xml" ContentType="application/xml"/>',
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>',
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>',
+    ]
+    content_types.extend(f'<Override PartName="/xl/worksheets/sheet{idx}.xml" ContentType="{_WORKSHEET_TYPE}"/>'
+                         for idx in range(1, sheets + 1))
+    content_types.append('</Types>')
+
+    root_rels = (
+        _XML_DECL + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    )
+
+    workbook = [_XML_DECL, f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">',
+                '<bookViews><workbookView activeTab="0"/></bookViews><sheets>']
+    workbook.extend(f'<sheet name="{escape(name)}" sheetId="{idx}" r:id="rId{idx}"/>'
+                    for idx, name in enumerate(names, start=1))
+    workbook.append('</sheets>')
+    if filters:
+        # Excel expects the hidden filter range name next to each autofilter
+        workbook.append('<definedNames>')
+        for idx, extent in filters:
+            start, end = extent.split(':')
+            absolute = '$' + re.sub(r'(\d+)', r'$\1', start) + ':$' + re.sub(r'(\d+)', r'$\1', end)
+            workbook.append(f'<definedName name="_xlnm._FilterDatabase" localSheetId="{idx - 1}" hidden="1">'
+                            f'{escape(quote_sheet(names[idx - 1]))}!{absolute}</definedName>')
+        workbook.append('</definedNames>')
+    workbook.append('</workbook>')
+
+    workbook_rels = [_XML_DECL, '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">']
+    workbook_rels.extend(f'<Relationship Id="rId{idx}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{idx}.xml"/>'
+                         for idx in range(1, sheets + 1))
+    workbook_rels.append(f'<Relationship Id="rId{sheets + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>')
+    workbook_rels.append('</Relationships>')
+
+    return [
+        ('[Content_Types].xml', ''.join(content_types)),
+        ('_rels/.rels', root_rels),
+        ('xl/workbook.xml', ''.join(workbook)),
+        ('xl/_rels/workbook.xml.rels', ''.join(workbook_rels)),
+        ('xl/styles.xml', STYLES_XML),
+    ]
+
+
+# Fixed timestamp (1980-01-01 00:00) so the same map always packages to the same bytes
+_DOS_TIME, _DOS_DATE = 0, (0 << 9) | (1 << 5) | 1
+_ZIP_LIMIT = 0xFFFFFFFF
+
+
+def write_package(path, parts):
+    """
+    Write already-deflated Parts as a zip file at `path`, atomically.
+    The parts stay within the plain (non-ZIP64) format's 4 GB limits.
+    """
+    if len(parts) >= 0xFFFF:
+        raise SheetsError(f"{len(parts)} parts is more than a zip without ZIP64 can hold")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    directory = []
+    try:
+        with open(tmp, 'wb') as f:
+            offset = 0
+            for part in parts:
+                name = part.name.encode('utf-8')
+                if offset > _ZIP_LIMIT or part.size > _ZIP_LIMIT or len(part.data) > _ZIP_LIMIT:
+                    raise SheetsError(f"{part.name}: the workbook is too large for a zip without ZIP64")
+                f.write(struct.pack('<IHHHHHIIIHH', 0x04034b50, 20, 0x800, 8, _DOS_TIME, _DOS_DATE,
+                                    part.crc, len(part.data), part.size, len(name), 0))
+                f.write(name)
+                f.write(part.data)
+                directory.append(struct.pack('<IHHHHHHIIIHHHHHII', 0x02014b50, 20, 20, 0x800, 8, _DOS_TIME,
+                                             _DOS_DATE, part.crc, len(part.data), part.size, len(name),
+                                             0, 0, 0, 0, 0, offset) + name)
+                offset += 30 + len(name) + len(part.data)
+            listing = b''.join(directory)
+            f.write(listing)
+            f.write(struct.pack('<IHHHHIIH', 0x06054b50, 0, 0, len(parts), len(parts), len(listing), offset, 0))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+# -- parallel build ----------------------------------------------------------
+
+# (columns, [rows of each module]) handed to forked workers; set just before the pool starts
+_SHARED = None
+
+
+def _module_part(number, payload=None):
+    """Deflated worksheet part of module `number` (counted from 0), and its autofilter range"""
+    columns, rows = payload if payload is not None else (_SHARED[0], _SHARED[1][number])
+    xml, extent = render_module_sheet(columns, rows)
+    # Sheet 1 is the Index
+    return _compress(f'xl/worksheets/sheet{number + 2}.xml', xml), extent
+
+
+def _worker_part(job):
+    from navmap import instrument
+
+    instrument.disable()
+    return _module_part(*job)
+
+
+def group_modules(dataset):
+    """[(title, icon, rows)] with the rows of same-titled sections joined, in order of first appearance"""
+    modules = {}
+    for section in dataset.sections:
+        module = modules.get(section.title)
+        if module is None:
+            modules[section.title] = (section.title, section.icon, list(section.rows))
+        else:
+            module[2].extend(section.rows)
+    return list(modules.values())
+
+
+def write_xlsx_sheets(output_file, dataset, summary=None, workers=None, note=''):
+    """
+    Write the map to `output_file` as an Index sheet plus one sheet per module,
+    with `note` (plain text) under the Index tables.
+
+    The module sheets are rendered in up to `workers` processes (default:
+    one per CPU; 0 or 1 renders them here). The summary is computed when
+    not given. Returns (row_count, sheet_count), the Index included.
+    """
+    global _SHARED
+
+    from navmap.pool import available_cpus, process_pool
+
+    if summary is None:
+        from navmap.summary import summarize
+
+        summary = summarize(dataset)
+    modules = group_modules(dataset)
+    names = sheet_names([title for title, _, _ in modules])
+    columns = tuple(dataset.columns)
+    if workers is None:
+        workers = available_cpus()
+    workers = min(workers, len(modules))
+
+    pool = None
+    _SHARED = (columns, [rows for _, _, rows in modules])
+    try:
+        with stage('sheets', rows=dataset.row_count):
+            if workers > 1:
+                pool, forked = process_pool(workers)
+                jobs = [(number, None if forked else (columns, rows)) for number, (_, _, rows) in enumerate(modules)]
+                # A few chunks per worker keep them all busy without a round trip per small module
+                results = pool.map(_worker_part, jobs, chunksize=max(1, len(jobs) // (workers * 4)))
+            index = _compress('xl/worksheets/sheet1.xml', render_index_sheet(
+                summary, [(title, icon, name) for (title, icon, _), name in zip(modules, names)], note))
+            if pool is None:
+                results = map(_module_part, range(len(modules)))
+            sheets = []
+            filters = []
+            for number, (part, extent) in enumerate(results, start=2):
+                sheets.append(part)
+                filters.append((number, extent))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        _SHARED = None
+
+    with stage('package', rows=dataset.row_count):
+        package = [_compress(name, xml) for name, xml in _package_parts([INDEX_SHEET_TITLE] + names, filters)]
+        write_package(output_file, package + [index] + sheets)
+    return dataset.row_count, len(sheets) + 1
+
+
+def add_arguments(parser):
+    from navmap.document import XLSX_OUTPUT
+
+    parser.add_argument("-o", "--output", default=XLSX_OUTPUT, help=f"output file (default: {XLSX_OUTPUT})")
+    parser.add_argument("--workers", type=int, default=None, metavar="N",
+                        help="processes rendering the module sheets (default: one per CPU; 0 = in-process)")
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Write the navigation map as one worksheet per module")
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    rows, sheets = write_xlsx_sheets(args.output, load_dataset(), workers=args.workers)
+    print(f"✅ {args.output}: {rows} rows on {sheets} sheets")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
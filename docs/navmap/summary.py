@@ -0,0 +1,280 @@
+"""
+Summary statistics of the navigation map
+
+summarize() walks the rows once and keeps running counts, for the whole
+map, for each module section and for each Supabase table: field rows,
+editable / read-only flags, calculated fields, distinct screens, tables,
+table columns and query parameters. Only the counters and the sets of
+distinct values are held, never a list of rows, so it runs in O(n) time
+over maps of any size. The Markdown header and footer (navmap.document)
+and the XLSX summary sheet (navmap.xlsx) are filled in from its result,
+as is `python -m navmap stats`.
+
+A field is calculated when its column cell is a marker such as
+'(calculated)' or '(formula)' (or a note like '(calculated from customer
+data)'), a function call such as 'COUNT(*) WHERE ...' or arithmetic such
+as 'premium_amount * frequency_multiplier', when the field is labelled
+'... (Calculated)', or when its validation notes say 'calculated'. Query parameters
+are the distinct (route, name) pairs found in '?name=' links of the
+screen and navigation cells.
+
+Usage: python -m navmap.summary [--json]
+"""
+
+import argparse
+import re
+import sys
+
+from navmap.graph import normalize_route, split_cell
+
+# Map columns the statistics read
+SCREEN, NAVIGATE_FROM, NAVIGATE_TO, FIELD, TABLE, COLUMN, EDITABLE, NOTES = 0, 1, 2, 4, 6, 7, 9, 10
+
+# Table / column cells that stand for "none"
+EMPTY_CELLS = frozenset(('', '—', '-'))
+
+# Column cells that name a computed value instead of a stored column
+CALCULATED_MARKERS = frozenset(('(calculated)', '(formula)'))
+
+_EXPRESSION_RE = re.compile(r'[A-Z][A-Z_]*\(')
+# Arithmetic between two operands ('premium_amount * frequency_multiplier', '(gap / recommended) * 100')
+_ARITHMETIC_RE = re.compile(r'[\w)]\s+[-+*/]\s+[\w(]')
+_CALCULATED_NOTE_RE = re.compile(r'\(calculated\b', re.IGNORECASE)
+_CALCULATED_RE = re.compile(r'\bcalculated\b', re.IGNORECASE)
+_PARAM_RE = re.compile(r'[?&]([A-Za-z_]\w*)=')
+_COLUMN_NAME_RE = re.compile(r'[a-z_][a-z0-9_]*$')
+
+
+def is_calculated(row):
+    column = row[COLUMN]
+    notes = row[NOTES]
+    return (column in CALCULATED_MARKERS or _EXPRESSION_RE.match(column) is not None
+            or _ARITHMETIC_RE.search(column) is not None or _CALCULATED_NOTE_RE.match(column) is not None
+            or row[FIELD].endswith('(Calculated)')
+            or ('alculated' in notes and _CALCULATED_RE.search(notes) is not None))
+
+
+def _columns(cell):
+    """Stored column names in a column cell ('name, email' -> name, email)"""
+    if cell in EMPTY_CELLS or cell in CALCULATED_MARKERS:
+        return ()
+    if ',' not in cell:
+        return (cell,) if _COLUMN_NAME_RE.match(cell) else ()
+    return tuple(part for part in (part.strip() for part in cell.split(',')) if _COLUMN_NAME_RE.match(part))
+
+
+def _query_params(row):
+    """(route, parameter) pairs linked from a row"""
+    for col in (SCREEN, NAVIGATE_FROM, NAVIGATE_TO):
+        cell = row[col]
+        if '?' not in cell:
+            continue
+        for token in split_cell(cell):
+            route = normalize_route(token)
+            if route is not None:
+                for name in _PARAM_RE.findall(token):
+                    yield route, name
+
+
+class Counts:
+    """Running counts for a group of rows (the map, a module or a table)"""
+
+    __slots__ = ('rows', 'editable', 'read_only', 'calculated', 'screens', 'tables', 'columns', 'params', 'modules')
+
+    def __init__(self):
+        self.rows = 0
+        self.editable = 0
+        self.read_only = 0
+        self.calculated = 0
+        self.screens = set()
+        self.tables = set()
+        self.columns = set()
+        self.params = set()
+        self.modules = set()
+
+    @property
+    def not_applicable(self):
+        """Rows without an editable flag (actions, charts, sections)"""
+        return self.rows - self.editable - self.read_only
+
+    @property
+    def editable_ratio(self):
+        """Editable share of the rows that carry a Y/N flag"""
+        flagged = self.editable + self.read_only
+        return self.editable / flagged if flagged else 0.0
+
+    def as_dict(self):
+        return {
+            'rows': self.rows,
+            'editable': self.editable,
+            'read_only': self.read_only,
+            'not_applicable': self.not_applicable,
+            'editable_ratio': round(self.editable_ratio, 4),
+            'calculated': self.calculated,
+            'screens': len(self.screens),
+            'tables': len(self.tables),
+            'columns': len(self.columns),
+            'query_params': len(self.params),
+            'modules': len(self.modules),
+        }
+
+
+class Summary:
+    """Statistics for the whole map plus per-module and per-table breakdowns"""
+
+    def __init__(self):
+        self.modules = {}
+        self.tables = {}
+        self.sections = 0
+        self._total = None
+        # Screen and column cells repeat a lot; each distinct one is parsed once
+        self._routes = {}
+        self._columns = {}
+
+    @property
+    def total(self):
+        """Counts for the whole map, merged from the module counts"""
+        if self._total is None:
+            total = Counts()
+            for counts in self.modules.values():
+                total.rows += counts.rows
+                total.editable += counts.editable
+                total.read_only += counts.read_only
+                total.calculated += counts.calculated
+                total.screens |= counts.screens
+                total.tables |= counts.tables
+                total.columns |= counts.columns
+                total.params |= counts.params
+                total.modules |= counts.modules
+            self._total = total
+        return self._total
+
+    @property
+    def pages(self):
+        return len(self.total.screens)
+
+    def add_section(self, section):
+        """Count the rows of one module section"""
+        self.sections += 1
+        self._total = None
+        title = section.title
+        module = self.modules.get(title)
+        if module is None:
+            module = self.modules[title] = Counts()
+            module.modules.add(title)
+        tables = self.tables
+        routes = self._routes
+        column_cache = self._columns
+        screens = module.screens
+        for row in section.rows:
+            editable = row[EDITABLE]
+            calculated = is_calculated(row)
+            cell = row[SCREEN]
+            screen = routes.get(cell, routes)
+            if screen is routes:
+                screen = routes[cell] = normalize_route(cell)
+            if screen is not None:
+                screens.add(screen)
+            params = tuple(_query_params(row)) if '?' in cell + row[NAVIGATE_FROM] + row[NAVIGATE_TO] else ()
+            if params:
+                module.params.update(params)
+            module.rows += 1
+            if editable == 'Y':
+                module.editable += 1
+            elif editable == 'N':
+                module.read_only += 1
+            if calculated:
+                module.calculated += 1
+
+            table_name = row[TABLE]
+            if table_name in EMPTY_CELLS:
+                continue
+            cell = row[COLUMN]
+            columns = column_cache.get(cell)
+            if columns is None:
+                columns = column_cache[cell] = _columns(cell)
+            table = tables.get(table_name)
+            if table is None:
+                table = tables[table_name] = Counts()
+                table.tables.add(table_name)
+            module.tables.add(table_name)
+            table.rows += 1
+            if editable == 'Y':
+                table.editable += 1
+            elif editable == 'N':
+                table.read_only += 1
+            if calculated:
+                table.calculated += 1
+            if screen is not None:
+                table.screens.add(screen)
+            if params:
+                table.params.update(params)
+            table.modules.add(title)
+            for column in columns:
+                column = (table_name, column)
+                module.columns.add(column)
+                table.columns.add(column)
+
+    def as_dict(self):
+        return {
+            'sections': self.sections,
+            'pages': self.pages,
+            **self.total.as_dict(),
+            'by_module': {title: counts.as_dict() for title, counts in self.modules.items()},
+            'by_table': {name: counts.as_dict() for name, counts in sorted(self.tables.items())},
+        }
+
+
+def summarize(dataset):
+    """Summary of `dataset`, in one pass over its rows"""
+    summary = Summary()
+    for section in dataset.sections:
+        summary.add_section(section)
+    return summary
+
+
+def percent(ratio):
+    return f"{ratio * 100:.0f}%"
+
+
+def format_summary(summary):
+    """Plain-text report, as printed by `navmap stats`"""
+    total = summary.total
+    lines = [
+        f"Rows:        {total.rows} (+{summary.sections} section headers)",
+        f"Pages:       {summary.pages}",
+        f"Tables:      {len(total.tables)} ({len(total.columns)} columns)",
+        f"Editable:    {total.editable} ({percent(total.editable_ratio)} of flagged fields)",
+        f"Read-only:   {total.read_only}",
+        f"Calculated:  {total.calculated}",
+        f"Query params: {len(total.params)}",
+        "Modules:",
+    ]
+    for title, counts in summary.modules.items():
+        lines.append(f"  {title}: {counts.rows} rows, {counts.editable} editable ({percent(counts.editable_ratio)}), "
+                     f"{counts.calculated} calculated, {len(counts.tables)} tables")
+    lines.append("Tables:")
+    for name, counts in sorted(summary.tables.items(), key=lambda item: -item[1].rows):
+        lines.append(f"  {name}: {counts.rows} rows, {len(counts.columns)} columns, "
+                     f"{counts.editable} editable, {len(counts.modules)} modules")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Print summary statistics of the navigation map")
+    parser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+    args = parser.parse_args(argv)
+    summary = summarize(load_dataset())
+    if args.json:
+        import json
+
+        print(json.dumps(summary.as_dict(), ensure_ascii=False, indent=2))
+    else:
+        print(format_summary(summary))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Bulk record validation compiled from the navigation map
+
+The Validation Rule / Notes column already holds machine-usable rules
+("Required, max 100 chars", "Regex: ^[0-9]{8,15}$", "Options: SGD / MYR /
+USD", "Range: 18-70", "must be >= today"). compile_plan() turns those,
+together with the Data Type and Editable columns, into a per-table plan of
+ColumnRules. UI-only rows (filters, search boxes, read-only displays, JSON
+sub-fields, multi-column cells) are left out.
+
+validate_frame() checks a pandas DataFrame against one table's plan column
+by column. Each column is factorized first, every rule runs as a single
+vectorized pass (str.len, str.fullmatch, isin, to_numeric, to_datetime)
+over its distinct values, and the verdicts are broadcast back through the
+codes; only the failing cells are materialized into the error report. pandas is needed
+for validation only; compiling and printing a plan work without it.
+
+When several screens write the same column their rules are merged
+permissively (union of options, widest length and value bounds), except
+that a column is required if any screen requires it.
+
+Usage: python -m navmap.validate TABLE FILE.csv [--report FILE] [--limit N]
+       python -m navmap.validate --plan [TABLE]
+"""
+
+import argparse
+import re
+import sys
+from collections import namedtuple
+
+ColumnRule = namedtuple('ColumnRule', [
+    'table', 'column', 'data_type', 'required', 'min_len', 'max_len', 'regex', 'options',
+    'minimum', 'maximum', 'email', 'contains', 'not_past', 'min_age', 'max_age', 'sources',
+])
+
+# Error report columns
+REPORT_COLUMNS = ('row', 'column', 'rule', 'value', 'message')
+
+EMAIL_REGEX = r'[^@\s]+@[^@\s]+\.[^@\s]+'
+_BOOLEAN_VALUES = frozenset(('true', 'false', 't', 'f', 'yes', 'no', 'y', 'n', '1', '0'))
+
+_TABLE_RE = re.compile(r'^[a-z_][a-z0-9_]*(?:\.[a-z_][a-z0-9_]*)?$')
+_COLUMN_RE = re.compile(r'^[a-z_][a-z0-9_]*$')
+_OPTIONS_RE = re.compile(r'^(?:options|values|radio buttons):\s*(.+)$', re.I)
+_REGEX_RE = re.compile(r'\bregex:\s*(\S+)', re.I)
+_MAX_RE = re.compile(r'\bmax(?:imum)?\s+(\d+)\s+chars\b', re.I)
+_MIN_RE = re.compile(r'\bmin(?:imum)?(?:\s+length)?\s+(\d+)(?:\s+chars)?\b', re.I)
+_RANGE_RE = re.compile(r'\brange:\s*(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\b', re.I)
+_MIN_VALUE_RE = re.compile(r'\bmin:\s*(\d+(?:\.\d+)?)', re.I)
+_AGE_RE = re.compile(r'\bage\s+must\s+be\s+(\d+)\s*-\s*(\d+)', re.I)
+
+
+def _empty_rule(table, column, data_type):
+    return ColumnRule(table, column, data_type, False, None, None, None, None,
+                      None, None, False, (), False, None, None, ())
+
+
+def parse_rule(row):
+    """ColumnRule for one map row, or None if the row is not a writable table column"""
+    field, table, column, data_type, editable, notes = row[4], row[6], row[7], row[8], row[9], row[10]
+    if editable != 'Y' or not _TABLE_RE.match(table) or not _COLUMN_RE.match(column):
+        return None
+    if field.endswith(('Filter', 'Search Input', 'Toggle', 'Selector')) or data_type in ('action', 'calendar'):
+        return None
+
+    rule = _empty_rule(table, column, data_type)
+    options = _OPTIONS_RE.match(notes)
+    if options:
+        values = [re.sub(r'\s*\(.*\)$', '', value).strip() for value in options.group(1).split('/')]
+        rule = rule._replace(options=tuple(value for value in values if value))
+    if re.search(r'\brequired\b(?!\s+(?:if|before))', notes, re.I):
+        rule = rule._replace(required=True)
+    regex = _REGEX_RE.search(notes)
+    if regex:
+        rule = rule._replace(regex=regex.group(1).rstrip(',;'))
+    maximum = _MAX_RE.search(notes)
+    if maximum:
+        rule = rule._replace(max_len=int(maximum.group(1)))
+    minimum = _MIN_RE.search(notes)
+    if minimum and not _MIN_VALUE_RE.search(notes):
+        rule = rule._replace(min_len=int(minimum.group(1)))
+    bounds = _RANGE_RE.search(notes)
+    if bounds:
+        rule = rule._replace(minimum=float(bounds.group(1)), maximum=float(bounds.group(2)))
+    elif re.search(r'\brange:\s*(\d+)', notes, re.I):
+        rule = rule._replace(minimum=float(re.search(r'\brange:\s*(\d+)', notes, re.I).group(1)))
+    low = _MIN_VALUE_RE.search(notes)
+    if low:
+        rule = rule._replace(minimum=float(low.group(1)))
+    if re.search(r'\bvalid\s+email\b', notes, re.I):
+        rule = rule._replace(email=True)
+    if re.search(r'must\s+contain\s+uppercase\s*\+\s*number', notes, re.I):
+        rule = rule._replace(contains=('[A-Z]', '[0-9]'))
+    if re.search(r'must\s+be\s+>=\s*today', notes, re.I):
+        rule = rule._replace(not_past=True)
+    age = _AGE_RE.search(notes)
+    if age:
+        rule = rule._replace(min_age=int(age.group(1)), max_age=int(age.group(2)))
+    return rule._replace(sources=(f"{row[0]} › {row[3]} › {field}",))
+
+
+def _widest(a, b, pick):
+    if a is None or b is None:
+        return None
+    return pick(a, b)
+
+
+def merge_rules(a, b):
+    """Permissive merge of two rules for the same column (see module docstring)"""
+    def union(x, y):
+        if x is None or y is None:
+            return None
+        return x + tuple(value for value in y if value not in x)
+
+    return a._replace(
+        data_type=a.data_type if a.data_type == b.data_type else 'string',
+        required=a.required or b.required,
+        min_len=_widest(a.min_len, b.min_len, min),
+        max_len=_widest(a.max_len, b.max_len, max),
+        regex=a.regex if a.regex == b.regex else None,
+        options=union(a.options, b.options),
+        minimum=_widest(a.minimum, b.minimum, min),
+        maximum=_widest(a.maximum, b.maximum, max),
+        email=a.email and b.email,
+        contains=tuple(p for p in a.contains if p in b.contains),
+        not_past=a.not_past and b.not_past,
+        min_age=_widest(a.min_age, b.min_age, min),
+        max_age=_widest(a.max_age, b.max_age, max),
+        sources=a.sources + b.sources,
+    )
+
+
+def compile_plan(dataset):
+    """{table: {column: ColumnRule}} for every writable column the map describes"""
+    plan = {}
+    for section in dataset.sections:
+        for row in section.rows:
+            rule = parse_rule(row)
+            if rule is None:
+                continue
+            columns = plan.setdefault(rule.table, {})
+            columns[rule.column] = merge_rules(columns[rule.column], rule) if rule.column in columns else rule
+    return plan
+
+
+def describe_rule(rule):
+    parts = [rule.data_type]
+    if rule.required:
+        parts.append('required')
+    if rule.min_len is not None:
+        parts.append(f"min {rule.min_len} chars")
+    if rule.max_len is not None:
+        parts.append(f"max {rule.max_len} chars")
+    if rule.regex:
+        parts.append(f"regex {rule.regex}")
+    if rule.email:
+        parts.append('email')
+    if rule.contains:
+        parts.append('contains ' + ' + '.join(rule.contains))
+    if rule.options:
+        parts.append('one of ' + ' / '.join(rule.options))
+    if rule.minimum is not None or rule.maximum is not None:
+        low = '' if rule.minimum is None else f"{rule.minimum:g}"
+        high = '' if rule.maximum is None else f"{rule.maximum:g}"
+        parts.append(f"range {low}..{high}")
+    if rule.min_age is not None:
+        parts.append(f"age {rule.min_age}-{rule.max_age}")
+    if rule.not_past:
+        parts.append('>= today')
+    return ', '.join(parts)
+
+
+def _checks(rule, values, present, pd):
+    """
+    Yield (rule name, failing mask, message) for one column.
+
+    `values` is the column as strings with missing cells as '', `present`
+    the mask of non-empty cells; every check is vectorized over the column.
+    """
+    if rule.required:
+        yield 'required', ~present, 'value is required'
+    if rule.min_len is not None or rule.max_len is not None:
+        lengths = values.str.len()
+        if rule.min_len is not None:
+            yield 'min_len', present & (lengths < rule.min_len), f"shorter than {rule.min_len} chars"
+        if rule.max_len is not None:
+            yield 'max_len', lengths > rule.max_len, f"longer than {rule.max_len} chars"
+    if rule.regex:
+        # Anchored at both ends whatever anchors the note spells out; the group keeps any | inside
+        pattern = rf"(?:{rule.regex})\Z"
+        yield 'regex', present & ~values.str.match(pattern).fillna(False).astype(bool), f"does not match {rule.regex}"
+    if rule.email:
+        yield 'email', present & ~values.str.fullmatch(EMAIL_REGEX).fillna(False).astype(bool), 'not a valid email address'
+    for pattern in rule.contains:
+        yield 'contains', present & ~values.str.contains(pattern).fillna(False).astype(bool), f"must contain {pattern}"
+    if rule.options:
+        allowed = [option.casefold() for option in rule.options]
+        yield 'options', present & ~values.str.casefold().isin(allowed), 'not one of ' + ' / '.join(rule.options)
+
+    data_type = rule.data_type
+    if data_type == 'number' or rule.minimum is not None or rule.maximum is not None:
+        numbers = pd.to_numeric(values.str.replace(',', '', regex=False).where(present), errors='coerce')
+        bad = present & numbers.isna()
+        yield 'number', bad, 'not a number'
+        if rule.minimum is not None:
+            yield 'minimum', ~bad & present & (numbers < rule.minimum), f"below {rule.minimum:g}"
+        if rule.maximum is not None:
+            yield 'maximum', ~bad & present & (numbers > rule.maximum), f"above {rule.maximum:g}"
+    elif data_type in ('date', 'datetime'):
+        stamps = pd.to_datetime(values.where(present), errors='coerce', format='ISO8601')
+        bad = present & stamps.isna()
+        yield data_type, bad, f"not an ISO {data_type}"
+        today = pd.Timestamp.today().normalize()
+        if rule.not_past:
+            yield 'not_past', ~bad & present & (stamps < today), 'date is in the past'
+        if rule.min_age is not None:
+            age = (today - stamps).dt.days / 365.2425
+            yield 'age', ~bad & present & ((age < rule.min_age) | (age >= rule.max_age + 1)), \
+                f"age outside {rule.min_age}-{rule.max_age}"
+    elif data_type == 'boolean':
+        yield 'boolean', present & ~values.str.strip().str.casefold().isin(_BOOLEAN_VALUES), 'not a boolean'
+    elif data_type == 'time':
+        yield 'time', present & ~values.str.fullmatch(r'\s*\d{1,2}:\d{2}(?::\d{2})?\s*(?:[AaPp][Mm])?\s*').fillna(False).astype(bool), \
+            'not a time'
+
+
+def validate_frame(frame, rules, limit=None):
+    """
+    Check a DataFrame against {column: ColumnRule}.
+
+    Returns a DataFrame with one row per failing cell (REPORT_COLUMNS),
+    where `row` is the frame's index label. `limit` caps the report size,
+    not the amount of checking.
+    """
+    import pandas as pd
+
+    parts = []
+    reported = 0
+    for column, rule in rules.items():
+        if column not in frame.columns:
+            if rule.required:
+                parts.append(pd.DataFrame([{'row': None, 'column': column, 'rule': 'required',
+                                            'value': '', 'message': 'column is missing'}]))
+            continue
+        # Run every check on the distinct values only, then broadcast the
+        # verdicts back through the codes: bulk uploads repeat values heavily
+        codes, uniques = pd.factorize(frame[column], use_na_sentinel=True)
+        codes[codes < 0] = len(uniques)
+        values = pd.Series(uniques, dtype=object).astype('string').fillna('')
+        values = pd.concat([values, pd.Series([''], dtype='string')], ignore_index=True)
+        present = values.str.strip() != ''
+        for name, failing, message in _checks(rule, values, present, pd):
+            failing = failing.to_numpy(dtype=bool, na_value=False)[codes]
+            if not failing.any():
+                continue
+            bad = frame[column][failing].astype(object).fillna('')
+            if limit is not None:
+                bad = bad.iloc[:max(limit - reported, 0)]
+            reported += len(bad)
+            parts.append(pd.DataFrame({
+                'row': bad.index,
+                'column': column,
+                'rule': name,
+                'value': bad.to_numpy(dtype=object),
+                'message': message,
+            }))
+            if limit is not None and reported >= limit:
+                break
+        if limit is not None and reported >= limit:
+            break
+    if not parts:
+        return pd.DataFrame(columns=list(REPORT_COLUMNS))
+    return pd.concat(parts, ignore_index=True)
+
+
+def read_records(path):
+    """Read a CSV of records as strings, with empty cells kept as ''"""
+    import pandas as pd
+
+    return pd.read_csv(path, dtype=str, keep_default_na=False, na_filter=False)
+
+
+def main(argv=None):
+    from navmap.dataset import load_dataset
+
+    parser = argparse.ArgumentParser(description="Validate bulk records against the navigation map's rules")
+    parser.add_argument("table", nargs="?", help="Supabase table the records belong to, e.g. leads")
+    parser.add_argument("records", nargs="?", help="CSV file with one column per table column")
+    parser.add_argument("--plan", action="store_true", help="print the compiled validation plan and exit")
+    parser.add_argument("--report", metavar="FILE", help="write every failing cell to FILE (CSV)")
+    parser.add_argument("--limit", type=int, default=20, help="failing cells to print (default: 20)")
+    args = parser.parse_args(argv)
+
+    plan = compile_plan(load_dataset())
+    if args.plan or not args.records:
+        for table, columns in sorted(plan.items()):
+            if args.table and table != args.table:
+                continue
+            print(f"{table}:")
+            for column, rule in columns.items():
+                print(f"  {column}: {describe_rule(rule)}")
+        return 0
+    if args.table not in plan:
+        parser.error(f"no rules for table {args.table!r}; known tables: {', '.join(sorted(plan))}")
+
+    import time
+
+    try:
+        frame = read_records(args.records)
+    except (OSError, ValueError) as exc:  # pandas' parser and decoding errors are ValueErrors
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    started = time.perf_counter()
+    report = validate_frame(frame, plan[args.table])
+    elapsed = time.perf_counter() - started
+    print(f"{len(frame)} records, {len(report)} invalid cells ({elapsed:.2f}s)")
+    if len(report):
+        print(report.groupby(['column', 'rule']).size().to_string())
+        print(report.head(args.limit).to_string(index=False))
+    if args.report:
+        try:
+            report.to_csv(args.report, index=False)
+        except OSError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        print(f"Report written to {args.report}")
+    return 1 if len(report) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
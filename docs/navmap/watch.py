@@ -0,0 +1,572 @@
+"""
+Watch mode: keep the map outputs in step with their inputs
+
+A single long-running process that watches
+
+    navmap/data/navigation-map.json      the dataset
+    src/                                 page sources (.jsx/.tsx/.js/.ts)
+    supabase/migrations, docs/supabase-schema.sql
+                                         the schema the --schema check replays
+
+and regenerates the outputs after each burst of saves. Events are
+debounced: the first change opens a window that closes once no further
+change arrives for --debounce seconds (or after MAX_DELAY, so a stream of
+saves cannot hold a regeneration back forever), and everything seen in the
+window is handled as one batch.
+
+For each batch the affected module sections are worked out from what
+changed: dataset edits through navmap.diff, migrations through the tables
+whose columns changed, and page sources through the import graph of
+navmap.extract (a page counts for every map section whose screens it
+renders). Only outputs that depend on the changed inputs are regenerated,
+and they go through the incremental writers, so only affected sections
+are re-rendered:
+
+    dataset      Markdown map, XLSX, shards, prefetch manifest
+    migrations   Markdown map, XLSX, shards (only with --schema verify/fill)
+    sources      prefetch manifest (the map rows are curated by hand; the
+                 affected sections are listed so they can be reviewed)
+
+Waiting is event driven: inotify on Linux (through ctypes, no extra
+package), watchdog elsewhere when it is installed, and stat polling every
+--interval seconds as the fallback. An idle watcher blocks in the kernel
+and uses no CPU.
+
+Usage: python -m navmap.watch [-o FILE] [--xlsx [FILE]] [--shards [DIR]] [--prefetch-manifest FILE]
+                              [--schema MODE] [--debounce S] [--backend auto|inotify|watchdog|poll]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+from navmap.dataset import DATA_FILE
+from navmap.extract import DEFAULT_SRC, EXCLUDED_DIRS, REPO_ROOT, SOURCE_EXTENSIONS
+from navmap.schema import BASE_SCHEMA, MIGRATIONS_DIR
+
+DEFAULT_DEBOUNCE = 0.3
+DEFAULT_INTERVAL = 1.0
+
+# Longest a batch is held back while changes keep arriving
+MAX_DELAY = 3.0
+
+BACKENDS = ('auto', 'inotify', 'watchdog', 'poll')
+
+# Changed paths of one batch, by kind
+Batch = namedtuple('Batch', ['dataset', 'schema', 'sources'])
+
+# Returned by a watcher when it lost track of events and everything must be rechecked
+OVERFLOW = '<overflow>'
+
+
+# -- watchers ----------------------------------------------------------------
+
+
+class PollingWatcher:
+    """Detects changes by comparing (mtime, size) snapshots every `interval` seconds"""
+
+    name = 'poll'
+
+    def __init__(self, roots, relevant, interval=DEFAULT_INTERVAL):
+        self.roots = roots
+        self.relevant = relevant
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for directory, recursive in self.roots:
+            stack = [directory]
+            while stack:
+                try:
+                    entries = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                with entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive and entry.name not in EXCLUDED_DIRS:
+                                stack.append(entry.path)
+                        elif self.relevant(entry.path):
+                            try:
+                                st = entry.stat()
+                            except OSError:
+                                continue
+                            snapshot[entry.path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Changed paths, or an empty set once `timeout` seconds pass without any"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if delay > 0:
+                time.sleep(delay)
+            snapshot = self._scan()
+            previous, self._snapshot = self._snapshot, snapshot
+            changed = {path for path in snapshot.keys() | previous.keys() if snapshot.get(path) != previous.get(path)}
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Linux inotify through ctypes; wait() blocks in select() until the kernel reports a change"""
+
+    name = 'inotify'
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ISDIR = 0x40000000
+
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+    def __init__(self, roots, relevant):
+        import ctypes
+        import ctypes.util
+        import struct
+
+        self._event = struct.Struct('iIII')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._errno = ctypes.get_errno
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(self._errno(), "inotify_init1 failed")
+        self.relevant = relevant
+        self._dirs = {}
+        self._recursive = {}
+        try:
+            for directory, recursive in roots:
+                self._add_tree(directory, recursive)
+        except BaseException:
+            self.close()
+            raise
+
+    def _add(self, directory, recursive):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            return False
+        self._dirs[wd] = directory
+        self._recursive[wd] = recursive
+        return True
+
+    def _add_tree(self, directory, recursive):
+        if not self._add(directory, recursive) or not recursive:
+            return
+        for parent, dirs, _ in os.walk(directory):
+            dirs[:] = [name for name in dirs if name not in EXCLUDED_DIRS]
+            for name in dirs:
+                self._add(os.path.join(parent, name), True)
+
+    def _read(self):
+        try:
+            data = os.read(self._fd, 1 << 16)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        size = self._event.size
+        while offset + size <= len(data):
+            wd, mask, _, length = self._event.unpack_from(data, offset)
+            name = data[offset + size:offset + size + length].rstrip(b'\0')
+            offset += size + length
+            if mask & self.IN_Q_OVERFLOW:
+                changed.add(OVERFLOW)
+                continue
+            directory = self._dirs.get(wd)
+            if mask & self.IN_IGNORED:
+                self._dirs.pop(wd, None)
+                self._recursive.pop(wd, None)
+                continue
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and self._recursive.get(wd) \
+                        and os.path.basename(path) not in EXCLUDED_DIRS:
+                    # Files can land in a new directory before its watch exists, so rescan it
+                    self._add_tree(path, True)
+                    for parent, dirs, files in os.walk(path):
+                        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+                        changed.update(p for p in (os.path.join(parent, f) for f in files) if self.relevant(p))
+                continue
+            if self.relevant(path):
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout=None):
+        import select
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return set()
+            changed = self._read()
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class WatchdogWatcher:
+    """watchdog observer (macOS FSEvents, Windows ReadDirectoryChangesW, ...)"""
+
+    name = 'watchdog'
+
+    def __init__(self, roots, relevant):
+        import queue
+
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        self.relevant = relevant
+        self._queue = queue.Queue()
+        self._empty = queue.Empty
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.is_directory:
+                    return
+                for path in (event.src_path, getattr(event, 'dest_path', '')):
+                    if path and watcher.relevant(path):
+                        watcher._queue.put(path)
+
+        self._observer = Observer()
+        for directory, recursive in roots:
+            self._observer.schedule(Handler(), directory, recursive=recursive)
+        self._observer.start()
+
+    def wait(self, timeout=None):
+        try:
+            changed = {self._queue.get(timeout=timeout)}
+        except self._empty:
+            return set()
+        while True:
+            try:
+                changed.add(self._queue.get_nowait())
+            except self._empty:
+                return changed
+
+    def close(self):
+        self._observer.stop()
+        self._observer.join()
+
+
+def open_watcher(roots, relevant, backend='auto', interval=DEFAULT_INTERVAL):
+    """Watcher over `roots` ([(directory, recursive)]) reporting paths `relevant` accepts"""
+    if backend in ('auto', 'inotify') and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(roots, relevant)
+        except OSError:
+            if backend == 'inotify':
+                raise
+    elif backend == 'inotify':
+        raise OSError("inotify is only available on Linux")
+    if backend in ('auto', 'watchdog'):
+        from importlib.util import find_spec
+
+        if find_spec('watchdog') is not None:
+            return WatchdogWatcher(roots, relevant)
+        if backend == 'watchdog':
+            raise OSError("watchdog is not installed")
+    return PollingWatcher(roots, relevant, interval)
+
+
+def collect(watcher, debounce=DEFAULT_DEBOUNCE, max_delay=MAX_DELAY):
+    """Block until something changes, then gather the burst: all paths seen until `debounce` s of quiet"""
+    changed = set()
+    while not changed:
+        changed = watcher.wait(None)
+    deadline = time.monotonic() + max_delay
+    while True:
+        remaining = min(debounce, deadline - time.monotonic())
+        if remaining <= 0:
+            return changed
+        more = watcher.wait(remaining)
+        if not more:
+            return changed
+        changed |= more
+
+
+# -- what changed ------------------------------------------------------------
+
+
+class Inputs:
+    """The watched inputs and how a changed path is classified"""
+
+    def __init__(self, data_file=DATA_FILE, src_root=DEFAULT_SRC, migrations_dir=MIGRATIONS_DIR,
+                 base_schema=BASE_SCHEMA):
+        self.data_file = os.path.abspath(data_file)
+        self.src_root = os.path.abspath(src_root)
+        self.migrations_dir = os.path.abspath(migrations_dir)
+        self.base_schema = os.path.abspath(base_schema)
+
+    def roots(self):
+        roots = [(os.path.dirname(self.data_file), False)]
+        for directory, recursive in ((self.src_root, True), (self.migrations_dir, False),
+                                     (os.path.dirname(self.base_schema), False)):
+            if os.path.isdir(directory) and (directory, recursive) not in roots:
+                roots.append((directory, recursive))
+        return roots
+
+    def kind(self, path):
+        """'dataset', 'schema', 'sources' or None for paths nothing depends on"""
+        if path == self.data_file:
+            return 'dataset'
+        if path == self.base_schema or (os.path.dirname(path) == self.migrations_dir and path.endswith('.sql')):
+            return 'schema'
+        if path.startswith(self.src_root + os.sep) and path.endswith(SOURCE_EXTENSIONS):
+            parts = os.path.relpath(path, self.src_root).split(os.sep)
+            if not EXCLUDED_DIRS.intersection(parts[:-1]):
+                return 'sources'
+        return None
+
+    def relevant(self, path):
+        return self.kind(path) is not None
+
+    def classify(self, paths):
+        if OVERFLOW in paths:
+            return Batch([self.data_file], [self.base_schema], [os.path.join(self.src_root, 'App.jsx')])
+        batch = Batch([], [], [])
+        for path in sorted(paths):
+            kind = self.kind(path)
+            if kind is not None:
+                getattr(batch, kind).append(path)
+        return batch
+
+
+def dataset_sections(old, new):
+    """Titles of the sections that differ between two datasets"""
+    from navmap.diff import diff_datasets, index_rows
+
+    changes = diff_datasets(old, new)
+    affected = {change.module for change in changes}
+    moved = [change.key for change in changes if 'Module' in change.columns]
+    if moved:
+        # A row that moved also changed the section it left
+        before = index_rows(old)
+        affected.update(before[key][1] for key in moved)
+    before = {section.title: (section.icon, index) for index, section in enumerate(old.sections)}
+    after = {section.title: (section.icon, index) for index, section in enumerate(new.sections)}
+    affected.update(title for title in before.keys() ^ after.keys())
+    affected.update(title for title in before.keys() & after.keys() if before[title] != after[title])
+    return affected
+
+
+def table_changes(old, new):
+    """Tables whose columns or types differ between two schema catalogs"""
+    return {table for table in old.tables.keys() | new.tables.keys() if old.tables.get(table) != new.tables.get(table)}
+
+
+def table_sections(dataset, tables):
+    from navmap.shards import section_tables
+
+    return {section.title for section in dataset.sections if tables.intersection(section_tables(section))}
+
+
+def source_sections(dataset, src_root, paths):
+    """Sections whose screens are rendered by pages that are, or import, one of `paths`"""
+    from navmap.extract import extract
+    from navmap.graph import normalize_route
+    from navmap.prefetch import RouteResolver
+
+    if any(os.path.basename(path) == 'App.jsx' for path in paths):
+        return {section.title for section in dataset.sections}
+    routes = set(extract(src_root, jobs=1).routes_reaching(paths))
+    if not routes:
+        return set()
+    resolver = RouteResolver(src_root)
+    affected = set()
+    for section in dataset.sections:
+        screens = {normalize_route(row[0]) for row in section.rows}
+        if any(resolver.app_path(screen) in routes for screen in screens if screen):
+            affected.add(section.title)
+    return affected
+
+
+# -- regeneration ------------------------------------------------------------
+
+
+class Watch:
+    """Watch state: the inputs seen last and the outputs to keep current"""
+
+    def __init__(self, args, inputs):
+        self.args = args
+        self.inputs = inputs
+        self.dataset = None
+        self.catalog = None
+
+    def _load(self):
+        from navmap.dataset import load_dataset
+
+        return load_dataset(self.inputs.data_file)
+
+    def _catalog(self):
+        from navmap.schema import build_catalog, migration_files
+
+        return build_catalog(migration_files(self.inputs.base_schema, self.inputs.migrations_dir))
+
+    def _run(self, write, argv, dataset):
+        from navmap.cli import build_parser
+
+        try:
+            return write(build_parser(command=argv[0]).parse_args(argv), dataset)
+        except Exception as exc:  # a bad save must not bring the watcher down
+            print(f"❌ {argv[0]}: {exc}", file=sys.stderr)
+            return 1
+
+    def regenerate_maps(self, dataset):
+        """Check `dataset` against the schema once, then write every map output from it"""
+        from navmap.cli import check_schema, write_md, write_xlsx
+        from navmap.shards import run as write_shards
+
+        args = self.args
+        try:
+            dataset = check_schema(dataset, args.schema, self.catalog)
+        except Exception as exc:
+            print(f"❌ schema: {exc}", file=sys.stderr)
+            return
+        self._run(write_md, ['md', '-o', args.output, '--incremental'], dataset)
+        if args.xlsx:
+            self._run(write_xlsx, ['xlsx', '-o', args.xlsx, '--incremental'], dataset)
+        if args.shards:
+            self._run(write_shards, ['shards', '-o', args.shards], dataset)
+
+    def regenerate_prefetch(self, dataset):
+        if not self.args.prefetch_manifest:
+            return
+        from navmap.prefetch import RouteResolver, build_manifest, write_manifest
+
+        try:
+            manifest, _ = build_manifest(dataset, RouteResolver(self.inputs.src_root))
+            changed = write_manifest(self.args.prefetch_manifest, manifest)
+        except (OSError, ValueError) as exc:
+            print(f"❌ prefetch manifest: {exc}", file=sys.stderr)
+            return
+        state = f"{len(manifest['routes'])} routes" if changed else "unchanged"
+        print(f"⚡ Prefetch manifest: {self.args.prefetch_manifest} ({state})")
+
+    def start(self):
+        from navmap.dataset import DatasetError
+
+        try:
+            self.dataset = self._load()
+        except (OSError, DatasetError) as exc:
+            print(f"❌ {exc}", file=sys.stderr)
+        self.catalog = self._catalog()
+        if not self.args.no_initial and self.dataset is not None:
+            self.regenerate_maps(self.dataset)
+            self.regenerate_prefetch(self.dataset)
+
+    def handle(self, batch):
+        """Work out the affected sections of a batch and regenerate what depends on it"""
+        from navmap.dataset import DatasetError
+
+        stamp = time.strftime('%H:%M:%S')
+        try:
+            dataset = self._load()
+        except (OSError, DatasetError) as exc:
+            # Usually a save that is still half-written; the next event retries
+            print(f"[{stamp}] ❌ {exc}", file=sys.stderr)
+            return set()
+
+        affected = set()
+        maps = prefetch = False
+        if batch.dataset:
+            sections = dataset_sections(self.dataset, dataset) if self.dataset is not None else \
+                {section.title for section in dataset.sections}
+            affected |= sections
+            maps = prefetch = bool(sections)
+            self._report(stamp, "dataset", batch.dataset, sections)
+        if batch.schema:
+            catalog = self._catalog()
+            sections = table_sections(dataset, table_changes(self.catalog, catalog))
+            self.catalog = catalog
+            affected |= sections
+            maps = maps or (self.args.schema != 'off' and bool(sections))
+            self._report(stamp, "schema", batch.schema, sections)
+        if batch.sources:
+            sections = source_sections(dataset, self.inputs.src_root, batch.sources)
+            affected |= sections
+            prefetch = True
+            self._report(stamp, "sources", batch.sources, sections)
+        self.dataset = dataset
+
+        if maps:
+            self.regenerate_maps(dataset)
+        if prefetch:
+            self.regenerate_prefetch(dataset)
+        return affected
+
+    def _report(self, stamp, kind, paths, sections):
+        names = ', '.join(os.path.relpath(path, REPO_ROOT) for path in paths[:3]) + (f" (+{len(paths) - 3})" if len(paths) > 3 else '')
+        listed = ', '.join(sorted(sections)) or 'no sections'
+        print(f"[{stamp}] 🔔 {kind}: {names} → {listed}")
+
+
+def add_arguments(parser):
+    from navmap.document import MARKDOWN_OUTPUT, XLSX_OUTPUT
+    from navmap.shards import DEFAULT_DIR
+
+    parser.add_argument("-o", "--output", default=MARKDOWN_OUTPUT, help=f"Markdown map (default: {MARKDOWN_OUTPUT})")
+    parser.add_argument("--xlsx", nargs="?", const=XLSX_OUTPUT, metavar="FILE",
+                        help=f"also keep the Excel map current (default file: {XLSX_OUTPUT})")
+    parser.add_argument("--shards", nargs="?", const=DEFAULT_DIR, metavar="DIR",
+                        help=f"also keep the per-module shards current (default directory: {DEFAULT_DIR})")
+    parser.add_argument("--prefetch-manifest", metavar="FILE", help="also keep the SPA route prefetch manifest current")
+    parser.add_argument("--schema", choices=("off", "verify", "fill"), default="off",
+                        help="schema check applied on every regeneration (migrations only matter when not off)")
+    parser.add_argument("--src", default=DEFAULT_SRC, help="source root to watch (default: the repo's src/)")
+    parser.add_argument("--debounce", type=float, default=DEFAULT_DEBOUNCE, metavar="S",
+                        help=f"quiet time that ends a burst of saves (default: {DEFAULT_DEBOUNCE})")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="change notification: inotify (Linux), watchdog, or stat polling (default: auto)")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, metavar="S",
+                        help=f"polling interval for the poll backend (default: {DEFAULT_INTERVAL})")
+    parser.add_argument("--no-initial", action="store_true", help="skip the regeneration at startup")
+
+
+def run(args):
+    inputs = Inputs(src_root=args.src)
+    watch = Watch(args, inputs)
+    watch.start()
+    try:
+        watcher = open_watcher(inputs.roots(), inputs.relevant, args.backend, args.interval)
+    except (OSError, ImportError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(f"👀 Watching {len(inputs.roots())} locations ({watcher.name}); Ctrl-C to stop")
+    try:
+        while True:
+            watch.handle(inputs.classify(collect(watcher, args.debounce)))
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+    finally:
+        watcher.close()
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Regenerate the map outputs whenever their inputs change")
+    add_arguments(parser)
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
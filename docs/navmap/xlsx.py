@@ -0,0 +1,159 @@
+"""
+XLSX export for the navigation map
+
+write_xlsx_streaming() writes the workbook in a single forward pass using
+openpyxl's write-only mode: every row is styled as it is appended and
+flushed to disk, so memory stays flat no matter how many rows the map has.
+write_xlsx_pandas() is the original DataFrame-based export. Both mark their
+stages (navmap.instrument) so a --profile run shows where the time goes, and
+both add a Summary sheet after the map when given a navmap.summary.Summary.
+"""
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from openpyxl.utils import get_column_letter
+
+from navmap.instrument import stage
+from navmap.layout import COLUMN_WIDTHS, summary_tables
+
+SHEET_TITLE = "Navigation Map"
+SUMMARY_SHEET_TITLE = "Summary"
+
+# Rows whose first cell carries one of these icons are module section headers
+SECTION_ICONS = ['🔐', '🏠', '👥', '💼', '🧮', '📊', '✅', '📻', '📄', '⚙️']
+
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center", wrap_text=True)
+SECTION_FILL = PatternFill(start_color="D9E1F2", end_color="D9E1F2", fill_type="solid")
+SECTION_FONT = Font(bold=True, size=12)
+
+
+def is_section_row(row):
+    """True if the row is a module section header (e.g. '🔐 LOGIN & AUTH')"""
+    first = row[0] if row else None
+    return bool(first) and any(icon in str(first) for icon in SECTION_ICONS)
+
+
+def _styled_cell(ws, value, fill, font, alignment=None):
+    cell = WriteOnlyCell(ws, value=value if value != "" else None)
+    cell.fill = fill
+    cell.font = font
+    if alignment is not None:
+        cell.alignment = alignment
+    return cell
+
+
+def _append_summary(wb, summary):
+    ws = wb.create_sheet(SUMMARY_SHEET_TITLE)
+    ws.column_dimensions['A'].width = 28
+    for idx in range(2, 10):
+        ws.column_dimensions[get_column_letter(idx)].width = 13
+    for number, (header, rows) in enumerate(summary_tables(summary)):
+        if number:
+            ws.append([])
+        ws.append([_styled_cell(ws, name, HEADER_FILL, HEADER_FONT, HEADER_ALIGNMENT) for name in header])
+        for row in rows:
+            cells = []
+            for value in row:
+                if isinstance(value, float):
+                    value = WriteOnlyCell(ws, value=value)
+                    value.number_format = '0%'
+                cells.append(value)
+            ws.append(cells)
+    return ws
+
+
+def write_xlsx_streaming(output_file, columns, rows, summary=None):
+    """
+    Write the navigation map to `output_file` in one pass.
+
+    `rows` may be any iterable (including a generator); it is consumed
+    once and never materialized. With a `summary`, a Summary sheet follows
+    the map. Returns (row_count, section_count).
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_TITLE)
+
+    # Sheet-level layout has to be in place before the first row is written
+    for idx, width in enumerate(COLUMN_WIDTHS, start=1):
+        ws.column_dimensions[get_column_letter(idx)].width = width
+    ws.freeze_panes = 'A2'
+
+    ws.append([
+        _styled_cell(ws, name, HEADER_FILL, HEADER_FONT, HEADER_ALIGNMENT)
+        for name in columns
+    ])
+
+    row_count = 0
+    section_count = 0
+    with stage('rows') as st:
+        for row in rows:
+            if is_section_row(row):
+                section_count += 1
+                ws.append([_styled_cell(ws, value, SECTION_FILL, SECTION_FONT) for value in row])
+            else:
+                ws.append([value if value != "" else None for value in row])
+            row_count += 1
+        st.rows = row_count
+
+    # The autofilter is written after the sheet data, so the final extent is known here
+    ws.auto_filter.ref = f"A1:{get_column_letter(len(columns))}{row_count + 1}"
+
+    if summary is not None:
+        _append_summary(wb, summary)
+
+    with stage('save', rows=row_count):
+        wb.save(output_file)
+    return row_count, section_count
+
+
+def write_xlsx_pandas(output_file, columns, rows, summary=None):
+    """
+    Write the navigation map through a pandas DataFrame and style it afterwards.
+
+    This is the original export path, kept for comparison; it holds the
+    whole sheet in memory twice and needs pandas. With a `summary`, a
+    Summary sheet follows the map. Returns (row_count, section_count).
+    """
+    import pandas as pd
+
+    with stage('dataframe') as st:
+        data = [list(row) for row in rows]
+        df = pd.DataFrame(data, columns=list(columns))
+        st.rows = len(data)
+
+    writer = pd.ExcelWriter(output_file, engine='openpyxl')
+    try:
+        with stage('to_excel', rows=len(data)):
+            df.to_excel(writer, sheet_name=SHEET_TITLE, index=False)
+        worksheet = writer.sheets[SHEET_TITLE]
+
+        with stage('style', rows=len(data)):
+            for idx, width in enumerate(COLUMN_WIDTHS, start=1):
+                worksheet.column_dimensions[get_column_letter(idx)].width = width
+
+            for cell in worksheet[1]:
+                cell.fill = HEADER_FILL
+                cell.font = HEADER_FONT
+                cell.alignment = HEADER_ALIGNMENT
+
+            section_count = 0
+            for row in worksheet.iter_rows(min_row=2, max_row=len(data) + 1):
+                if is_section_row([row[0].value]):
+                    section_count += 1
+                    for cell in row:
+                        cell.fill = SECTION_FILL
+                        cell.font = SECTION_FONT
+
+            worksheet.freeze_panes = 'A2'
+            worksheet.auto_filter.ref = worksheet.dimensions
+
+        if summary is not None:
+            _append_summary(writer.book, summary)
+    finally:
+        # Closing the writer is what saves the workbook, as leaving its with-block did
+        with stage('save', rows=len(data)):
+            writer.close()
+    return len(data), section_count
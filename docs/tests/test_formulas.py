@@ -0,0 +1,233 @@
+"""
+Tests for navmap.formulas: the parser, the vectorized evaluator against
+the same computation written in plain pandas, and the map's own formulas.
+
+Usage: python -m pytest tests/test_formulas.py  (from docs/)
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from navmap.formulas import (
+    Binary, Call, Column, Literal, Unary, FormulaError, columns_of, evaluate, map_formulas, parse,
+)
+
+NOW = datetime.datetime(2025, 1, 1, 15, 30)
+MULTIPLIERS = {'Monthly': 12, 'Quarterly': 4, 'Semi-Annual': 2, 'Annual': 1}
+
+
+@pytest.fixture
+def policies():
+    return pd.DataFrame({
+        'premium_amount': [100.0, 250.0, np.nan, 80.0, 40.0, 500.0, 60.0, 10.0],
+        'premium_frequency': ['Monthly', 'Annual', 'Quarterly', 'Semi-Annual', 'Weekly', None, 'Monthly', 'Annual'],
+        'policy_end_date': ['2030-06-30', '2024-12-31', None, '2025-01-01', 'not a date',
+                            '2045-01-01T08:00:00', '2026-03-15', '2027-07-07'],
+        'status': ['Active', 'Lapsed', 'Active', 'Active', 'Active', 'Lapsed', None, 'Active'],
+        'advisor_id': ['a1', 'a1', 'a2', 'a2', None, 'a3', 'a1', 'a2'],
+    })
+
+
+def _assert_series(actual, expected):
+    pd.testing.assert_series_equal(actual, expected.astype(float), check_names=False, check_index_type=False)
+
+
+# -- parse() -----------------------------------------------------------------
+
+
+def test_parse_precedence():
+    a, b, c = Column('a'), Column('b'), Column('c')
+    assert parse('a + b * c').expr == Binary('+', a, Binary('*', b, c))
+    assert parse('a - b - c').expr == Binary('-', Binary('-', a, b), c)
+    assert parse('(a + b) * c').expr == Binary('*', Binary('+', a, b), c)
+    assert parse('-a * b').expr == Binary('*', Unary('-', a), b)
+    assert parse('a / 365').expr == Binary('/', a, Literal(365))
+
+
+def test_parse_literals_and_calls():
+    assert parse("DATEDIFF(policy_end_date, NOW())").expr == \
+        Call('DATEDIFF', (Column('policy_end_date'), Call('NOW', ())))
+    assert parse('SUM(policies.sum_assured)').expr == Call('SUM', (Column('policies.sum_assured'),))
+    assert parse("'it''s'").expr == Literal("it's")
+    assert parse('1.5').expr == Literal(1.5)
+
+
+def test_parse_where_and_group_by():
+    formula = parse("SUM(premium_amount) WHERE status='Active' GROUP BY advisor_id")
+    assert formula.expr == Call('SUM', (Column('premium_amount'),))
+    assert formula.where == Binary('=', Column('status'), Literal('Active'))
+    assert formula.group_by == 'advisor_id'
+    assert formula.aggregate
+    assert columns_of(formula) == ('premium_amount', 'status', 'advisor_id')
+
+
+def test_parse_condition_precedence():
+    where = parse('COUNT(*) WHERE a = 1 OR NOT b != 2 AND c >= 3').where
+    assert where == Binary('OR', Binary('=', Column('a'), Literal(1)),
+                           Binary('AND', Unary('NOT', Binary('<>', Column('b'), Literal(2))),
+                                  Binary('>=', Column('c'), Literal(3))))
+
+
+def test_parse_keywords_are_case_insensitive():
+    lower = parse('count(*) where is_client = TRUE group by stage')
+    upper = parse('COUNT(*) WHERE is_client = true GROUP BY stage')
+    assert lower[1:] == upper[1:]
+
+
+def test_parse_null_comparisons():
+    assert parse('COUNT(*) WHERE status = NULL').where == Binary('=', Column('status'), Literal(None))
+    assert parse('COUNT(*) WHERE NULL <> status').where == Binary('<>', Literal(None), Column('status'))
+
+
+@pytest.mark.parametrize('text', [
+    'SUM(COUNT(*))',
+    'MAX(premium_amount + SUM(premium_amount))',
+    'premium_amount + SUM(premium_amount)',
+    'premium_amount GROUP BY status',
+    'COUNT(*) WHERE SUM(premium_amount) > 1',
+    'COUNT(*) GROUP status',
+    'DATEDIFF(a)',
+    'UPPER(a)',
+    'a +',
+    '(a + b',
+    'a b',
+    'a % b',
+])
+def test_parse_errors(text):
+    with pytest.raises(FormulaError):
+        parse(text)
+
+
+# -- evaluate() --------------------------------------------------------------
+
+
+def test_evaluate_annual_premium(policies):
+    expected = policies.premium_amount * policies.premium_frequency.map(MULTIPLIERS).fillna(1)
+    actual = evaluate('premium_amount * frequency_multiplier', policies)
+    np.testing.assert_allclose(actual, expected.to_numpy(), equal_nan=True)
+
+
+def test_evaluate_years_remaining(policies):
+    ends = pd.to_datetime(policies.policy_end_date, errors='coerce', format='ISO8601').dt.floor('D')
+    expected = (ends - pd.Timestamp(NOW).floor('D')).dt.days / 365
+    actual = evaluate('DATEDIFF(policy_end_date, NOW()) / 365', policies, now=NOW)
+    np.testing.assert_allclose(actual, expected.to_numpy(dtype=float, na_value=np.nan), equal_nan=True)
+
+
+@pytest.mark.parametrize('flags', [
+    [True, False, True, True, False],
+    ['true', 'false', 'Y', ' TRUE ', None],
+    [1, 0, 2, 1, 0],
+])
+def test_evaluate_count_where(flags):
+    records = pd.DataFrame({'is_client': flags})
+    expected = pd.Series(flags, dtype=object).map(
+        lambda value: str(value).strip().lower() in ('true', 'y') if isinstance(value, str) else bool(value)).sum()
+    assert evaluate('COUNT(*) WHERE is_client=true', records) == expected == 3
+
+
+def test_evaluate_accepts_a_mapping(policies):
+    records = {name: policies[name].tolist() for name in policies.columns}
+    np.testing.assert_allclose(evaluate('premium_amount * 2', records), policies.premium_amount * 2, equal_nan=True)
+
+
+@pytest.mark.parametrize('name', ['SUM', 'AVG', 'MIN', 'MAX', 'COUNT'])
+def test_evaluate_grouped_aggregates(policies, name):
+    # a3 has only a Lapsed policy: an empty group, which pandas' groupby on the filtered rows drops
+    groups = sorted(policies.advisor_id.dropna().unique())
+    active = policies[policies.status == 'Active']
+    values = active.groupby('advisor_id').premium_amount
+    expected = {'SUM': values.sum(), 'AVG': values.mean(), 'MIN': values.min(), 'MAX': values.max(),
+                'COUNT': values.count()}[name].reindex(groups)
+    if name in ('SUM', 'COUNT'):
+        expected = expected.fillna(0)
+    actual = evaluate(f"{name}(premium_amount) WHERE status='Active' GROUP BY advisor_id", policies)
+    _assert_series(actual, expected)
+    assert actual.index.name == 'advisor_id'
+
+
+def test_evaluate_grouped_count_star(policies):
+    expected = policies.groupby('advisor_id').size()
+    _assert_series(evaluate('COUNT(*) GROUP BY advisor_id', policies), expected)
+
+
+def test_evaluate_aggregates_skip_nan(policies):
+    active = policies[policies.status == 'Active'].premium_amount
+    assert evaluate("SUM(premium_amount) WHERE status='Active'", policies) == active.sum()
+    assert evaluate("AVG(premium_amount) WHERE status='Active'", policies) == pytest.approx(active.mean())
+    assert evaluate("MIN(premium_amount)", policies) == policies.premium_amount.min()
+    assert evaluate("COUNT(premium_amount)", policies) == policies.premium_amount.count()
+
+
+def test_evaluate_empty_selection(policies):
+    assert evaluate("SUM(premium_amount) WHERE status='Cancelled'", policies) == 0.0
+    assert evaluate("COUNT(*) WHERE status='Cancelled'", policies) == 0.0
+    for name in ('AVG', 'MIN', 'MAX'):
+        assert np.isnan(evaluate(f"{name}(premium_amount) WHERE status='Cancelled'", policies))
+
+
+def test_evaluate_where_on_per_record_formula(policies):
+    actual = evaluate("premium_amount * 2 WHERE status = 'Active'", policies)
+    expected = (policies.premium_amount * 2).where(policies.status == 'Active')
+    np.testing.assert_allclose(actual, expected.to_numpy(), equal_nan=True)
+
+
+def test_evaluate_null_comparisons(policies):
+    assert evaluate('COUNT(*) WHERE status = NULL', policies) == policies.status.isna().sum()
+    assert evaluate('COUNT(*) WHERE NULL <> status', policies) == policies.status.notna().sum()
+    with pytest.raises(FormulaError):
+        evaluate('COUNT(*) WHERE premium_amount < NULL', policies)
+
+
+def test_evaluate_division_by_zero_is_null():
+    actual = evaluate('(gap / recommended) * 100', {'gap': [5.0, 1.0, 0.0], 'recommended': [10.0, 0.0, 0.0]})
+    np.testing.assert_allclose(actual, [50.0, np.nan, np.nan], equal_nan=True)
+
+
+@pytest.mark.parametrize('text', [
+    "premium_amount * 'x'",
+    "DATEDIFF('not a date', NOW())",
+    "COUNT(*) WHERE status < 'Active'",
+    'missing_column + 1',
+])
+def test_evaluate_errors(policies, text):
+    with pytest.raises(FormulaError):
+        evaluate(text, policies)
+
+
+# -- map_formulas() ----------------------------------------------------------
+
+
+@pytest.fixture(scope='module')
+def map_fields():
+    from navmap.dataset import load_dataset
+
+    return map_formulas(load_dataset())
+
+
+def test_map_formulas_compile(map_fields):
+    fields, unsupported = map_fields
+    by_name = {field.field: field for field in fields}
+    assert by_name['Annual Premium (Calculated)'].formula.text == 'premium_amount * frequency_multiplier'
+    assert by_name['Years Remaining (Calculated)'].formula.text == 'DATEDIFF(policy_end_date, NOW()) / 365'
+    assert by_name['Total Clients'].formula.where is not None
+    assert by_name['Pipeline Funnel'].formula.group_by == 'stage'
+    # Percentages are not part of the grammar; cells that describe a formula in prose are skipped
+    assert {row[4] for row, _ in unsupported} == {'Completion Formula'}
+
+
+def test_map_formulas_evaluate(map_fields):
+    fields, _ = map_fields
+    needed = {column for field in fields for column in columns_of(field.formula)}
+    records = pd.DataFrame({column: ['1', '2', None] for column in needed})
+    for field in fields:
+        result = evaluate(field.formula, records, now=NOW)
+        if field.formula.group_by is not None:
+            assert isinstance(result, pd.Series)
+        elif field.formula.aggregate:
+            assert isinstance(result, float)
+        else:
+            assert len(result) == len(records)